@@ -0,0 +1,116 @@
+import time
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+# Tiempo sin eventos de mouse o teclado tras el cual se considera inactivo al estudiante
+IDLE_TIMEOUT_MS = 60000
+# Pausa la detección cuando la ventana pierde el foco (además de cuando se minimiza u oculta)
+PAUSE_WHEN_UNFOCUSED = True
+# Espera antes de pausar por un cambio de ventana, para ignorar los estados transitorios al mostrarla o cambiar de foco
+WINDOW_PAUSE_DELAY_MS = 500
+
+INPUT_EVENTS = (
+    QEvent.Type.MouseMove,
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.MouseButtonRelease,
+    QEvent.Type.Wheel,
+    QEvent.Type.KeyPress,
+)
+WINDOW_EVENTS = (
+    QEvent.Type.WindowStateChange,
+    QEvent.Type.Show,
+    QEvent.Type.Hide,
+    QEvent.Type.WindowActivate,
+    QEvent.Type.WindowDeactivate,
+)
+
+
+class ActiveClock:
+    """Reloj que solo avanza mientras la detección está activa.
+
+    Las marcas de tiempo de la ventana de estrés se toman con este reloj, así una
+    pausa no expulsa muestras por antigüedad ni cuenta como parte del intervalo.
+    """
+
+    def __init__(self):
+        self.paused_total = 0.0
+        self.paused_at = None
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = time.time()
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.paused_total += time.time() - self.paused_at
+            self.paused_at = None
+
+    def now(self):
+        now = self.paused_at if self.paused_at is not None else time.time()
+        return now - self.paused_total
+
+
+class ActivityMonitor(QObject):
+    """Emite active_changed(False) cuando la ventana se minimiza, se oculta o pierde el foco,
+    o cuando el estudiante deja de usar el mouse y el teclado; y active_changed(True) al volver.
+    """
+
+    active_changed = pyqtSignal(bool)
+
+    def __init__(self, window, idle_timeout_ms=IDLE_TIMEOUT_MS, pause_when_unfocused=PAUSE_WHEN_UNFOCUSED):
+        super().__init__(window)
+        self.window = window
+        self.pause_when_unfocused = pause_when_unfocused
+        self.idle = False
+        self.active = True
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(idle_timeout_ms)
+        self.idle_timer.timeout.connect(self.on_idle)
+        self.window_timer = QTimer(self)
+        self.window_timer.setSingleShot(True)
+        self.window_timer.setInterval(WINDOW_PAUSE_DELAY_MS)
+        self.window_timer.timeout.connect(self.update_state)
+        # Filtro a nivel de aplicación: ve los eventos de todos los widgets hijos (DrawingArea, menús)
+        QApplication.instance().installEventFilter(self)
+        self.idle_timer.start()
+
+    def eventFilter(self, obj, event):
+        event_type = event.type()
+        if event_type in INPUT_EVENTS:
+            self.idle_timer.start()
+            if self.idle:
+                self.idle = False
+                self.update_state()
+        elif event_type in WINDOW_EVENTS and obj is self.window:
+            # El estado de la ventana se actualiza después de entregar el evento
+            QTimer.singleShot(0, self.on_window_changed)
+        return False
+
+    def on_window_changed(self):
+        if self.window_available():
+            self.window_timer.stop()
+            self.update_state()
+        else:
+            self.window_timer.start()
+
+    def on_idle(self):
+        self.idle = True
+        self.update_state()
+
+    def window_available(self):
+        window = self.window
+        if not window.isVisible() or window.isMinimized():
+            return False
+        return window.isActiveWindow() or not self.pause_when_unfocused
+
+    def update_state(self):
+        active = self.window_available() and not self.idle
+        if active != self.active:
+            self.active = active
+            self.active_changed.emit(active)
+
+    def stop(self):
+        self.idle_timer.stop()
+        self.window_timer.stop()
+        QApplication.instance().removeEventFilter(self)
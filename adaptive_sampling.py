@@ -0,0 +1,71 @@
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él no se considera la carga de CPU
+    psutil = None
+
+# Límites del periodo de muestreo cuando el sistema no está cargado
+MIN_INTERVAL_MS = 2000
+MAX_INTERVAL_MS = 10000
+# Tope absoluto del periodo cuando se retrocede por carga
+MAX_BACKOFF_INTERVAL_MS = 20000
+# Distancia a un umbral bajo la cual se muestrea a la máxima frecuencia
+NEAR_THRESHOLD_MARGIN = 0.1
+# Cambio del nivel de estrés entre muestras que se considera rápido
+FAST_CHANGE = 0.05
+# Latencia de inferencia y uso de CPU a partir de los cuales se retrocede
+HIGH_LATENCY = 1.5  # segundos
+HIGH_CPU_PERCENT = 80
+# El periodo nunca baja de este múltiplo de la latencia de inferencia
+LATENCY_MULTIPLE = 2
+# Factor de suavizado para el cambio del nivel de estrés
+CHANGE_ALPHA = 0.5
+
+
+def system_cpu_percent():
+    """Devuelve el uso de CPU del sistema desde la última llamada, o None sin psutil."""
+    if psutil is None:
+        return None
+    return psutil.cpu_percent(interval=None)
+
+
+class AdaptiveSampler:
+    """Elige el periodo hasta la siguiente detección según la estabilidad del estrés y la carga.
+
+    Muestrea poco cuando el nivel de estrés es estable y lejano a los umbrales,
+    rápido cuando se acerca a uno o cambia deprisa, y retrocede cuando la
+    inferencia tarda o la CPU está ocupada.
+    """
+
+    def __init__(self, thresholds, min_interval=MIN_INTERVAL_MS, max_interval=MAX_INTERVAL_MS):
+        self.thresholds = thresholds
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.previous_level = None
+        self.change = 0.0
+        self.interval = min_interval
+
+    def next_interval(self, stress_level, latency=None, cpu_percent=None):
+        """Devuelve el próximo periodo en milisegundos."""
+        if stress_level is not None:
+            if self.previous_level is not None:
+                delta = abs(stress_level - self.previous_level)
+                self.change += CHANGE_ALPHA * (delta - self.change)
+            self.previous_level = stress_level
+            distance = min(abs(stress_level - threshold) for threshold in self.thresholds)
+            near = max(0.0, 1.0 - distance / NEAR_THRESHOLD_MARGIN)
+            fast = min(1.0, self.change / FAST_CHANGE)
+            urgency = max(near, fast)
+            interval = self.max_interval - urgency * (self.max_interval - self.min_interval)
+        else:
+            interval = self.interval
+
+        # Retroceso por carga: inferencia lenta o CPU ocupada
+        if latency is not None and latency > HIGH_LATENCY:
+            interval *= latency / HIGH_LATENCY
+        if cpu_percent is not None and cpu_percent > HIGH_CPU_PERCENT:
+            interval *= 1 + (cpu_percent - HIGH_CPU_PERCENT) / (100 - HIGH_CPU_PERCENT)
+        if latency is not None:
+            interval = max(interval, latency * 1000 * LATENCY_MULTIPLE)
+
+        self.interval = int(min(max(interval, self.min_interval), MAX_BACKOFF_INTERVAL_MS))
+        return self.interval
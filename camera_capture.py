@@ -0,0 +1,256 @@
+import threading
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+# Número de frames que guarda el anillo de captura
+RING_SIZE = 4
+# Pausa tras un fallo de lectura para no girar en vacío mientras la cámara se renegocia
+READ_RETRY_DELAY = 0.05  # segundos
+# Factor de suavizado para los promedios móviles de FPS y latencia
+EMA_ALPHA = 0.1
+# Propiedades que se leen de vuelta tras abrir la cámara y se reutilizan al reabrirla
+NEGOTIATED_PROPERTIES = (cv2.CAP_PROP_FRAME_WIDTH, cv2.CAP_PROP_FRAME_HEIGHT, cv2.CAP_PROP_FOURCC, cv2.CAP_PROP_FPS)
+
+# Frame fijado por un lector: slot del anillo, vista del frame y anillo compartido que lo contiene
+FrameHandle = namedtuple("FrameHandle", ["slot", "frame", "timestamp", "sequence", "ring"])
+
+
+class SharedFrameRing:
+    """Anillo de frames alojado en memoria compartida para que otro proceso lo lea sin copiarlo."""
+
+    def __init__(self, ring_size, shape, dtype, name=None):
+        self.shape = (ring_size,) + tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        size = int(np.prod(self.shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.frames = np.ndarray(self.shape, dtype=self.dtype, buffer=self.shm.buf)
+
+    @classmethod
+    def attach(cls, descriptor):
+        """Abre desde otro proceso el anillo descrito por descriptor()."""
+        name, shape, dtype = descriptor
+        return cls(shape[0], shape[1:], dtype, name=name)
+
+    def descriptor(self):
+        return (self.shm.name, self.shape, self.dtype.str)
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class CameraCapture:
+    """Lee la cámara continuamente en su propio hilo y guarda los frames en un anillo preasignado.
+
+    Los lectores siempre obtienen el frame más reciente como una vista del anillo,
+    sin copiarlo. Mientras un lector usa un frame debe fijarlo con acquire_latest()
+    y soltarlo con release_slot() para que el hilo de captura no lo sobrescriba.
+    Con shared=True el anillo vive en memoria compartida y el proceso de inferencia
+    lee los frames directamente de él.
+    """
+
+    def __init__(self, device=0, ring_size=RING_SIZE, shared=False, properties=None):
+        self.device = device
+        self.ring_size = ring_size
+        self.shared = shared
+        self.properties = properties or {}  # Propiedades CAP_PROP_* que se aplican al abrir
+        self.negotiated = None  # Modo que aceptó el driver la primera vez; se pide tal cual al reabrir
+        self.api_preference = cv2.CAP_ANY  # Backend de captura que abrió el dispositivo
+        self.cap = None
+        self.frames = None  # Arreglo (ring_size, alto, ancho, canales), se crea con el primer frame
+        self.shared_ring = None
+        self.retired_rings = []  # Anillos reemplazados tras un cambio de resolución
+        self.timestamps = np.zeros(ring_size)
+        self.sequences = np.zeros(ring_size, dtype=np.int64)
+        self.pinned = np.zeros(ring_size, dtype=np.int32)
+        self.consumed = np.ones(ring_size, dtype=bool)
+        self.latest_slot = -1
+        self.lock = threading.Lock()
+        self.thread = None
+        self.running = False
+
+        # Contadores y métricas de captura
+        self.opens = 0
+        self.open_time = 0.0  # Duración de la última apertura del dispositivo
+        self.frames_captured = 0
+        self.dropped_frames = 0
+        self.stale_reads = 0
+        self.read_failures = 0
+        self.fps = 0.0
+        self.read_latency = 0.0  # Tiempo bloqueado en cap.read()
+        self.frame_age = 0.0  # Antigüedad del frame al entregarlo a un lector
+        self.last_delivered_sequence = 0
+
+    def open(self):
+        """Abre el dispositivo y arranca el hilo de captura. Devuelve True si la cámara quedó abierta."""
+        if self.isOpened():
+            return True
+        start = time.monotonic()
+        self.cap = cv2.VideoCapture(self.device, self.api_preference)
+        if not self.cap.isOpened():
+            self.cap = None
+            return False
+        # Pedimos al driver el búfer más pequeño posible para no recibir frames viejos
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.negotiated is None:
+            for prop, value in self.properties.items():
+                self.cap.set(prop, value)
+            # Guardamos lo que el driver aceptó para no volver a negociarlo en la próxima apertura
+            self.api_preference = int(self.cap.get(cv2.CAP_PROP_BACKEND))
+            self.negotiated = {prop: self.cap.get(prop) for prop in NEGOTIATED_PROPERTIES if self.cap.get(prop) > 0}
+        else:
+            for prop, value in self.negotiated.items():
+                self.cap.set(prop, value)
+        self.opens += 1
+        self.open_time = time.monotonic() - start
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="camera-capture", daemon=True)
+        self.thread.start()
+        return True
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self, keep_ring=False):
+        """Detiene el hilo de captura y libera el dispositivo.
+
+        Con keep_ring=True se conserva el anillo de frames (y su memoria compartida)
+        para reabrir la cámara sin volver a asignarlo; sus frames dejan de entregarse.
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        with self.lock:
+            self.latest_slot = -1
+            self.consumed[:] = True
+        if keep_ring:
+            return
+        self.frames = None
+        if self.shared_ring is not None:
+            self.retired_rings.append(self.shared_ring)
+            self.shared_ring = None
+        for ring in self.retired_rings:
+            ring.close()
+        self.retired_rings = []
+
+    def _allocate_ring(self, shape, dtype):
+        if not self.shared:
+            return np.empty((self.ring_size,) + shape, dtype=dtype)
+        # Un lector puede seguir usando el anillo anterior; lo cerramos al liberar la cámara
+        if self.shared_ring is not None:
+            self.retired_rings.append(self.shared_ring)
+        self.shared_ring = SharedFrameRing(self.ring_size, shape, dtype)
+        return self.shared_ring.frames
+
+    def _next_free_slot(self):
+        """Elige el siguiente slot que no esté fijado por un lector ni sea el más reciente."""
+        for offset in range(1, self.ring_size + 1):
+            slot = (self.latest_slot + offset) % self.ring_size
+            if slot != self.latest_slot and not self.pinned[slot]:
+                return slot
+        return None
+
+    def _run(self):
+        last_capture = None
+        while self.running:
+            with self.lock:
+                slot = self._next_free_slot() if self.frames is not None else 0
+
+            if slot is None:
+                # Todos los slots están fijados; descartamos este frame en el driver
+                self.cap.grab()
+                self.dropped_frames += 1
+                continue
+
+            start = time.monotonic()
+            if self.frames is None:
+                ret, frame = self.cap.read()
+            else:
+                ret, frame = self.cap.read(self.frames[slot])
+            now = time.monotonic()
+
+            if not ret:
+                self.read_failures += 1
+                time.sleep(READ_RETRY_DELAY)
+                continue
+
+            with self.lock:
+                if self.frames is None or frame.shape != self.frames.shape[1:]:
+                    # Primer frame o cambio de resolución: (re)creamos el anillo una sola vez
+                    self.frames = self._allocate_ring(frame.shape, frame.dtype)
+                    self.pinned[:] = 0
+                    self.consumed[:] = True
+                    slot = 0
+                    self.frames[slot] = frame
+                if not self.consumed[slot]:
+                    self.dropped_frames += 1
+                self.frames_captured += 1
+                self.sequences[slot] = self.frames_captured
+                self.timestamps[slot] = now
+                self.consumed[slot] = False
+                self.latest_slot = slot
+
+            self.read_latency += EMA_ALPHA * ((now - start) - self.read_latency)
+            if last_capture is not None and now > last_capture:
+                self.fps += EMA_ALPHA * (1.0 / (now - last_capture) - self.fps)
+            last_capture = now
+
+    def acquire_latest(self):
+        """Fija y devuelve un FrameHandle con el frame más reciente.
+
+        Devuelve None si aún no hay frames. El frame es una vista del anillo y sigue
+        siendo válido hasta llamar a release_slot(slot).
+        """
+        with self.lock:
+            slot = self.latest_slot
+            if slot < 0 or self.frames is None:
+                return None
+            sequence = int(self.sequences[slot])
+            if sequence == self.last_delivered_sequence:
+                self.stale_reads += 1
+            self.last_delivered_sequence = sequence
+            self.pinned[slot] += 1
+            self.consumed[slot] = True
+            timestamp = float(self.timestamps[slot])
+            frame = self.frames[slot]
+            ring = self.shared_ring
+        self.frame_age += EMA_ALPHA * ((time.monotonic() - timestamp) - self.frame_age)
+        return FrameHandle(slot, frame, timestamp, sequence, ring)
+
+    def release_slot(self, slot):
+        with self.lock:
+            if self.pinned[slot] > 0:
+                self.pinned[slot] -= 1
+
+    def latest(self):
+        """Devuelve (frame, timestamp) del frame más reciente sin copiarlo ni fijarlo."""
+        acquired = self.acquire_latest()
+        if acquired is None:
+            return None, 0.0
+        self.release_slot(acquired.slot)
+        return acquired.frame, acquired.timestamp
+
+    def stats(self):
+        """Devuelve un resumen de las métricas de captura."""
+        return {
+            "open": self.isOpened(),
+            "opens": self.opens,
+            "open_time_ms": round(self.open_time * 1000, 2),
+            "fps": round(self.fps, 2),
+            "read_latency_ms": round(self.read_latency * 1000, 2),
+            "frame_age_ms": round(self.frame_age * 1000, 2),
+            "frames_captured": self.frames_captured,
+            "dropped_frames": self.dropped_frames,
+            "stale_reads": self.stale_reads,
+            "read_failures": self.read_failures,
+        }
@@ -0,0 +1,330 @@
+"""Corrección por lotes de los casos que guardaron los estudiantes, sin Qt ni DeepFace.
+
+Uso:
+    python case_grading.py CARPETA_O_ARCHIVO... [--output informes] [--workers 4]
+"""
+import argparse
+import csv
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import geometry
+
+# Vector esperado de cada uno de los 7 casos del SEL de 3x2:
+# (rectas con la misma dirección, intersecciones, puntos en común a las tres rectas)
+EXPECTED_VECTORS = {
+    1: (3, 0, 0),  # Caso 1
+    2: (2, 2, 0),  # Caso 2
+    3: (2, 1, 1),  # Caso 3
+    4: (2, 1, 0),  # Caso 4
+    5: (0, 3, 1),  # Caso 5
+    6: (1, 2, 0),  # Caso 6
+    7: (0, 0, 1),  # Caso 7
+}
+# Posición de las tres rectas en cada caso, en el orden de las posiciones relativas de un SEL de 3x2:
+# (pares paralelos, pares coincidentes, puntos de intersección distintos, punto común a las tres)
+CASE_SIGNATURES = {
+    1: (3, 0, 0, 0),  # Tres rectas paralelas
+    2: (1, 0, 2, 0),  # Dos paralelas y una secante
+    3: (0, 1, 1, 1),  # Dos coincidentes y una secante
+    4: (2, 1, 0, 0),  # Dos coincidentes y una paralela
+    5: (0, 0, 1, 1),  # Tres secantes en un punto
+    6: (0, 0, 3, 0),  # Tres secantes dos a dos
+    7: (0, 3, 0, 1),  # Tres coincidentes
+}
+# Rectas de un caso (sistema de tres ecuaciones con dos incógnitas)
+CASE_LINES = 3
+# Carpeta donde se escriben los informes
+REPORT_DIR = "informes"
+# Procesos de corrección; None usa todos los núcleos
+GRADING_WORKERS = None
+# Con menos archivos que esto se corrige en el mismo proceso: arrancar el pool cuesta más que corregirlos
+MIN_FILES_FOR_POOL = 8
+# Extensión de los archivos que guarda el tutor (<nombre>.txt)
+STUDENT_FILE_EXTENSION = ".txt"
+
+# Formato de save_lines_to_file()
+CASE_HEADER = re.compile(r"^Caso (\d+):$")
+LINE_ENTRY = re.compile(r"^\((-?\d+), (-?\d+)\) -> \((-?\d+), (-?\d+)\)$")
+ANSWERS_ENTRY = re.compile(r"^Respuestas: RP1=(-?\d+), RP2=(-?\d+), RP3=(-?\d+)$")
+# Formato de save_all_cases(): caso,x1,y1,x2,y2
+CSV_ENTRY = re.compile(r"^(\d+),(-?\d+),(-?\d+),(-?\d+),(-?\d+)$")
+
+DETAIL_FIELDS = (
+    "student", "case", "lines", "relations", "drawn_vector", "expected_vector", "drawn_case",
+    "drawing_ok", "expected_matches_drawing", "answers", "answers_ok", "answers_match_drawing",
+)
+STUDENT_FIELDS = (
+    "student", "cases", "drawings_ok", "expected_matches_drawing", "answered", "answers_ok", "answers_match_drawing", "error",
+)
+CASE_FIELDS = (
+    "case", "expected_vector", "submissions", "drawings_ok", "expected_matches_drawing", "answered", "answers_ok",
+    "answers_match_drawing", "drawn_vectors",
+)
+
+
+def parse_saved_file(path):
+    """Lee un archivo guardado por el tutor en cualquiera de sus dos formatos.
+
+    Devuelve {caso: {"lines": [((x1, y1), (x2, y2)), ...], "answers": (RP1, RP2, RP3) o None}}.
+    Las líneas que no corresponden a ningún formato (puntos aleatorios, encabezados) se ignoran.
+    """
+    cases = {}
+    current = None
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        for raw in file:
+            text = raw.strip()
+            match = CSV_ENTRY.match(text)
+            if match:
+                config, x1, y1, x2, y2 = map(int, match.groups())
+                case = cases.setdefault(config, {"lines": [], "answers": None})
+                case["lines"].append(((x1, y1), (x2, y2)))
+                continue
+            match = CASE_HEADER.match(text)
+            if match:
+                current = cases.setdefault(int(match.group(1)), {"lines": [], "answers": None})
+                continue
+            if current is None:
+                continue
+            match = LINE_ENTRY.match(text)
+            if match:
+                x1, y1, x2, y2 = map(int, match.groups())
+                current["lines"].append(((x1, y1), (x2, y2)))
+                continue
+            match = ANSWERS_ENTRY.match(text)
+            if match:
+                current["answers"] = tuple(map(int, match.groups()))
+    return cases
+
+
+def case_signatures(lines):
+    """Relaciones de cada configuración (N, K, 2, 2) que definen su caso, (N, 4).
+
+    Por configuración: pares paralelos (misma pendiente, distintos extremos),
+    pares coincidentes (mismos extremos), puntos de intersección distintos dentro
+    de los segmentos y si todas las rectas pasan por un mismo punto.
+    """
+    lines = geometry.as_line_array(lines)
+    points = geometry.intersection_points(lines)
+    parallel, coincident = geometry.direction_counts(lines)
+    return np.stack([
+        parallel,
+        coincident,
+        geometry.distinct_intersection_counts(lines, points),
+        geometry.concurrent(lines, points).astype(int),
+    ], axis=1)
+
+
+def drawn_vectors(lines, signatures=None):
+    """Vector que miden las rectas de cada configuración (N, K, 2, 2), (N, 3).
+
+    Con las mismas componentes que EXPECTED_VECTORS: rectas que comparten su
+    dirección con otra (paralelas o coincidentes), puntos de intersección
+    distintos y si hay un punto común a todas (1) o no (0). Las dos últimas
+    salen de la firma de case_signatures().
+    """
+    lines = geometry.as_line_array(lines)
+    if signatures is None:
+        signatures = case_signatures(lines)
+    k = lines.shape[1]
+    shared = (geometry.same_slope(lines) & ~np.eye(k, dtype=bool)).any(axis=2).sum(axis=1)
+    return np.stack([shared, signatures[:, 2], signatures[:, 3]], axis=1)
+
+
+def case_for_signature(signature, lines=CASE_LINES):
+    """Caso que forman lines rectas con estas relaciones, o None."""
+    if lines != CASE_LINES:
+        return None
+    for case, expected in CASE_SIGNATURES.items():
+        if tuple(signature) == expected:
+            return case
+    return None
+
+
+def case_for_vector(vector):
+    """Caso cuyo vector esperado coincide con el dado (p. ej. las respuestas del estudiante), o None."""
+    for case, expected in EXPECTED_VECTORS.items():
+        if tuple(vector) == expected:
+            return case
+    return None
+
+
+def grade_file(path):
+    """Corrige todos los casos de un estudiante.
+
+    El dibujo es correcto si sus rectas forman el caso pedido. El vector medido
+    en el dibujo se compara con el vector esperado y con las respuestas.
+    """
+    student = os.path.splitext(os.path.basename(path))[0]
+    try:
+        cases = parse_saved_file(path)
+    except OSError as e:
+        return {"student": student, "path": path, "cases": [], "error": str(e)}
+
+    # Se agrupan los casos por número de rectas para calcularlos en una sola llamada vectorizada
+    signatures = {}
+    measured = {}
+    by_size = {}
+    for number, case in cases.items():
+        by_size.setdefault(len(case["lines"]), []).append(number)
+    for size, numbers in by_size.items():
+        if size == 0:
+            for number in numbers:
+                signatures[number] = (0, 0, 0, 0)
+                measured[number] = (0, 0, 0)
+            continue
+        stacked = np.array([cases[number]["lines"] for number in numbers], dtype=float)
+        stacked_signatures = case_signatures(stacked)
+        for number, signature, vector in zip(numbers, stacked_signatures, drawn_vectors(stacked, stacked_signatures)):
+            signatures[number] = tuple(int(value) for value in signature)
+            measured[number] = tuple(int(value) for value in vector)
+
+    graded = []
+    for number in sorted(cases):
+        answers = cases[number]["answers"]
+        expected = EXPECTED_VECTORS.get(number)
+        drawn_case = case_for_signature(signatures[number], len(cases[number]["lines"]))
+        drawn = measured[number]
+        graded.append({
+            "case": number,
+            "lines": len(cases[number]["lines"]),
+            "relations": signatures[number],
+            "drawn_vector": drawn,
+            "expected_vector": expected,
+            "drawn_case": drawn_case,
+            "drawing_ok": drawn_case == number,
+            "expected_matches_drawing": drawn == expected,
+            "answers": answers,
+            "answers_ok": answers == expected if answers is not None else None,
+            "answers_match_drawing": answers == drawn if answers is not None else None,
+        })
+    return {"student": student, "path": path, "cases": graded, "error": None}
+
+
+def find_student_files(paths):
+    """Expande carpetas a sus archivos .txt; los archivos sueltos se usan tal cual."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.endswith(STUDENT_FILE_EXTENSION)
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def grade_files(paths, workers=GRADING_WORKERS):
+    """Corrige los archivos repartiéndolos en un pool de procesos; descarta los que no tienen casos."""
+    if workers == 1 or len(paths) < MIN_FILES_FOR_POOL:
+        results = [grade_file(path) for path in paths]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(paths) // (workers * 4))
+        # "spawn" como el proceso de inferencia: los trabajadores no heredan el estado del padre
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(grade_file, paths, chunksize=chunksize))
+    return [result for result in results if result["cases"] or result["error"]]
+
+
+def _vector_text(vector):
+    return "" if vector is None else "(" + ", ".join(str(value) for value in vector) + ")"
+
+
+def _count(rows, key):
+    return sum(1 for row in rows if row[key])
+
+
+def write_reports(results, folder=REPORT_DIR):
+    """Escribe el detalle por estudiante y caso, el resumen por estudiante y el resumen por caso."""
+    os.makedirs(folder, exist_ok=True)
+    paths = {name: os.path.join(folder, f"{name}.csv") for name in ("detalle", "estudiantes", "casos")}
+
+    with open(paths["detalle"], "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=DETAIL_FIELDS)
+        writer.writeheader()
+        for result in results:
+            for case in result["cases"]:
+                writer.writerow({
+                    **case,
+                    "student": result["student"],
+                    "relations": _vector_text(case["relations"]),
+                    "drawn_vector": _vector_text(case["drawn_vector"]),
+                    "expected_vector": _vector_text(case["expected_vector"]),
+                    "answers": _vector_text(case["answers"]),
+                })
+
+    with open(paths["estudiantes"], "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=STUDENT_FIELDS)
+        writer.writeheader()
+        for result in results:
+            cases = result["cases"]
+            writer.writerow({
+                "student": result["student"],
+                "cases": len(cases),
+                "drawings_ok": _count(cases, "drawing_ok"),
+                "expected_matches_drawing": _count(cases, "expected_matches_drawing"),
+                "answered": sum(1 for case in cases if case["answers"] is not None),
+                "answers_ok": _count(cases, "answers_ok"),
+                "answers_match_drawing": _count(cases, "answers_match_drawing"),
+                "error": result["error"] or "",
+            })
+
+    with open(paths["casos"], "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CASE_FIELDS)
+        writer.writeheader()
+        numbers = sorted(set(EXPECTED_VECTORS) | {case["case"] for result in results for case in result["cases"]})
+        for number in numbers:
+            cases = [case for result in results for case in result["cases"] if case["case"] == number]
+            drawn = {}
+            for case in cases:
+                drawn[case["drawn_vector"]] = drawn.get(case["drawn_vector"], 0) + 1
+            writer.writerow({
+                "case": number,
+                "expected_vector": _vector_text(EXPECTED_VECTORS.get(number)),
+                "submissions": len(cases),
+                "drawings_ok": _count(cases, "drawing_ok"),
+                "expected_matches_drawing": _count(cases, "expected_matches_drawing"),
+                "answered": sum(1 for case in cases if case["answers"] is not None),
+                "answers_ok": _count(cases, "answers_ok"),
+                "answers_match_drawing": _count(cases, "answers_match_drawing"),
+                # Vectores dibujados, del más frecuente al menos frecuente
+                "drawn_vectors": "; ".join(
+                    f"{_vector_text(vector)} x{count}"
+                    for vector, count in sorted(drawn.items(), key=lambda item: -item[1])
+                ),
+            })
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="Archivos .txt guardados por el tutor o carpetas que los contienen")
+    parser.add_argument("--output", default=REPORT_DIR, help="Carpeta de los informes")
+    parser.add_argument("--workers", type=int, default=GRADING_WORKERS, help="Procesos de corrección (por defecto, todos los núcleos)")
+
+    args = parser.parse_args()
+    start = time.perf_counter()
+    files = find_student_files(args.paths)
+    results = grade_files(files, args.workers)
+    if not results:
+        print("No se encontraron casos guardados en los archivos indicados.")
+        return
+    paths = write_reports(results, args.output)
+    cases = sum(len(result["cases"]) for result in results)
+    drawings_ok = sum(_count(result["cases"], "drawing_ok") for result in results)
+    answers_ok = sum(_count(result["cases"], "answers_ok") for result in results)
+    print(
+        f"{len(results)} estudiantes, {cases} casos: {drawings_ok} dibujos y {answers_ok} respuestas correctos "
+        f"({time.perf_counter() - start:.2f} s)."
+    )
+    print(f"Informes en '{os.path.dirname(paths['detalle']) or '.'}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Exporta el modelo de emociones de DeepFace a ONNX y compara los backends sobre imágenes locales.
+
+Uso:
+    python compare_backends.py export [--output modelos/emotion.onnx] [--int8]
+    python compare_backends.py compare CARPETA_DE_IMAGENES [--model modelos/emotion.onnx] [--runtime onnxruntime]
+"""
+import argparse
+import os
+import time
+import cv2
+import numpy as np
+from emotion_backends import (
+    DeepFaceBackend,
+    OnnxEmotionBackend,
+    dominant_emotion,
+    ONNX_MODEL_PATH,
+    ONNX_RUNTIME,
+    MODEL_INPUT_SIZE,
+)
+from rolling_stress import STRESS_WEIGHTS, normalize_stress
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def export_model(output=ONNX_MODEL_PATH, int8=False):
+    """Exporta el modelo Keras de emociones de DeepFace a ONNX y opcionalmente lo cuantiza a int8."""
+    from deepface import DeepFace
+    import tensorflow as tf
+    import tf2onnx
+
+    model = DeepFace.build_model(model_name="Emotion", task="facial_attribute").model
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    signature = (tf.TensorSpec((None, MODEL_INPUT_SIZE, MODEL_INPUT_SIZE, 1), tf.float32, name="input"),)
+    tf2onnx.convert.from_keras(model, input_signature=signature, opset=13, output_path=output)
+    if int8:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        quantized = output.replace(".onnx", ".int8.onnx")
+        quantize_dynamic(output, quantized, weight_type=QuantType.QInt8)
+        output = quantized
+    print(f"Modelo exportado en '{output}'.")
+    return output
+
+
+def load_images(folder):
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(folder, name))
+            if image is not None:
+                yield name, image
+
+
+def compare_backends(folder, model_path=None, runtime=ONNX_RUNTIME):
+    """Clasifica el mismo recorte de rostro con ambos backends y resume cuánto coinciden."""
+    reference = DeepFaceBackend()
+    candidate = OnnxEmotionBackend(model_path, runtime)
+
+    agreements, differences, stress_differences = [], [], []
+    reference_times, candidate_times = [], []
+    for name, image in load_images(folder):
+        # Ambos backends reciben exactamente el mismo recorte
+        box = candidate.detect_face(image)
+        if box is not None:
+            x, y, w, h = box
+            image = image[y:y + h, x:x + w]
+
+        start = time.perf_counter()
+        expected = reference.classify(image)
+        reference_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        obtained = candidate.classify(image)
+        candidate_times.append(time.perf_counter() - start)
+
+        agreements.append(dominant_emotion(expected) == dominant_emotion(obtained))
+        differences.append(np.abs(expected - obtained))
+        stress_differences.append(
+            abs(normalize_stress(float(expected @ STRESS_WEIGHTS)) - normalize_stress(float(obtained @ STRESS_WEIGHTS)))
+        )
+        print(
+            f"{name}: {dominant_emotion(expected)} / {dominant_emotion(obtained)}"
+            f"  diferencia máxima {differences[-1].max():.3f}{'' if box is not None else '  (sin rostro, imagen completa)'}"
+        )
+
+    if not agreements:
+        print(f"No se encontraron imágenes en '{folder}'.")
+        return None
+
+    differences = np.array(differences)
+    summary = {
+        "images": len(agreements),
+        "top1_agreement": float(np.mean(agreements)),
+        "mean_abs_difference": float(differences.mean()),
+        "max_abs_difference": float(differences.max()),
+        "mean_stress_difference": float(np.mean(stress_differences)),
+        "deepface_ms": float(np.mean(reference_times) * 1000),
+        "onnx_ms": float(np.mean(candidate_times) * 1000),
+    }
+    print()
+    print(f"Imágenes: {summary['images']}")
+    print(f"Coincidencia de emoción dominante: {summary['top1_agreement']:.1%}")
+    print(f"Diferencia absoluta media / máxima: {summary['mean_abs_difference']:.4f} / {summary['max_abs_difference']:.4f}")
+    print(f"Diferencia media del nivel de estrés: {summary['mean_stress_difference']:.4f}")
+    print(f"Latencia media DeepFace / ONNX ({runtime}): {summary['deepface_ms']:.1f} ms / {summary['onnx_ms']:.1f} ms")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Exporta el modelo de emociones a ONNX")
+    export.add_argument("--output", default=ONNX_MODEL_PATH)
+    export.add_argument("--int8", action="store_true", help="Cuantiza los pesos a int8")
+
+    compare = commands.add_parser("compare", help="Compara DeepFace con el modelo exportado")
+    compare.add_argument("folder")
+    compare.add_argument("--model", default=None, help="Por defecto, el modelo de la caché o " + ONNX_MODEL_PATH)
+    compare.add_argument("--runtime", default=ONNX_RUNTIME, choices=("onnxruntime", "opencv"))
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export_model(args.output, args.int8)
+    else:
+        compare_backends(args.folder, args.model, args.runtime)
+
+
+if __name__ == "__main__":
+    main()
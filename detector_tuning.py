@@ -0,0 +1,210 @@
+"""Mide en este equipo los detectores de rostros disponibles y guarda el más rápido que cumple los requisitos.
+
+Uso:
+    python detector_tuning.py [--images imagenes/rostros] [--force]
+
+El repositorio no incluye imágenes de rostros: hay que copiar en la carpeta
+algunas fotos (una cara por imagen, con la luz y la cámara del aula) antes de
+medir. El tutor no lo ejecuta al arrancar salvo que se active
+AUTO_TUNE_DETECTOR en emotion_detection.py.
+"""
+import argparse
+import json
+import os
+import platform
+import time
+import cv2
+import numpy as np
+
+# Carpeta con las imágenes de rostros para el benchmark (cada imagen debe contener un rostro); no viene en el repositorio
+BENCHMARK_IMAGES_DIR = os.path.join("imagenes", "rostros")
+# Carpeta de configuración local del tutor
+SETTINGS_DIR = os.path.join(os.path.expanduser("~"), ".tutor_inteligente")
+# Archivo donde se guarda el detector elegido
+TUNING_FILE = os.path.join(SETTINGS_DIR, "detector.json")
+# Detectores de DeepFace que se prueban, del más barato al más caro
+DETECTOR_CANDIDATES = ("opencv", "ssd", "mtcnn", "retinaface")
+# Presupuesto de latencia (p95) y tasa mínima de detección para aceptar un detector
+LATENCY_BUDGET_MS = 150
+DETECTION_RATE_FLOOR = 0.8
+# Repeticiones por imagen y tiempo máximo dedicado a cada detector
+BENCHMARK_REPEATS = 3
+MAX_SECONDS_PER_DETECTOR = 20
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def has_benchmark_images(folder=BENCHMARK_IMAGES_DIR):
+    """Indica si la carpeta tiene imágenes para el benchmark, sin leerlas."""
+    if not os.path.isdir(folder):
+        return False
+    return any(name.lower().endswith(IMAGE_EXTENSIONS) for name in os.listdir(folder))
+
+
+def load_benchmark_images(folder=BENCHMARK_IMAGES_DIR):
+    if not os.path.isdir(folder):
+        return []
+    images = []
+    for name in sorted(os.listdir(folder)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            image = cv2.imread(os.path.join(folder, name))
+            if image is not None:
+                images.append(image)
+    return images
+
+
+def benchmark_detector(detector, images, repeats=BENCHMARK_REPEATS, max_seconds=MAX_SECONDS_PER_DETECTOR):
+    """Mide latencia y tasa de detección de un detector de DeepFace. Devuelve None si no está disponible."""
+    from deepface import DeepFace
+
+    latencies = []
+    detected = 0
+    started = time.monotonic()
+    # Primera llamada fuera de la medición: construye el modelo del detector
+    try:
+        DeepFace.extract_faces(images[0], detector_backend=detector, enforce_detection=False)
+    except Exception as e:
+        print(f"Detector '{detector}' no disponible: {e}")
+        return None
+
+    for image in images:
+        found = False
+        for _ in range(repeats):
+            start = time.perf_counter()
+            try:
+                faces = DeepFace.extract_faces(image, detector_backend=detector, enforce_detection=True)
+                found = bool(faces)
+            except ValueError:
+                found = False
+            latencies.append((time.perf_counter() - start) * 1000)
+        detected += found
+        if time.monotonic() - started > max_seconds:
+            break
+
+    measured = len(latencies) // repeats
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "detection_rate": detected / measured,
+        "images": measured,
+    }
+
+
+def choose_detector(results, latency_budget=LATENCY_BUDGET_MS, rate_floor=DETECTION_RATE_FLOOR):
+    """Elige el detector más rápido (p95) dentro del presupuesto y sobre la tasa mínima.
+
+    Si ninguno cumple ambos requisitos devuelve None y se usa el detector por
+    defecto: el de mayor tasa suele ser el más lento, justo lo que hay que evitar
+    en un equipo que no alcanza el presupuesto.
+    """
+    eligible = [
+        (stats["p95_ms"], name)
+        for name, stats in results.items()
+        if stats["p95_ms"] <= latency_budget and stats["detection_rate"] >= rate_floor
+    ]
+    if eligible:
+        # Ante un empate gana el primero de la lista, que es el más barato
+        return min(eligible, key=lambda item: item[0])[1]
+    return None
+
+
+def save_tuning(detector, results, path=TUNING_FILE, status="chosen"):
+    """Guarda el resultado de la medición para este equipo.
+
+    status es "chosen" (detector dentro del presupuesto), "over_budget"
+    o "no_images"; en los dos últimos detector es None y se usa el de por defecto.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "detector": detector,
+        "status": status,
+        "host": platform.node(),
+        "cpu_count": os.cpu_count(),
+        "measured_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "latency_budget_ms": LATENCY_BUDGET_MS,
+        "detection_rate_floor": DETECTION_RATE_FLOOR,
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(data, file, indent=2)
+
+
+def load_tuning(path=TUNING_FILE):
+    """Devuelve el resultado guardado para este equipo, o None si aún no se ha medido."""
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if data.get("host") != platform.node():
+        return None  # Carpeta personal compartida entre equipos: hay que volver a medir
+    return data
+
+
+def load_tuned_detector(path=TUNING_FILE):
+    """Devuelve el detector elegido para este equipo, o None para usar el de por defecto."""
+    data = load_tuning(path)
+    if data is None or data.get("status", "chosen") != "chosen":
+        return None
+    return data.get("detector")
+
+
+def tuning_needed(folder=BENCHMARK_IMAGES_DIR, path=TUNING_FILE):
+    """Indica si hay que medir los detectores en este equipo.
+
+    No se mide si ya hay un resultado guardado ni si no hay imágenes; en ese caso
+    se guarda "no_images" y solo se vuelve a revisar la carpeta (un listado,
+    sin lanzar el proceso de medición).
+    """
+    data = load_tuning(path)
+    if data is not None and data.get("status") != "no_images":
+        return False
+    if has_benchmark_images(folder):
+        return True
+    if data is None:
+        save_tuning(None, {}, path, status="no_images")
+    return False
+
+
+def run_tuning(folder=BENCHMARK_IMAGES_DIR, candidates=DETECTOR_CANDIDATES):
+    """Mide todos los detectores disponibles, guarda el elegido y lo devuelve."""
+    images = load_benchmark_images(folder)
+    if not images:
+        print(f"No hay imágenes de rostros en '{folder}'; se mantiene el detector por defecto.")
+        save_tuning(None, {}, status="no_images")
+        return None
+
+    results = {}
+    for detector in candidates:
+        stats = benchmark_detector(detector, images)
+        if stats is not None:
+            results[detector] = stats
+            print(
+                f"{detector}: p50 {stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                f"detección {stats['detection_rate']:.0%}"
+            )
+    detector = choose_detector(results)
+    if detector is not None:
+        save_tuning(detector, results)
+        print(f"Detector elegido: {detector}")
+    else:
+        # Se guardan las mediciones para no repetirlas en cada arranque, pero no se elige ningún detector
+        save_tuning(None, results, status="over_budget")
+        print(f"Ningún detector cumple {LATENCY_BUDGET_MS} ms y {DETECTION_RATE_FLOOR:.0%}; se mantiene el detector por defecto.")
+    return detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", default=BENCHMARK_IMAGES_DIR)
+    parser.add_argument("--force", action="store_true", help="Vuelve a medir aunque ya haya un detector guardado")
+    args = parser.parse_args()
+    tuned = load_tuning()
+    if tuned is not None and tuned.get("status") != "no_images" and not args.force:
+        print(f"Detector ya medido para este equipo: {tuned.get('detector') or 'por defecto'} (use --force para volver a medir)")
+        return
+    run_tuning(args.images)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,26 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtGui import QPainter, QPen, QFont, QPixmap
 from PyQt6.QtCore import Qt, QPoint, QTimer
 import os
+import time
 import random  # Asegúrate de incluir esta línea
-from math import cos, sin, radians, degrees, atan2, sqrt
+from math import cos, sin, radians, degrees, atan2
+import numpy as np
+import geometry
+from case_grading import EXPECTED_VECTORS
+from live_case import LiveCaseClassifier
+from spatial_index import SegmentGrid
+
+# Máximo de rectas en el área de dibujo (los casos del SEL usan 3; los ejercicios avanzados, más)
+MAX_LINES = 300
+# Rectas por columna al agregarlas: las siguientes se colocan en una nueva columna
+LINES_PER_COLUMN = 10
+# Ecuaciones que se muestran en la etiqueta; con más rectas no cabrían en la ventana
+MAX_EQUATIONS_SHOWN = 10
+
+
+def segment(line):
+    """Convierte un par de QPoint en ((x1, y1), (x2, y2)) para el módulo geometry."""
+    return [(point.x(), point.y()) for point in line]
 
 
 class DrawingArea(QWidget):
@@ -32,15 +50,12 @@ class DrawingArea(QWidget):
         self.resizing = False
         self.start_point = None
         self.data_name = None
-        self.expected_vectors = {
-            1: (3, 0, 0),  # Caso 1
-            2: (2, 2, 0),  # Caso 2
-            3: (2, 1, 1),  # Caso 3
-            4: (2, 1, 0),  # Caso 4
-            5: (0, 3, 1),  # Caso 5
-            6: (1, 2, 0),  # Caso 6
-            7: (0, 0, 1),  # Caso 7
-        }
+        self.ui_probe = None  # Sonda de latencia de la interfaz (la asigna LineWidget)
+        self.expected_vectors = dict(EXPECTED_VECTORS)  # Compartido con la corrección por lotes
+        self.live_case = LiveCaseClassifier()  # Relaciones entre pares de rectas, para el caso en vivo
+        self.generated_cases = set()  # Casos cuyas rectas generó el tutor en vez de cargarlas del archivo
+        self.line_edits = {}  # Cambios que hizo el estudiante a las rectas de cada caso
+        self.hit_index = SegmentGrid()  # Extremos y segmentos por celda, para elegir la recta de un clic
 
         self.setMouseTracking(True)
         self.setup_layout()
@@ -131,6 +146,10 @@ class DrawingArea(QWidget):
         self.equations_label.setStyleSheet("font-size: 14px; margin: 10px;")
         main_layout.addWidget(self.equations_label)
 
+        self.case_label = QLabel("")
+        self.case_label.setStyleSheet("font-size: 14px; margin: 0px 10px;")
+        main_layout.addWidget(self.case_label)
+
 
         top_layout = QHBoxLayout()
         top_layout.addStretch()
@@ -163,34 +182,15 @@ class DrawingArea(QWidget):
     def connect_cancel_button(self, on_cancel_button_clicked_function):
         self.cancel_button.clicked.connect(on_cancel_button_clicked_function)
 
-    def set_current_configuration(self, config_number):
-        self.current_configuration = config_number
-        self.lines = []  # Limpiar las líneas existentes
-        self.generate_parallel_lines()  # Generar automáticamente tres líneas
-        self.configurations[config_number] = self.lines
-        self.update()
-
-    def generate_parallel_lines(self):
-        self.lines.clear()
-        self.random_points.clear()  # Limpia los puntos aleatorios al cambiar de configuración
-        start_x, start_y, length, spacing = 100, 100, 200, 50
-
-        for i in range(3):
-            p1 = QPoint(start_x, start_y + i * spacing)
-            p2 = QPoint(start_x + length, start_y + i * spacing)
-            self.lines.append(([p1, p2], Qt.GlobalColor.blue))
-            # Genera y almacena puntos aleatorios para cada línea
-            self.get_random_points_on_line((p1, p2), i)
-
-        self.update()
-
+    def line_array(self, lines=None):
+        """Devuelve los segmentos como arreglo (K, 2, 2) para el módulo geometry."""
+        lines = self.lines if lines is None else lines
+        return np.array([segment(line) for line, _ in lines], dtype=float).reshape(-1, 2, 2)
 
     def calculate_slope(self, line):
         """Calcula la pendiente de una recta."""
-        p1, p2 = line
-        if p2.x() - p1.x() == 0:  # Evitar división por cero
-            return None  # Recta vertical
-        return round((p2.y() - p1.y()) / (p2.x() - p1.x()), 2)
+        slope = geometry.slopes([segment(line)])[0, 0]
+        return None if np.isnan(slope) else float(slope)  # None si la recta es vertical
 
     def get_random_points_on_line(self, line, line_index):
         # Verifica si los puntos para esta línea ya están generados
@@ -211,209 +211,36 @@ class DrawingArea(QWidget):
         return random_points
 
 
-    def check_directions(self):
-        """Verifica cuántas rectas tienen la misma pendiente (paralelas) y cuáles son coincidentes."""
-        if len(self.lines) < 3:
-            return {"paralelas": 0, "coincidentes": 0}
-
-        pendientes = []
-        for line, _ in self.lines:
-            pendientes.append(self.calculate_slope(line))
-
-        # Contar rectas con la misma pendiente (paralelismo)
-        paralelas = sum(pendientes.count(p) > 1 for p in set(pendientes))
-
-        # Verificar coincidencia (pendiente + mismos puntos)
-        coincidentes = 0
-        for i in range(len(self.lines)):
-            for j in range(i + 1, len(self.lines)):
-                if (
-                    pendientes[i] == pendientes[j]
-                    and self.lines[i][0] == self.lines[j][0]
-                ):
-                    coincidentes += 1
-
-        return {"paralelas": paralelas, "coincidentes": coincidentes}
-
-    def check_directions(self):
-        """Verifica cuántas rectas tienen la misma pendiente (paralelas) y cuáles son coincidentes."""
-        if len(self.lines) < 2:
-            return {"paralelas": 0, "coincidentes": 0}
-
-        pendientes = []
-        for line, _ in self.lines:
-            pendientes.append(self.calculate_slope(line))
-
-        # Contar rectas paralelas
-        paralelas = 0
-        coincidentes = 0
-        for i in range(len(pendientes)):
-            for j in range(i + 1, len(pendientes)):
-                if pendientes[i] == pendientes[j]:
-                    # Verificar si también son coincidentes
-                    if self.lines[i][0] == self.lines[j][0]:
-                        coincidentes += 1
-                    else:
-                        paralelas += 1
-
-        return {"paralelas": paralelas, "coincidentes": coincidentes}
-
     def calculate_intersection(self, line1, line2):
         """Calcula el punto de intersección entre dos líneas si existe."""
-        p1, q1 = line1
-        p2, q2 = line2
-
-        # Convertir los puntos a coordenadas
-        x1, y1 = p1.x(), p1.y()
-        x2, y2 = q1.x(), q1.y()
-        x3, y3 = p2.x(), p2.y()
-        x4, y4 = q2.x(), q2.y()
-
-        # Calcular el determinante
-        denominator = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
-
-        if denominator == 0:  # Líneas paralelas o coincidentes
-            return None
-
-        # Calcular las coordenadas del punto de intersección
-        px = (
-            (x1 * y2 - y1 * x2) * (x3 - x4) - (x1 - x2) * (x3 * y4 - y3 * x4)
-        ) / denominator
-        py = (
-            (x1 * y2 - y1 * x2) * (y3 - y4) - (y1 - y2) * (x3 * y4 - y3 * x4)
-        ) / denominator
-
-        # Verificar si el punto está dentro de los segmentos de línea
-        if not (min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2)):
-            return None
-        if not (min(x3, x4) <= px <= max(x3, x4) and min(y3, y4) <= py <= max(y3, y4)):
+        point = geometry.intersection_points([segment(line1), segment(line2)])[0, 0, 1]
+        if np.isnan(point[0]):  # Paralelas, coincidentes o fuera de los segmentos
             return None
-
-        return QPoint(
-            int(round(px)), int(round(py))
-        )  # Convierte a enteros después de redondear
+        return QPoint(int(point[0]), int(point[1]))
 
     def count_intersections(self):
         """Cuenta el número de intersecciones entre todas las líneas."""
-        num_intersections = 0
-        for i in range(len(self.lines)):
-            for j in range(i + 1, len(self.lines)):
-                if self.check_intersection(self.lines[i][0], self.lines[j][0]):
-                    num_intersections += 1
-        return num_intersections
+        self.sync_line_caches()
+        return self.live_case.intersection_count()
 
     def check_intersection(self, line1, line2):
         """Comprueba si dos líneas se intersectan."""
-        p1, q1 = line1
-        p2, q2 = line2
-
-        def orientation(p, q, r):
-            """Calcula la orientación de tres puntos:
-            0 -> Colineares
-            1 -> Horario
-            2 -> Antihorario
-            """
-            val = (q.y() - p.y()) * (r.x() - q.x()) - (q.x() - p.x()) * (r.y() - q.y())
-            if val == 0:
-                return 0
-            return 1 if val > 0 else 2
-
-        def on_segment(p, q, r):
-            """Comprueba si el punto q está en el segmento pr."""
-            return min(p.x(), r.x()) <= q.x() <= max(p.x(), r.x()) and min(
-                p.y(), r.y()
-            ) <= q.y() <= max(p.y(), r.y())
-
-        # Encuentra las orientaciones necesarias para verificar la intersección
-        o1 = orientation(p1, q1, p2)
-        o2 = orientation(p1, q1, q2)
-        o3 = orientation(p2, q2, p1)
-        o4 = orientation(p2, q2, q1)
-
-        # Condiciones generales
-        if o1 != o2 and o3 != o4:
-            return True
-
-        # Casos especiales
-        # p1, q1 y p2 son colineares y p2 está en el segmento p1q1
-        if o1 == 0 and on_segment(p1, p2, q1):
-            return True
-        # p1, q1 y q2 son colineares y q2 está en el segmento p1q1
-        if o2 == 0 and on_segment(p1, q2, q1):
-            return True
-        # p2, q2 y p1 son colineares y p1 está en el segmento p2q2
-        if o3 == 0 and on_segment(p2, p1, q2):
-            return True
-        # p2, q2 y q1 son colineares y q1 está en el segmento p2q2
-        if o4 == 0 and on_segment(p2, q1, q2):
-            return True
-
-        return False
+        return bool(geometry.segments_intersect([segment(line1), segment(line2)])[0, 0, 1])
 
     def check_directions(self):
         """Verifica cuántas rectas tienen la misma pendiente (paralelas) y cuáles son coincidentes."""
         if len(self.lines) < 2:
             return {"paralelas": 0, "coincidentes": 0}
-
-        pendientes = []
-        for line, _ in self.lines:
-            pendientes.append(self.calculate_slope(line))
-
-        # Contar rectas paralelas
-        paralelas = 0
-        coincidentes = 0
-        for i in range(len(pendientes)):
-            for j in range(i + 1, len(pendientes)):
-                if pendientes[i] == pendientes[j]:  # Misma pendiente
-                    # Verificar si los puntos también coinciden
-                    if (
-                        self.lines[i][0][0] == self.lines[j][0][0]
-                        and self.lines[i][0][1] == self.lines[j][0][1]
-                    ):
-                        coincidentes += 1
-                    else:
-                        paralelas += 1
-
+        self.sync_line_caches()
+        paralelas, coincidentes = self.live_case.direction_counts()
         return {"paralelas": paralelas, "coincidentes": coincidentes}
 
     def common_point_for_three_lines(self):
         """Verifica si hay un punto en común entre las tres rectas y devuelve un tuple."""
         if len(self.lines) < 3:
             return None
-
-        intersection_12 = self.calculate_intersection(
-            self.lines[0][0], self.lines[1][0]
-        )
-        intersection_13 = self.calculate_intersection(
-            self.lines[0][0], self.lines[2][0]
-        )
-
-        if intersection_12 and intersection_12 == intersection_13:
-            # Devuelve el punto común como un tuple con coordenadas divididas entre 100
-            return (
-                round(intersection_12.x() / 100, 2),
-                round(intersection_12.y() / 100, 2),
-            )
-        return None
-
-    def get_lines_data(self):
-        """Devuelve un diccionario con datos de todas las rectas."""
-        data = {}
-        for i, (line, color) in enumerate(self.lines):
-            slope = self.calculate_slope(line)
-            random_points = self.get_random_points_on_line(line)
-            intersections = []
-            for j, (other_line, _) in enumerate(self.lines):
-                if i != j and self.check_intersection(line, other_line):
-                    intersections.append(j + 1)
-            data[f"Recta {i + 1}"] = {
-                "Pendiente": round(slope, 2) if slope is not None else "Vertical",
-                "Puntos Aleatorios": [
-                    (round(p.x()), round(p.y())) for p in random_points
-                ],
-                "Intersecciones": intersections,
-            }
-        return data
+        self.sync_line_caches()
+        return self.live_case.common_point()  # Coordenadas divididas entre 100, como se muestran al estudiante
 
     def show_lines_data(self):
         """Muestra los datos de las rectas: pendientes, intersecciones y puntos en común."""
@@ -457,24 +284,23 @@ class DrawingArea(QWidget):
 
     def handle_left_click(self, pos):
         if self.selected_line_index is None:
-            for i, (line, _) in enumerate(self.lines):
-                if self.handle_line_or_point_selection(pos, line, i):
-                    return
+            self.handle_line_or_point_selection(pos)
         else:
             self.dragging = True
             self.update()
 
-    def handle_line_or_point_selection(self, pos, line, index):
-        for j, point in enumerate(line):
-            if self.is_point_near_point(pos, point):
-                self.selected_line_index = index
-                self.selected_point_index = j
-                self.dragging = self.resizing = True
-                self.start_point = pos
-                self.update()
-                return True
-        if self.is_point_near_line(pos, line):
-            self.selected_line_index = index
+    def handle_line_or_point_selection(self, pos):
+        """Toma el extremo más cercano al clic o, si no hay, la recta más cercana; usa el índice espacial."""
+        points = self.hit_index.points_near(pos.x(), pos.y())
+        if points:
+            self.selected_line_index, self.selected_point_index = points[0]
+            self.dragging = self.resizing = True
+            self.start_point = pos
+            self.update()
+            return True
+        lines = self.hit_index.lines_near(pos.x(), pos.y())
+        if lines:
+            self.selected_line_index = lines[0]
             self.dragging = True
             self.resizing = False
             self.start_point = pos
@@ -483,11 +309,10 @@ class DrawingArea(QWidget):
         return False
 
     def handle_right_click(self, pos):
-        for i, (line, _) in enumerate(self.lines):
-            if self.is_point_near_line(pos, line):
-                self.selected_line_index = i
-                self.show_rotation_dialog()
-                return
+        lines = self.hit_index.lines_near(pos.x(), pos.y())
+        if lines:
+            self.selected_line_index = lines[0]
+            self.show_rotation_dialog()
 
     def mouseMoveEvent(self, event):
         pos = event.position().toPoint()
@@ -509,12 +334,6 @@ class DrawingArea(QWidget):
             self.selected_line_index = self.selected_point_index = None
         self.setCursor(Qt.CursorShape.ArrowCursor)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        self.draw_background(painter)
-        self.draw_lines(painter)
-
     def draw_background(self, painter):
         painter.fillRect(self.rect(), Qt.GlobalColor.white)
 
@@ -567,21 +386,25 @@ class DrawingArea(QWidget):
     def delete_last_line(self):
         if self.lines:
             self.lines.pop()
+            self.count_edit()
+            self.update_case_status()
             self.update()
 
     def add_new_line(self):
-        if len(self.lines) < 3:
-            start_x, start_y, length = 100, 100 + len(self.lines) * 50, 200
+        if len(self.lines) < MAX_LINES:
+            row, column = len(self.lines) % LINES_PER_COLUMN, len(self.lines) // LINES_PER_COLUMN
+            start_x, start_y, length = 100 + column * 250, 100 + row * 50, 200
             self.lines.append(
                 (
                     [QPoint(start_x, start_y), QPoint(start_x + length, start_y)],
                     Qt.GlobalColor.blue,
                 )
             )
+            self.count_edit()
             self.update()
         else:
             QMessageBox.information(
-                self, "Límite alcanzado", "Solo se permiten tres líneas en el dibujo."
+                self, "Límite alcanzado", f"Solo se permiten {MAX_LINES} líneas en el dibujo."
             )
         self.update_equations()
 
@@ -591,41 +414,24 @@ class DrawingArea(QWidget):
             "Para interactuar con el área de dibujo:"
             "- Puedes mover las líneas desde los puntos rojos."
             "- Usa el botón derecho para rotar líneas."
-            "- Se permiten hasta 3 líneas simultáneamente."
+            f"- Se permiten hasta {MAX_LINES} líneas simultáneamente."
             "- Usa los botones para agregar o borrar líneas."
         )
         QMessageBox.information(self, "Instrucciones", instructions)
 
-    def is_point_near_point(self, p1, p2, margin=8):
-        return (p1 - p2).manhattanLength() <= margin
-
-    def is_point_near_line(self, point, line, margin=5):
-        p1, p2 = line
-        line_length = sqrt((p2.x() - p1.x()) ** 2 + (p2.y() - p1.y()) ** 2)
-        if line_length == 0:  # Evita dividir por cero si la línea es un punto
-            return False
-        distance = (
-            abs(
-                (p2.y() - p1.y()) * point.x()
-                - (p2.x() - p1.x()) * point.y()
-                + p2.x() * p1.y()
-                - p2.y() * p1.x()
-            )
-            / line_length
-        )
-        return distance <= margin
-
     def move_line(self, index, delta):
         line, color = self.lines[index]
         self.lines[index] = ([point + delta for point in line], color)
-        self.update_equations()
+        self.line_changed(index)
+        self.update_equations(sync_case=False)
 
 
     def resize_line(self, index, point_index, new_pos):
         line, color = self.lines[index]
         line[point_index] = new_pos  # Actualiza la posición del extremo seleccionado
         self.lines[index] = (line, color)
-        self.update_equations()
+        self.line_changed(index)
+        self.update_equations(sync_case=False)
 
 
     def save_all_cases(self):
@@ -746,24 +552,6 @@ class DrawingArea(QWidget):
 
 
 
-    def set_current_configuration(self, config_number):
-        self.current_configuration = config_number
-        self.lines = self.load_lines_from_file(config_number)  # Carga las líneas desde el archivo
-
-        if not self.lines:  # Si no hay líneas, genera tres por defecto
-            self.generate_parallel_lines()
-
-        # Limpia los puntos aleatorios para la configuración actual
-        self.random_points.clear()
-
-        # Genera puntos aleatorios para las líneas cargadas
-        for i, (line, _) in enumerate(self.lines):
-            self.get_random_points_on_line(line, i)
-
-        self.configurations[config_number] = self.lines
-        self.update()
-
-
     def load_lines_from_file(self):
         if not self.data_name:
             return {}
@@ -795,8 +583,10 @@ class DrawingArea(QWidget):
             config_number, []
         )  # Carga las líneas del caso actual
         if not self.lines:  # Si no hay líneas, genera tres por defecto
+            self.generated_cases.add(config_number)
             self.generate_parallel_lines()
         self.configurations[config_number] = self.lines
+        self.update_case_status()
         self.update()
 
     def show_rotation_dialog(self):
@@ -826,7 +616,8 @@ class DrawingArea(QWidget):
             self.rotate_point(line[1], center, angle),
         ]
         self.lines[index] = (new_line, color)
-        self.update_equations()
+        self.line_changed(index)
+        self.update_equations(sync_case=False)
 
 
     def rotate_point(self, point, center, angle):
@@ -856,11 +647,15 @@ class DrawingArea(QWidget):
 
 
     def paintEvent(self, event):
+        start = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         self.draw_background(painter)
         self.draw_lines(painter)
         self.draw_instruction_box(painter)
+        painter.end()
+        if self.ui_probe is not None:
+            self.ui_probe.record_paint((time.perf_counter() - start) * 1000)
 
     def draw_instruction_box(self, painter):
         rect_x, rect_y, rect_width, rect_height = (
@@ -884,10 +679,13 @@ class DrawingArea(QWidget):
             text,
         )
 
-    def update_equations(self):
-        """Actualiza el QLabel con las ecuaciones de las líneas."""
+    def update_equations(self, sync_case=True):
+        """Actualiza el QLabel con las ecuaciones de las líneas.
+
+        sync_case=False cuando quien llama ya avisó de la recta que cambió con line_changed().
+        """
         equations = []
-        for i, (line, _) in enumerate(self.lines):
+        for i, (line, _) in enumerate(self.lines[:MAX_EQUATIONS_SHOWN]):
             p1, p2 = line
             if p2.x() - p1.x() == 0:
                 # Línea vertical
@@ -898,8 +696,49 @@ class DrawingArea(QWidget):
                 equation = f"Recta {i + 1}: y = {slope:.2f}x + {intercept:.2f}"
             equations.append(equation)
 
-        # Depuración
-        print("Ecuaciones actualizadas:", equations)
-
+        if len(self.lines) > MAX_EQUATIONS_SHOWN:
+            equations.append(f"... y {len(self.lines) - MAX_EQUATIONS_SHOWN} más")
         self.equations_label.setText("Ecuaciones de las líneas:\n" + "\n".join(equations))
+        self.update_case_status(sync_case)
+
+    def sync_line_caches(self):
+        """Pone al día la caché de relaciones y el índice de clics con las líneas actuales; solo recalcula las que cambiaron."""
+        lines = self.line_array()
+        self.live_case.sync(lines)
+        self.hit_index.sync(lines)
+
+    def line_changed(self, index):
+        """Avisa a las cachés que cambió una sola línea, sin recorrer las demás."""
+        line = segment(self.lines[index][0])
+        self.live_case.update_line(index, line)
+        self.hit_index.update_line(index, line)
+        self.count_edit()
+
+    def count_edit(self):
+        """Registra que el estudiante movió, giró, agregó o borró una recta del caso actual."""
+        self.line_edits[self.current_configuration] = self.line_edits.get(self.current_configuration, 0) + 1
+
+    def waiting_first_edit(self):
+        """Las rectas son las que generó el tutor y el estudiante todavía no las tocó.
+
+        Las rectas por defecto ya forman un caso (tres paralelas son el Caso 1);
+        las que se cargaron del archivo las dibujó el estudiante en otra sesión.
+        """
+        return self.current_configuration in self.generated_cases and not self.line_edits.get(self.current_configuration)
+
+    def update_case_status(self, sync_case=True):
+        """Muestra el vector del caso que forman las líneas y si corresponde al caso seleccionado."""
+        if sync_case:
+            self.sync_line_caches()
+        case = self.live_case.case()
+        if case is None:
+            text = "Las rectas no forman ningún caso."
+        elif case == self.current_configuration and self.waiting_first_edit():
+            text = f"Mueve las rectas para formar el Caso {case}."
+        elif case == self.current_configuration:
+            text = f"<span style='color: green;'>Vector actual: {self.live_case.vector()} ¡Formaste el Caso {case}!</span>"
+        else:
+            text = f"Vector actual: {self.live_case.vector()} (corresponde al Caso {case})"
+        # Solo texto: cambiar la hoja de estilos en cada movimiento del mouse fuerza a Qt a recalcular el estilo
+        self.case_label.setText(text)
 
@@ -0,0 +1,164 @@
+import os
+import cv2
+import numpy as np
+from rolling_stress import EMOTION_LABELS, probability_vector
+from face_tracking import HaarFaceDetector, detect_largest_face
+from model_cache import cached_model_path, find_cached_model
+
+# Backend de inferencia cuando no hay un modelo válido en la caché local: "deepface" u "onnx"
+EMOTION_BACKEND = "deepface"
+# Modelo de emociones exportado (ver compare_backends.py export); se usa si no hay uno en la caché
+# local (ver model_cache.py build)
+ONNX_MODEL_PATH = os.path.join("modelos", "emotion.onnx")
+# Motor para el modelo exportado: "onnxruntime" u "opencv" (cv2.dnn)
+ONNX_RUNTIME = "onnxruntime"
+# Clases que produce el modelo de emociones, en el orden de sus salidas
+MODEL_LABELS = EMOTION_LABELS[:7]
+# Lado de la imagen en grises que recibe el modelo de emociones
+MODEL_INPUT_SIZE = 48
+# Ancho de trabajo del detector Haar que usa el backend ONNX
+HAAR_DETECTION_WIDTH = 320
+
+
+class EmotionBackend:
+    """Interfaz de un backend de emociones.
+
+    classify() recibe el recorte BGR de un rostro y devuelve un vector float32 de
+    probabilidades en el orden de EMOTION_LABELS; detect_face() devuelve la caja
+    (x, y, w, h) del rostro más grande del frame, o None.
+    """
+
+    name = None
+
+    def detect_face(self, frame):
+        raise NotImplementedError
+
+    def classify(self, face):
+        raise NotImplementedError
+
+    def classify_frame(self, frame):
+        """Detecta el rostro en el frame completo y clasifica su recorte."""
+        box = self.detect_face(frame)
+        if box is None:
+            raise ValueError("No se detectó ningún rostro en el frame")
+        x, y, w, h = box
+        return self.classify(frame[y:y + h, x:x + w])
+
+    def warm_up(self):
+        """Clasifica una imagen vacía para que el modelo quede construido antes del primer frame."""
+        blank = np.zeros((MODEL_INPUT_SIZE * 2, MODEL_INPUT_SIZE * 2, 3), dtype=np.uint8)
+        self.detect_face(blank)
+        self.classify(blank)
+
+
+def dominant_emotion(probabilities):
+    return EMOTION_LABELS[int(np.argmax(probabilities))]
+
+
+class DeepFaceBackend(EmotionBackend):
+    """Backend original: DeepFace con TensorFlow/Keras."""
+
+    name = "deepface"
+
+    def __init__(self, detector_backend=None, threads=None):
+        from deepface import DeepFace
+
+        if threads:
+            import tensorflow as tf
+
+            try:
+                tf.config.threading.set_intra_op_parallelism_threads(threads)
+                tf.config.threading.set_inter_op_parallelism_threads(1)
+            except RuntimeError:
+                pass  # TensorFlow ya estaba inicializado; rigen las variables de entorno
+        self.deepface = DeepFace
+        self.detector_backend = detector_backend
+
+    def detect_face(self, frame):
+        if self.detector_backend is None:
+            return detect_largest_face(frame)
+        return detect_largest_face(frame, self.detector_backend)
+
+    def classify(self, face):
+        result = self.deepface.analyze(face, actions=['emotion'], detector_backend='skip', enforce_detection=False)
+        if isinstance(result, list):
+            result = result[0]
+        return probability_vector(result['emotion'])
+
+
+class OnnxEmotionBackend(EmotionBackend):
+    """Modelo de emociones exportado (opcionalmente cuantizado a int8) corriendo en CPU.
+
+    Usa ONNX Runtime o cv2.dnn y un detector Haar, así que no carga TensorFlow.
+    Sin model_path se carga el modelo verificado de la caché local en el formato
+    cache_format ("onnx" u "onnx-int8"); sin formato se prefiere el cuantizado.
+    Si la caché está vacía se usa ONNX_MODEL_PATH.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_path=None, runtime=ONNX_RUNTIME, threads=None, cache_format=None):
+        if model_path is None:
+            cached = cached_model_path(backend=cache_format) if cache_format else find_cached_model()
+            model_path = cached or ONNX_MODEL_PATH
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No existe el modelo de emociones '{model_path}'")
+        self.model_path = model_path
+        self.runtime = runtime
+        self.detector = HaarFaceDetector(HAAR_DETECTION_WIDTH)
+        if runtime == "onnxruntime":
+            import onnxruntime
+
+            options = onnxruntime.SessionOptions()
+            if threads:
+                options.intra_op_num_threads = threads
+                options.inter_op_num_threads = 1
+            self.session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+            self.input_name = self.session.get_inputs()[0].name
+        elif runtime == "opencv":
+            self.net = cv2.dnn.readNetFromONNX(model_path)
+            if threads:
+                cv2.setNumThreads(threads)
+        else:
+            raise ValueError(f"Motor ONNX desconocido: {runtime}")
+
+    def detect_face(self, frame):
+        return self.detector(frame)
+
+    def preprocess(self, face):
+        """Replica la entrada del modelo de DeepFace: grises, 48x48, valores entre 0 y 1, forma NHWC."""
+        gray = face if face.ndim == 2 else cv2.cvtColor(face, cv2.COLOR_BGR2GRAY)
+        gray = cv2.resize(gray, (MODEL_INPUT_SIZE, MODEL_INPUT_SIZE), interpolation=cv2.INTER_AREA)
+        return (gray.astype(np.float32) / 255).reshape(1, MODEL_INPUT_SIZE, MODEL_INPUT_SIZE, 1)
+
+    def classify(self, face):
+        blob = self.preprocess(face)
+        if self.runtime == "onnxruntime":
+            output = self.session.run(None, {self.input_name: blob})[0][0]
+        else:
+            self.net.setInput(blob)
+            output = self.net.forward()[0]
+        output = np.asarray(output, dtype=np.float32)
+        total = output.sum()
+        if total > 0:
+            output = output / total
+        return probability_vector({label: float(p) * 100 for label, p in zip(MODEL_LABELS, output)})
+
+
+def preferred_backend():
+    """Backend que usa el tutor: el modelo de la caché local si hay uno válido, si no EMOTION_BACKEND.
+
+    Cargar el modelo exportado tarda milisegundos; DeepFace lo construye en cada arranque.
+    """
+    if find_cached_model() is not None:
+        return OnnxEmotionBackend.name
+    return EMOTION_BACKEND
+
+
+def create_backend(name=EMOTION_BACKEND, **options):
+    """Crea el backend de emociones indicado por nombre."""
+    if name == DeepFaceBackend.name:
+        return DeepFaceBackend(**options)
+    if name == OnnxEmotionBackend.name:
+        return OnnxEmotionBackend(**options)
+    raise ValueError(f"Backend de emociones desconocido: {name}")
@@ -1,10 +1,17 @@
-from PyQt6.QtCore import QTimer
+from PyQt6.QtCore import QTimer, QObject, QThread, QMetaObject, Qt, pyqtSignal, pyqtSlot
 from PyQt6.QtWidgets import QMessageBox
-from deepface import DeepFace
-import cv2
+from camera_capture import CameraCapture
+from inference_process import InferenceProcess, EmotionRecord
+from rolling_stress import RollingStressWindow, STRESS_WEIGHTS, ABSENT_PROBABILITIES
+from adaptive_sampling import AdaptiveSampler, system_cpu_percent
+from motion_gate import MotionGate
+from presence_gate import PresenceGate
+from detector_tuning import load_tuned_detector, run_tuning, tuning_needed
+from activity_monitor import ActiveClock
+from pipeline_metrics import PipelineMetrics
+from preprocessing import PREPROCESS_CONFIG, capture_properties, crop_frame
+import multiprocessing
 import time
-from collections import deque
-import numpy as np
 
 # Definimos la longitud del intervalo en segundos para calcular el promedio de emociones
 INTERVAL_LENGTH = 30  # 30 segundos
@@ -14,93 +21,399 @@ DISTRACTION_THRESHOLD = 0.4  # Umbral de distracción
 # Definimos el tiempo mínimo entre mensajes de felicitaciones y de distracción
 CONGRATULATION_INTERVAL = 600  # 10 minutos
 DISTRACTION_INTERVAL = 300  # 5 minutos
+# Máximo de detecciones en curso; los ticks que llegan mientras tanto se descartan
+MAX_IN_FLIGHT = 1
+# Muestras de la ventana por cantidad y periodo del temporizador (los valores originales del tutor)
+EMOTION_WINDOW_SIZE = 20
+DETECTION_INTERVAL_MS = 2000
+# Ajusta el periodo según la estabilidad del estrés y la carga; con False se usa DETECTION_INTERVAL_MS fijo
+ADAPTIVE_SAMPLING = True
+# Mide los detectores de rostros en segundo plano la primera vez que el tutor corre en un equipo.
+# Desactivado: el repositorio no trae imágenes de rostros (ver detector_tuning.py para medir a mano)
+AUTO_TUNE_DETECTOR = False
+# Tiempo sin detección tras el cual se libera la cámara; volver a un caso antes la reutiliza abierta
+CAMERA_IDLE_RELEASE_MS = 30000
+# Guarda las métricas del pipeline (ver pipeline_metrics.py) al cerrar el tutor
+DUMP_METRICS_AT_EXIT = True
+# Espera máxima por el primer frame tras abrir la cámara, y cada cuánto se revisa
+FIRST_FRAME_TIMEOUT = 2.0  # segundos
+FIRST_FRAME_POLL = 0.02
+# Cada cuánto se revisa si el modelo terminó de cargarse en segundo plano
+WARMUP_POLL_MS = 250
+class EmotionWorker(QObject):
+    """Toma el frame más reciente y espera su resultado del proceso de inferencia, fuera del hilo de la interfaz."""
+
+    result_ready = pyqtSignal(object)
+    detection_failed = pyqtSignal(str)
+
+    def __init__(self, camera, inference, metrics):
+        super().__init__()
+        self.camera = camera
+        self.inference = inference
+        self.metrics = metrics
+        self.motion_gate = MotionGate()
+        self.presence_gate = PresenceGate()
+        self.last_record = None
+
+    @pyqtSlot()
+    def process(self):
+        try:
+            self.detect()
+        except Exception as e:
+            # En PyQt6 una excepción que sale de un slot termina el proceso: se informa como error de detección,
+            # y handle_detection_error libera la detección en curso
+            self.metrics.increment("inference_errors")
+            self.motion_gate.reset()
+            self.last_record = None
+            self.detection_failed.emit(f"Error al detectar emoción: {e}")
+
+    def detect(self):
+        with self.metrics.stage("frame_read"):
+            handle = self.camera.acquire_latest()
+            deadline = time.monotonic() + FIRST_FRAME_TIMEOUT
+            while handle is None and self.camera.isOpened() and time.monotonic() < deadline:
+                # La cámara se acaba de (re)abrir y aún no entrega el primer frame
+                time.sleep(FIRST_FRAME_POLL)
+                handle = self.camera.acquire_latest()
+        if handle is None:
+            self.metrics.increment("frame_errors")
+            self.detection_failed.emit("Error al leer el frame de la cámara.")
+            return
+        try:
+            # Si la imagen casi no cambió desde la última inferencia, reutilizamos su resultado
+            face_box = self.last_record.face_box if self.last_record is not None else None
+            with self.metrics.stage("preprocess"):
+                frame = crop_frame(handle.frame, PREPROCESS_CONFIG)
+            if self.last_record is not None and self.motion_gate.should_skip(frame, face_box, handle.timestamp):
+                self.metrics.increment("motion_reused")
+                self.result_ready.emit(self.last_record._replace(timestamp=handle.timestamp))
+                return
+            with self.metrics.stage("face_detection"):
+                present = self.presence_gate.face_present(frame)
+            if not present:
+                # Nadie frente a la cámara: registramos la ausencia sin pagar la clasificación
+                self.metrics.increment("absent")
+                record = EmotionRecord(0, handle.timestamp, ABSENT_PROBABILITIES, 'absent', None)
+                self.motion_gate.accept(handle.timestamp)
+                self.last_record = record
+                self.result_ready.emit(record)
+                return
+            frame = None
+            # El frame no se copia: el proceso de inferencia lo lee del anillo compartido
+            with self.metrics.stage("inference"):
+                record = self.inference.analyze(handle)
+            self.metrics.record_child_timings(record.timings)
+        finally:
+            self.camera.release_slot(handle.slot)
+        if record.error is not None:
+            self.metrics.increment("inference_errors")
+            self.motion_gate.reset()
+            self.last_record = None
+            self.detection_failed.emit(f"Error al detectar emoción: {record.error}")
+        else:
+            self.motion_gate.accept(handle.timestamp)
+            self.last_record = record
+            self.result_ready.emit(record)
+
 
 def init_emotion_detection(widget):
     widget.timer = QTimer()
+    # Temporizador de un disparo: cada resultado programa la siguiente detección
+    widget.timer.setSingleShot(True)
     widget.timer.timeout.connect(lambda: detect_emotion(widget))
-    widget.cap = cv2.VideoCapture(0)
-    if not widget.cap.isOpened():
-        QMessageBox.critical(widget, "Error de Cámara", "No se puede abrir la cámara.")
-        return
+    widget.detection_active = False
+    widget.detection_paused = False  # Suspendida por inactividad o ventana oculta, sin salir del caso
+    widget.active_clock = ActiveClock()
+    widget.paused_since = None
+    widget.detection_gaps = []  # Pausas (inicio, fin, motivo) en la línea de tiempo de emociones
+    widget.sampler = AdaptiveSampler((DISTRACTION_THRESHOLD, STRESS_THRESHOLD))
+    widget.request_started = None
+    widget.inference_latency = None
+    widget.detector_tuner = None
+    widget.tuning_checked = False  # La revisión del benchmark espera a que la ventana esté visible
+    widget.emotion_thread = None
+    widget.emotion_worker = None
+    widget.emotion_in_flight = 0
+    widget.skipped_ticks = 0
+    widget.metrics = PipelineMetrics()  # Histogramas por etapa y contadores, ver pipeline_metrics()
+    widget.warmup_timer = QTimer()
+    widget.warmup_timer.timeout.connect(lambda: check_model_warmup(widget))
+    widget.camera_idle_timer = QTimer()
+    widget.camera_idle_timer.setSingleShot(True)
+    widget.camera_idle_timer.timeout.connect(lambda: release_idle_camera(widget))
+    # La cámara se lee continuamente en su propio hilo; la detección toma siempre el frame más reciente.
+    # Se abre al empezar un caso, no al construir la ventana
+    widget.camera = CameraCapture(0, shared=True, properties=capture_properties(PREPROCESS_CONFIG))
+    widget.inference = InferenceProcess(preprocess_config=PREPROCESS_CONFIG)
     widget.last_emotion_time = time.time()
     widget.last_congratulation_time = time.time() - CONGRATULATION_INTERVAL  # Para permitir un mensaje inicial si es necesario
     widget.last_distraction_time = time.time() - DISTRACTION_INTERVAL  # Para permitir un mensaje inicial si es necesario
-    widget.emotion_queue = deque(maxlen=20)  # Almacenamos más emociones para análisis temporal
-    widget.emotion_interval_queue = deque()  # Almacenamos emociones para promedios por intervalos
+    widget.stress_weights = STRESS_WEIGHTS  # Pesos configurables de cada emoción en el nivel de estrés
+    widget.emotion_window = RollingStressWindow(maxlen=EMOTION_WINDOW_SIZE, weights=widget.stress_weights)
+    widget.interval_window = RollingStressWindow(max_age=INTERVAL_LENGTH, weights=widget.stress_weights)
+
+    # La captura y la inferencia corren en su propio hilo; los resultados vuelven
+    # al hilo de la interfaz mediante señales encoladas
+    widget.emotion_thread = QThread()
+    widget.emotion_worker = EmotionWorker(widget.camera, widget.inference, widget.metrics)
+    widget.emotion_worker.moveToThread(widget.emotion_thread)
+    widget.emotion_worker.result_ready.connect(
+        lambda record: handle_emotion_result(widget, record), Qt.ConnectionType.QueuedConnection
+    )
+    widget.emotion_worker.detection_failed.connect(
+        lambda error: handle_detection_error(widget, error), Qt.ConnectionType.QueuedConnection
+    )
+    widget.emotion_thread.finished.connect(widget.emotion_worker.deleteLater)
+    widget.emotion_thread.start()
+
+def start_detector_tuning(widget):
+    """Lanza el benchmark de detectores en un proceso aparte, sin bloquear la interfaz ni la detección."""
+    context = multiprocessing.get_context("spawn")
+    widget.detector_tuner = context.Process(target=run_tuning, name="detector-tuning", daemon=True)
+    widget.detector_tuner.start()
+
+def check_detector_tuning(widget):
+    """Cuando termina el benchmark, reinicia el proceso de inferencia para que use el detector elegido."""
+    if widget.detector_tuner is None or widget.detector_tuner.is_alive():
+        return
+    widget.detector_tuner.join()
+    if widget.detector_tuner.exitcode == 0 and load_tuned_detector() is not None:
+        widget.inference.request_restart()
+    widget.detector_tuner = None
+
+def start_model_warmup(widget):
+    """Arranca el proceso de inferencia para que importe y construya el modelo sin bloquear la interfaz.
+
+    Se llama cuando la primera ventana ya está visible; la detección espera a que el modelo esté listo.
+    """
+    if widget.emotion_worker is None or widget.warmup_timer.isActive():
+        return
+    if widget.inference.gave_up:
+        show_inference_stopped(widget)
+        return
+    widget.inference.ensure_started()  # Durante la espera tras una caída lo arranca check_model_warmup()
+    widget.show_detection_status("Cargando el modelo de emociones…")
+    widget.warmup_timer.start(WARMUP_POLL_MS)
+    if AUTO_TUNE_DETECTOR and not widget.tuning_checked:
+        # tuning_needed() lee el disco; se revisa después del primer dibujo, no al construir la ventana
+        widget.tuning_checked = True
+        if tuning_needed():
+            start_detector_tuning(widget)
+
+def show_inference_stopped(widget):
+    widget.show_detection_status(
+        f"Detección de emociones detenida: el proceso falló {widget.inference.failures} veces seguidas."
+    )
+
+def check_model_warmup(widget):
+    inference = widget.inference
+    if not inference.poll_ready():
+        if inference.health()["alive"]:
+            return
+        if inference.ensure_started():
+            widget.show_detection_status("Reiniciando el proceso de detección de emociones…")
+        elif inference.gave_up:
+            widget.warmup_timer.stop()
+            show_inference_stopped(widget)
+        else:
+            widget.show_detection_status(
+                f"El proceso de detección de emociones terminó inesperadamente; se reintenta en {inference.retry_delay():.0f} s."
+            )
+        return
+    widget.warmup_timer.stop()
+    if widget.inference.warmup_error is not None:
+        print(f"Error al cargar el modelo de emociones: {widget.inference.warmup_error}")
+        widget.show_detection_status("Detección de emociones no disponible.")
+    else:
+        widget.show_detection_status("Detección de emociones lista.")
+    widget.on_model_ready(widget.inference.warmup_timings)
 
 def start_emotion_detection(widget):
-    widget.timer.start(2000)
+    widget.camera_idle_timer.stop()
+    if not widget.camera.open():
+        QMessageBox.critical(widget, "Error de Cámara", "No se puede abrir la cámara.")
+        return
+    widget.detection_active = True
+    widget.timer.start(DETECTION_INTERVAL_MS)
 
 def stop_emotion_detection(widget):
+    resume_emotion_detection(widget, restart=False)
+    widget.detection_active = False
     widget.timer.stop()
+    # La cámara queda abierta un rato por si el estudiante vuelve enseguida a otro caso
+    widget.camera_idle_timer.start(CAMERA_IDLE_RELEASE_MS)
 
-def detect_emotion(widget):
-    ret, frame = widget.cap.read()
-    if ret:
-        try:
-            result = DeepFace.analyze(frame, actions=['emotion'])
-            if isinstance(result, list):
-                result = result[0]
-            emotion = result.get('dominant_emotion', None)
-            print(f"Emoción detectada: {emotion}")
-
-            widget.emotion_queue.append(emotion)
-            widget.emotion_interval_queue.append((time.time(), emotion))
-            clean_old_emotions(widget.emotion_interval_queue)
-
-            if len(widget.emotion_queue) == widget.emotion_queue.maxlen:
-                stress_level = calculate_stress_level(widget.emotion_queue)
-                print(f"Nivel de estrés calculado: {stress_level}")
-
-                current_time = time.time()
-                interval_stress_level = calculate_interval_stress_level(widget.emotion_interval_queue)
-                
-                # Notificación de estrés alto
-                if interval_stress_level > STRESS_THRESHOLD and current_time - widget.last_emotion_time > INTERVAL_LENGTH:
-                    widget.show_popup("Alto Estrés", True)
-                    widget.last_emotion_time = current_time
-                
-                # Notificación de distracción o estrés moderado
-                elif interval_stress_level > DISTRACTION_THRESHOLD and current_time - widget.last_distraction_time > DISTRACTION_INTERVAL:
-                    widget.show_popup("Distracción o Estrés Moderado", False)
-                    widget.last_distraction_time = current_time
-                
-                # Notificación de bajo estrés
-                elif interval_stress_level <= DISTRACTION_THRESHOLD and current_time - widget.last_congratulation_time > CONGRATULATION_INTERVAL:
-                    widget.show_popup("Bajo Estrés", False, congratulation=True)
-                    widget.last_congratulation_time = current_time
-        except Exception as e:
-            print(f"Error al detectar emoción: {e}")
+def pause_emotion_detection(widget, reason):
+    """Suspende captura e inferencia sin salir del caso; el reloj activo deja de avanzar."""
+    if not widget.detection_active or widget.detection_paused:
+        return
+    widget.detection_paused = True
+    widget.paused_since = (time.time(), reason)
+    widget.active_clock.pause()
+    widget.timer.stop()
+    widget.camera_idle_timer.start(CAMERA_IDLE_RELEASE_MS)
+
+def resume_emotion_detection(widget, restart=True):
+    """Reanuda tras una pausa y registra el hueco en la línea de tiempo."""
+    if not widget.detection_paused:
+        return
+    widget.detection_paused = False
+    started, reason = widget.paused_since
+    widget.detection_gaps.append((started, time.time(), reason))
+    widget.paused_since = None
+    widget.active_clock.resume()
+    widget.camera_idle_timer.stop()
+    if restart:
+        if not widget.camera.open():
+            # Queda detenida como al salir del caso; el próximo caso vuelve a intentar abrir la cámara
+            widget.detection_active = False
+            widget.timer.stop()
+            widget.show_detection_status("No se pudo reabrir la cámara: la detección de emociones quedó detenida.")
+            return
+        # Medimos de inmediato: la ventana de estrés conserva las muestras previas a la pausa
+        widget.timer.start(0)
+
+def release_idle_camera(widget):
+    """Libera el dispositivo si la detección sigue detenida; conserva el anillo y el modo negociado."""
+    if widget.detection_active and not widget.detection_paused:
+        return
+    if widget.emotion_in_flight:
+        # El hilo de trabajo aún usa un frame: lo intentamos de nuevo al terminar
+        widget.camera_idle_timer.start(WARMUP_POLL_MS)
+        return
+    widget.camera.release(keep_ring=True)
+
+def schedule_next_detection(widget, stress_level=None):
+    """Programa la siguiente detección con el periodo que decide el muestreo adaptativo."""
+    if not widget.detection_active or widget.detection_paused:
+        return
+    if ADAPTIVE_SAMPLING:
+        interval = widget.sampler.next_interval(stress_level, widget.inference_latency, system_cpu_percent())
     else:
-        print("Error al leer el frame de la cámara.")
+        interval = DETECTION_INTERVAL_MS
+    widget.timer.start(interval)
+
+def shutdown_emotion_detection(widget):
+    """Detiene el temporizador, espera al hilo de detección y libera la cámara."""
+    widget.timer.stop()
+    widget.warmup_timer.stop()
+    widget.camera_idle_timer.stop()
+    if widget.emotion_thread is not None:
+        widget.emotion_thread.quit()
+        widget.emotion_thread.wait()
+        widget.emotion_thread = None
+        widget.inference.shutdown()
+    if widget.detector_tuner is not None:
+        widget.detector_tuner.terminate()
+        widget.detector_tuner = None
+    widget.camera.release()
+    if DUMP_METRICS_AT_EXIT and widget.metrics.counters:
+        extra = {"camera": camera_stats(widget), "inference": inference_health(widget), "detection_gaps": detection_gaps(widget)}
+        path = widget.metrics.dump(extra=extra)
+        if path is not None:
+            print(f"Métricas del pipeline guardadas en '{path}'.")
 
-def calculate_stress_level(emotion_queue):
-    emotion_scores = {'happy': -1, 'sad': 1, 'fear': 1, 'angry': 1, 'neutral': 0, 'surprise': 0.5, 'disgust': 0.5}
-    scores = [emotion_scores.get(emotion, 0) for emotion in emotion_queue]
-    stress_level = np.mean(scores)
-    return (stress_level + 1) / 2  # Normalizamos a un rango de 0 a 1
+def detect_emotion(widget):
+    """Solicita una detección al hilo de trabajo sin bloquear la interfaz."""
+    if widget.emotion_worker is None:
+        return
+    check_detector_tuning(widget)
+    if widget.emotion_in_flight >= MAX_IN_FLIGHT:
+        # La inferencia anterior sigue en curso: no acumulamos ticks
+        widget.skipped_ticks += 1
+        widget.metrics.increment("skipped_ticks")
+        return
+    if not widget.inference.ready:
+        # El modelo aún se está cargando (o el proceso se recicló): esperamos sin enviar frames
+        start_model_warmup(widget)
+        if widget.inference.gave_up:
+            widget.timer.stop()  # Sin más reintentos: el mensaje de estado queda a la vista
+            return
+        widget.timer.start(WARMUP_POLL_MS)
+        return
+    widget.emotion_in_flight += 1
+    widget.metrics.set_gauge("queue_depth", widget.emotion_in_flight)
+    widget.request_started = time.monotonic()
+    QMetaObject.invokeMethod(widget.emotion_worker, "process", Qt.ConnectionType.QueuedConnection)
 
-def calculate_interval_stress_level(emotion_interval_queue):
-    emotion_scores = {'happy': -1, 'sad': 1, 'fear': 1, 'angry': 1, 'neutral': 0, 'surprise': 0.5, 'disgust': 0.5}
-    scores = [emotion_scores.get(emotion, 0) for _, emotion in emotion_interval_queue]
-    stress_level = np.mean(scores)
-    return (stress_level + 1) / 2  # Normalizamos a un rango de 0 a 1
+def handle_emotion_result(widget, record):
+    """Procesa en el hilo de la interfaz el EmotionRecord entregado por el hilo de trabajo."""
+    widget.emotion_in_flight = max(0, widget.emotion_in_flight - 1)
+    widget.metrics.set_gauge("queue_depth", widget.emotion_in_flight)
+    widget.inference_latency = time.monotonic() - widget.request_started
+    widget.metrics.record("end_to_end", widget.inference_latency * 1000)
+    widget.metrics.increment("detections")
+    print(f"Emoción detectada: {record.dominant_emotion}")
 
-def clean_old_emotions(emotion_interval_queue):
     current_time = time.time()
-    while emotion_interval_queue and current_time - emotion_interval_queue[0][0] > INTERVAL_LENGTH:
-        emotion_interval_queue.popleft()
-
-def show_popup(widget, emotion, stress=False, congratulation=False):
-    msg = QMessageBox()
-    msg.setIcon(QMessageBox.Icon.Warning if stress else QMessageBox.Icon.Information)
-    if congratulation:
-        msg.setText("¡Felicitaciones!")
-        msg.setInformativeText("¡Sigue con el buen trabajo!")
-        msg.setWindowTitle("Nivel de Estrés Bajo Detectado")
-    else:
-        msg.setText(f"Emoción detectada: {emotion}")
-        msg.setInformativeText("Parece que estás estresado o distraído. ¿Te gustaría recibir ayuda?" if stress else "¡Sigue con el buen trabajo!")
-        msg.setWindowTitle("Emoción Detectada")
-    msg.setStandardButtons(QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel)
-    msg.exec()
+    with widget.metrics.stage("aggregation"):
+        widget.emotion_window.append(record.probabilities)
+        # El intervalo se mide en tiempo activo: las pausas no cuentan como parte de los INTERVAL_LENGTH segundos
+        widget.interval_window.append(record.probabilities, widget.active_clock.now())
+        window_full = widget.emotion_window.is_full()
+        if window_full:
+            stress_level = widget.emotion_window.stress_level()
+            interval_stress_level = widget.interval_window.stress_level()
+
+    if window_full:
+        print(f"Nivel de estrés calculado: {stress_level}")
+        notify(widget, interval_stress_level, current_time)
+
+    schedule_next_detection(widget, widget.interval_window.stress_level())
+
+def notify(widget, interval_stress_level, current_time):
+    """Decide si corresponde un aviso según el estrés del intervalo y el tiempo desde el último de cada tipo."""
+    with widget.metrics.stage("notification"):
+        # Notificación de estrés alto
+        if interval_stress_level > STRESS_THRESHOLD and current_time - widget.last_emotion_time > INTERVAL_LENGTH:
+            widget.show_popup("Alto Estrés", True)
+            widget.last_emotion_time = current_time
+
+        # Notificación de distracción o estrés moderado
+        elif interval_stress_level > DISTRACTION_THRESHOLD and current_time - widget.last_distraction_time > DISTRACTION_INTERVAL:
+            widget.show_popup("Distracción o Estrés Moderado", False)
+            widget.last_distraction_time = current_time
+
+        # Notificación de bajo estrés
+        elif interval_stress_level <= DISTRACTION_THRESHOLD and current_time - widget.last_congratulation_time > CONGRATULATION_INTERVAL:
+            widget.show_popup("Bajo Estrés", False, congratulation=True)
+            widget.last_congratulation_time = current_time
+
+def pipeline_metrics(widget):
+    """Devuelve p50/p95/p99 por etapa, contadores de errores y frames omitidos, y la profundidad de la cola."""
+    return widget.metrics.snapshot()
+
+def detection_gaps(widget):
+    """Devuelve las pausas de la detección como (inicio, fin, motivo), con tiempos de time.time()."""
+    gaps = list(widget.detection_gaps)
+    if widget.paused_since is not None:
+        gaps.append((widget.paused_since[0], None, widget.paused_since[1]))
+    return gaps
+
+def camera_stats(widget):
+    """Devuelve FPS, latencia y contadores de frames descartados de la cámara."""
+    return widget.camera.stats()
+
+def preprocess_timings(widget):
+    """Devuelve el tiempo promedio (ms) de cada etapa de preprocesamiento e inferencia."""
+    return widget.inference.stage_timings
+
+def motion_gate_stats(widget):
+    """Devuelve cuántas inferencias se evitaron por falta de movimiento."""
+    return widget.emotion_worker.motion_gate.stats()
+
+def presence_gate_stats(widget):
+    """Devuelve cuántos ticks se registraron como ausencia sin correr el modelo."""
+    return widget.emotion_worker.presence_gate.stats()
+
+def inference_health(widget):
+    """Devuelve el estado del proceso de inferencia (vivo, memoria, reinicios)."""
+    return widget.inference.health()
+
+def handle_detection_error(widget, error):
+    widget.emotion_in_flight = max(0, widget.emotion_in_flight - 1)
+    widget.metrics.set_gauge("queue_depth", widget.emotion_in_flight)
+    widget.inference_latency = time.monotonic() - widget.request_started
+    widget.metrics.increment("errors")
+    print(error)
+    schedule_next_detection(widget)
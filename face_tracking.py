@@ -0,0 +1,146 @@
+import os
+import cv2
+
+# Activa el seguimiento del rostro; si está apagado se analiza el frame completo en cada tick
+TRACKING_ENABLED = True
+# Cada cuántos ticks se repite la detección completa aunque el seguimiento vaya bien
+DETECTION_EVERY_N = 10
+# Correlación normalizada mínima para aceptar la posición seguida
+MIN_TRACKING_CONFIDENCE = 0.6
+# Margen de búsqueda alrededor de la última caja, relativo a su tamaño
+SEARCH_MARGIN = 0.5
+# Detector de rostros que usa DeepFace en la detección completa
+DETECTOR_BACKEND = "opencv"
+# Clasificador Haar de rostros frontales que viene con OpenCV
+CASCADE_PATH = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+# Tamaño mínimo del rostro en el frame reducido que analiza el clasificador Haar
+MIN_FACE_SIZE = (20, 20)
+
+
+def detect_largest_face(frame, detector_backend=DETECTOR_BACKEND):
+    """Detecta rostros con DeepFace y devuelve la caja (x, y, w, h) del más grande, o None."""
+    from deepface import DeepFace
+
+    try:
+        faces = DeepFace.extract_faces(frame, detector_backend=detector_backend, enforce_detection=True)
+    except ValueError:
+        return None
+    if not faces:
+        return None
+    area = max((face["facial_area"] for face in faces), key=lambda a: a["w"] * a["h"])
+    return (int(area["x"]), int(area["y"]), int(area["w"]), int(area["h"]))
+
+
+class HaarFaceDetector:
+    """Detector de rostros barato: clasificador Haar sobre una copia reducida y en grises del frame."""
+
+    def __init__(self, width, cascade_path=CASCADE_PATH):
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        self.width = width
+        if self.cascade.empty():
+            print(f"No se pudo cargar el clasificador de rostros '{cascade_path}'.")
+
+    def available(self):
+        return not self.cascade.empty()
+
+    def __call__(self, frame):
+        """Devuelve la caja (x, y, w, h) del rostro más grande en coordenadas del frame, o None."""
+        height, width = frame.shape[:2]
+        scale = min(1.0, self.width / width)
+        small = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        small = cv2.equalizeHist(to_gray(small))
+        faces = self.cascade.detectMultiScale(small, scaleFactor=1.1, minNeighbors=4, minSize=MIN_FACE_SIZE)
+        if len(faces) == 0:
+            return None
+        x, y, w, h = max(faces, key=lambda face: face[2] * face[3])
+        return (int(x / scale), int(y / scale), int(w / scale), int(h / scale))
+
+
+def clip_box(box, shape):
+    """Recorta la caja a los límites del frame; devuelve None si queda vacía."""
+    if box is None:
+        return None
+    x, y, w, h = box
+    left, top = max(0, x), max(0, y)
+    right, bottom = min(shape[1], x + w), min(shape[0], y + h)
+    if right <= left or bottom <= top:
+        return None
+    return (left, top, right - left, bottom - top)
+
+
+def to_gray(frame):
+    if frame.ndim == 3:
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return frame
+
+
+class FaceTracker:
+    """Sigue la caja del rostro con template matching y solo repite la detección completa de vez en cuando.
+
+    La detección se repite cada detection_every ticks o cuando la confianza del
+    seguimiento cae por debajo de min_confidence.
+    """
+
+    def __init__(self, detect_face=detect_largest_face, detection_every=DETECTION_EVERY_N,
+                 min_confidence=MIN_TRACKING_CONFIDENCE, search_margin=SEARCH_MARGIN):
+        self.detect_face = detect_face
+        self.detection_every = detection_every
+        self.min_confidence = min_confidence
+        self.search_margin = search_margin
+        self.box = None
+        self.template = None
+        self.ticks_since_detection = 0
+        self.confidence = 0.0
+
+        # Contadores del seguimiento
+        self.hits = 0  # Ticks resueltos solo con seguimiento
+        self.misses = 0  # Seguimientos con confianza insuficiente
+        self.detections = 0  # Detecciones completas ejecutadas
+
+    def locate(self, frame):
+        """Devuelve la caja (x, y, w, h) del rostro en el frame, o None si no hay rostro."""
+        gray = to_gray(frame)
+        if self.box is not None and self.ticks_since_detection < self.detection_every:
+            box, confidence = self._track(gray)
+            self.confidence = confidence
+            if confidence >= self.min_confidence:
+                self.hits += 1
+                self.box = box
+                self.ticks_since_detection += 1
+                return box
+            self.misses += 1
+
+        self.detections += 1
+        self.ticks_since_detection = 0
+        box = clip_box(self.detect_face(frame), gray.shape)
+        if box is None:
+            self.box = self.template = None
+            self.confidence = 0.0
+            return None
+        x, y, w, h = box
+        self.box = box
+        self.template = gray[y:y + h, x:x + w].copy()
+        self.confidence = 1.0
+        return box
+
+    def _track(self, gray):
+        x, y, w, h = self.box
+        margin_x = int(w * self.search_margin)
+        margin_y = int(h * self.search_margin)
+        left = max(0, x - margin_x)
+        top = max(0, y - margin_y)
+        right = min(gray.shape[1], x + w + margin_x)
+        bottom = min(gray.shape[0], y + h + margin_y)
+        search = gray[top:bottom, left:right]
+        if search.shape[0] < self.template.shape[0] or search.shape[1] < self.template.shape[1]:
+            return self.box, 0.0
+        scores = cv2.matchTemplate(search, self.template, cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, location = cv2.minMaxLoc(scores)
+        return (left + location[0], top + location[1], w, h), float(confidence)
+
+    def crop(self, frame, box):
+        x, y, w, h = box
+        return frame[y:y + h, x:x + w]
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "detections": self.detections}
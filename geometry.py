@@ -0,0 +1,235 @@
+"""Geometría de configuraciones de rectas con NumPy, sin Qt.
+
+Un conjunto de configuraciones es un arreglo (N, K, 2, 2): N configuraciones de K
+segmentos, cada uno con dos extremos (x, y) en píxeles del área de dibujo. Todas
+las funciones aceptan también una sola configuración (K, 2, 2) y procesan todas
+las configuraciones en una sola llamada vectorizada.
+
+Las reglas replican las de DrawingArea: pendientes redondeadas a 2 decimales,
+intersecciones dentro de ambos segmentos redondeadas a píxeles enteros y
+coincidencia cuando dos segmentos tienen los mismos extremos.
+"""
+import numpy as np
+
+# Decimales con que se comparan las pendientes
+SLOPE_DECIMALS = 2
+# Escala de las coordenadas que se muestran al estudiante (100 píxeles = 1 unidad)
+DISPLAY_SCALE = 100
+
+
+def as_line_array(lines):
+    """Convierte a un arreglo float (N, K, 2, 2); una sola configuración (K, 2, 2) pasa a N = 1."""
+    lines = np.asarray(lines, dtype=float)
+    if lines.ndim == 3:
+        lines = lines[np.newaxis]
+    if lines.ndim != 4 or lines.shape[2:] != (2, 2):
+        raise ValueError(f"Se esperaba un arreglo (N, K, 2, 2) de segmentos, se recibió {lines.shape}")
+    return lines
+
+
+def _pair_coordinates(lines):
+    """Coordenadas de cada par (i, j) con forma (N, K, K): x1, y1, x2, y2 de i y x3, y3, x4, y4 de j."""
+    a = lines[:, :, np.newaxis]  # (N, K, 1, 2, 2)
+    b = lines[:, np.newaxis, :]  # (N, 1, K, 2, 2)
+    return (a[..., 0, 0], a[..., 0, 1], a[..., 1, 0], a[..., 1, 1],
+            b[..., 0, 0], b[..., 0, 1], b[..., 1, 0], b[..., 1, 1])
+
+
+def _upper_pairs(k):
+    """Máscara (K, K) de los pares i < j."""
+    return np.triu(np.ones((k, k), dtype=bool), 1)
+
+
+def slopes(lines, decimals=SLOPE_DECIMALS):
+    """Pendiente de cada segmento, (N, K); NaN para los verticales."""
+    lines = as_line_array(lines)
+    dx = lines[..., 1, 0] - lines[..., 0, 0]
+    dy = lines[..., 1, 1] - lines[..., 0, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(dx == 0, np.nan, dy / dx)
+    return np.round(result, decimals) if decimals is not None else result
+
+
+def same_slope(lines, decimals=SLOPE_DECIMALS):
+    """Pares con la misma pendiente redondeada (dos verticales cuentan como iguales), (N, K, K)."""
+    s = slopes(lines, decimals)
+    a, b = s[:, :, np.newaxis], s[:, np.newaxis, :]
+    return (a == b) | (np.isnan(a) & np.isnan(b))
+
+
+def coincident(lines):
+    """Pares de segmentos con los mismos extremos en el mismo orden, (N, K, K)."""
+    lines = as_line_array(lines)
+    return np.all(lines[:, :, np.newaxis] == lines[:, np.newaxis, :], axis=(-2, -1))
+
+
+def direction_counts(lines, decimals=SLOPE_DECIMALS):
+    """Cuenta por configuración los pares paralelos y coincidentes, como check_directions().
+
+    Devuelve dos arreglos (N,): pares con la misma pendiente y distintos extremos,
+    y pares con los mismos extremos.
+    """
+    lines = as_line_array(lines)
+    upper = _upper_pairs(lines.shape[1])
+    equal = same_slope(lines, decimals) & upper
+    same = coincident(lines) & equal
+    return (equal & ~same).sum(axis=(1, 2)), same.sum(axis=(1, 2))
+
+
+def _intersection(x1, y1, x2, y2, x3, y3, x4, y4, rounded):
+    """Intersección de las rectas 12 y 34 si cae dentro de ambos segmentos; NaN si no, (..., 2)."""
+    denominator = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    cross_a = x1 * y2 - y1 * x2
+    cross_b = x3 * y4 - y3 * x4
+    with np.errstate(divide="ignore", invalid="ignore"):
+        px = (cross_a * (x3 - x4) - (x1 - x2) * cross_b) / denominator
+        py = (cross_a * (y3 - y4) - (y1 - y2) * cross_b) / denominator
+    inside = (
+        (denominator != 0)
+        & (np.minimum(x1, x2) <= px) & (px <= np.maximum(x1, x2))
+        & (np.minimum(y1, y2) <= py) & (py <= np.maximum(y1, y2))
+        & (np.minimum(x3, x4) <= px) & (px <= np.maximum(x3, x4))
+        & (np.minimum(y3, y4) <= py) & (py <= np.maximum(y3, y4))
+    )
+    points = np.stack([px, py], axis=-1)
+    if rounded:
+        points = np.rint(points)
+    points[~inside] = np.nan
+    return points
+
+
+def intersection_points(lines, rounded=True):
+    """Punto de intersección de cada par de segmentos, (N, K, K, 2); NaN si no se cortan.
+
+    Igual que calculate_intersection(): se usa la intersección de las rectas y se
+    descarta si cae fuera de alguno de los dos segmentos; los paralelos no tienen.
+    """
+    lines = as_line_array(lines)
+    return _intersection(*_pair_coordinates(lines), rounded)
+
+
+def pairwise_intersection(first, second, rounded=True):
+    """Como intersection_points(), pero elemento a elemento entre dos arreglos (..., 2, 2) compatibles."""
+    first, second = np.asarray(first, dtype=float), np.asarray(second, dtype=float)
+    return _intersection(
+        first[..., 0, 0], first[..., 0, 1], first[..., 1, 0], first[..., 1, 1],
+        second[..., 0, 0], second[..., 0, 1], second[..., 1, 0], second[..., 1, 1],
+        rounded,
+    )
+
+
+def _orientation(px, py, qx, qy, rx, ry):
+    """Signo de la orientación de (p, q, r): 0 colineales, 1 horario, -1 antihorario."""
+    return np.sign((qy - py) * (rx - qx) - (qx - px) * (ry - qy))
+
+
+def _on_segment(px, py, qx, qy, rx, ry):
+    """q está dentro de la caja del segmento pr."""
+    return (
+        (np.minimum(px, rx) <= qx) & (qx <= np.maximum(px, rx))
+        & (np.minimum(py, ry) <= qy) & (qy <= np.maximum(py, ry))
+    )
+
+
+def _touching(x1, y1, x2, y2, x3, y3, x4, y4):
+    """Prueba de orientaciones: los segmentos 12 y 34 se tocan, incluidos los colineales que se superponen."""
+    o1 = _orientation(x1, y1, x2, y2, x3, y3)
+    o2 = _orientation(x1, y1, x2, y2, x4, y4)
+    o3 = _orientation(x3, y3, x4, y4, x1, y1)
+    o4 = _orientation(x3, y3, x4, y4, x2, y2)
+    return (
+        ((o1 != o2) & (o3 != o4))
+        | ((o1 == 0) & _on_segment(x1, y1, x3, y3, x2, y2))
+        | ((o2 == 0) & _on_segment(x1, y1, x4, y4, x2, y2))
+        | ((o3 == 0) & _on_segment(x3, y3, x1, y1, x4, y4))
+        | ((o4 == 0) & _on_segment(x3, y3, x2, y2, x4, y4))
+    )
+
+
+def segments_intersect(lines):
+    """Pares de segmentos que se tocan, incluidos los colineales que se superponen, (N, K, K).
+
+    Es la prueba de orientaciones de check_intersection(); la diagonal (cada
+    segmento consigo mismo) es True.
+    """
+    lines = as_line_array(lines)
+    return _touching(*_pair_coordinates(lines))
+
+
+def pairwise_touch(first, second):
+    """Como segments_intersect(), pero elemento a elemento entre dos arreglos (..., 2, 2) compatibles."""
+    first, second = np.asarray(first, dtype=float), np.asarray(second, dtype=float)
+    return _touching(
+        first[..., 0, 0], first[..., 0, 1], first[..., 1, 0], first[..., 1, 1],
+        second[..., 0, 0], second[..., 0, 1], second[..., 1, 0], second[..., 1, 1],
+    )
+
+
+def intersection_counts(lines):
+    """Número de pares de segmentos que se tocan en cada configuración, (N,)."""
+    lines = as_line_array(lines)
+    return (segments_intersect(lines) & _upper_pairs(lines.shape[1])).sum(axis=(1, 2))
+
+
+def distinct_intersection_counts(lines, points=None):
+    """Número de puntos de intersección distintos en cada configuración, (N,).
+
+    Varios pares que se cortan en el mismo punto (rectas concurrentes, o una
+    secante a dos coincidentes) cuentan un solo punto.
+    """
+    lines = as_line_array(lines)
+    if points is None:
+        points = intersection_points(lines)
+    i, j = np.triu_indices(lines.shape[1], 1)
+    # Los complejos se ordenan por x y luego por y, y los NaN quedan al final de cada fila
+    ordered = np.sort(points[:, i, j, 0] + 1j * points[:, i, j, 1], axis=1)
+    valid = ~np.isnan(ordered.real)
+    new = np.ones_like(valid)
+    new[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    return (valid & new).sum(axis=1)
+
+
+def concurrent(lines, points=None):
+    """Configuraciones cuyas rectas pasan todas por un mismo punto, (N,).
+
+    Es así si todas son coincidentes, o si hay un único punto de intersección
+    y cada recta corta a alguna otra (entonces todas pasan por ese punto).
+    """
+    lines = as_line_array(lines)
+    n, k = lines.shape[:2]
+    if k < 2:
+        return np.zeros(n, dtype=bool)
+    if points is None:
+        points = intersection_points(lines)
+    crosses = ~np.isnan(points[..., 0])  # La diagonal siempre es NaN
+    single = (distinct_intersection_counts(lines, points) == 1) & crosses.any(axis=2).all(axis=1)
+    return single | coincident(lines).all(axis=(1, 2))
+
+
+def common_point(lines, points=None):
+    """Punto común a las tres primeras rectas en unidades de pantalla, (N, 2); NaN si no lo hay.
+
+    Como common_point_for_three_lines(): la intersección 1-2 debe coincidir con la 1-3.
+    """
+    lines = as_line_array(lines)
+    result = np.full((lines.shape[0], 2), np.nan)
+    if lines.shape[1] < 3:
+        return result
+    if points is None:
+        points = intersection_points(lines)
+    p12, p13 = points[:, 0, 1], points[:, 0, 2]
+    found = np.all(p12 == p13, axis=-1)
+    result[found] = np.round(p12[found] / DISPLAY_SCALE, 2) + 0.0  # + 0.0 evita mostrar -0.0
+    return result
+
+
+def point_segment_distance(points, lines):
+    """Distancia de cada punto (P, 2) al segmento más cercano de cada línea (K, 2, 2), (P, K)."""
+    points = np.asarray(points, dtype=float).reshape(-1, 1, 2)
+    lines = np.asarray(lines, dtype=float).reshape(1, -1, 2, 2)
+    p1, d = lines[..., 0, :], lines[..., 1, :] - lines[..., 0, :]
+    squared = (d ** 2).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(squared == 0, 0.0, ((points - p1) * d).sum(axis=-1) / squared)
+    nearest = p1 + np.clip(t, 0, 1)[..., np.newaxis] * d
+    return np.hypot(*(points - nearest).transpose(2, 0, 1))
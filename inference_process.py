@@ -0,0 +1,308 @@
+import multiprocessing
+import queue
+import time
+from collections import namedtuple
+from camera_capture import SharedFrameRing
+from face_tracking import FaceTracker, TRACKING_ENABLED
+from emotion_backends import create_backend, dominant_emotion, preferred_backend
+from detector_tuning import load_tuned_detector
+from resource_budget import apply_resource_budget, resource_budget
+from preprocessing import crop_frame, prepare_classifier_input, add_timing
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él no se aplica el tope de memoria
+    psutil = None
+
+# Tiempo máximo de espera por un resultado antes de considerar colgado al proceso
+INFERENCE_TIMEOUT = 60  # segundos (la primera llamada construye el modelo)
+# Intervalo de sondeo mientras se espera un resultado
+POLL_INTERVAL = 0.5  # segundos
+# Tope de memoria residente del proceso de inferencia; al superarlo se recicla
+MAX_WORKER_RSS_MB = 2048
+
+# Caídas seguidas del proceso tras las que se deja de reiniciarlo
+MAX_CONSECUTIVE_FAILURES = 5
+# Espera antes de reiniciar tras una caída; se duplica con cada caída seguida hasta el máximo
+RESTART_BACKOFF = 1.0  # segundos
+RESTART_BACKOFF_MAX = 30.0  # segundos
+
+# request_id del aviso que envía el proceso cuando el modelo ya está construido
+WARMUP_REQUEST_ID = 0
+
+# Factor de suavizado para el promedio de tiempos por etapa
+TIMING_ALPHA = 0.1
+
+# Resultado pequeño que devuelve el proceso de inferencia por cada frame
+EmotionRecord = namedtuple(
+    "EmotionRecord",
+    ["request_id", "timestamp", "probabilities", "dominant_emotion", "error", "face_box", "tracker", "timings"],
+    defaults=(None, None, None),
+)
+
+
+def _inference_main(request_queue, result_queue, preprocess_config, backend_name, backend_options, budget):
+    """Bucle del proceso de inferencia: lee frames del anillo compartido y devuelve EmotionRecord."""
+    # Los límites de hilos deben aplicarse antes de que el backend importe TensorFlow
+    apply_resource_budget(**budget)
+
+    timings = {}
+    start = time.perf_counter()
+    backend_error = None
+    try:
+        backend = create_backend(backend_name, **backend_options)
+        add_timing(timings, "import_backend", start)
+        # La primera clasificación construye el modelo; la hacemos antes de aceptar frames
+        start = time.perf_counter()
+        backend.warm_up()
+        add_timing(timings, "warmup", start)
+    except Exception as e:
+        # Sin backend no hay nada que reiniciar: respondemos cada solicitud con el error
+        backend, backend_error = None, f"no se pudo crear el backend '{backend_name}': {e}"
+    result_queue.put(EmotionRecord(WARMUP_REQUEST_ID, time.time(), None, None, backend_error, timings=timings))
+    tracker = FaceTracker(detect_face=backend.detect_face) if TRACKING_ENABLED and backend is not None else None
+    rings = {}
+    while True:
+        request = request_queue.get()
+        if request is None:
+            break
+        request_id, descriptor, slot, timestamp = request
+        if backend is None:
+            result_queue.put(EmotionRecord(request_id, timestamp, None, None, backend_error))
+            continue
+        timings = {}
+        face_box = None
+        try:
+            # Un anillo que ya no existe o un slot inválido también se responden con error: la
+            # interfaz libera el slot al recibir el EmotionRecord
+            name = descriptor[0]
+            if name not in rings:
+                # La cámara creó un anillo nuevo (cambio de resolución); soltamos los anteriores
+                for ring in rings.values():
+                    ring.close()
+                rings = {}
+                rings[name] = SharedFrameRing.attach(descriptor)
+            frame = crop_frame(rings[name].frames[slot], preprocess_config, timings)
+            if tracker is not None:
+                # Solo el recorte del rostro pasa al clasificador; la detección completa es periódica
+                start = time.perf_counter()
+                face_box = tracker.locate(frame)
+                add_timing(timings, "locate", start)
+                if face_box is None:
+                    raise ValueError("No se detectó ningún rostro en el frame")
+                face = prepare_classifier_input(tracker.crop(frame, face_box), True, preprocess_config, timings)
+                start = time.perf_counter()
+                probabilities = backend.classify(face)
+            else:
+                image = prepare_classifier_input(frame, False, preprocess_config, timings)
+                start = time.perf_counter()
+                probabilities = backend.classify_frame(image)
+            add_timing(timings, "classify", start)
+            # Guardamos el vector completo de probabilidades, no solo la emoción dominante
+            record = EmotionRecord(request_id, timestamp, probabilities, dominant_emotion(probabilities), None, face_box)
+        except Exception as e:
+            record = EmotionRecord(request_id, timestamp, None, None, str(e), face_box)
+        frame = face = image = None  # Soltamos las vistas del anillo compartido
+        record = record._replace(timings=timings)
+        if tracker is not None:
+            record = record._replace(tracker=tracker.stats())
+        result_queue.put(record)
+
+    for ring in rings.values():
+        ring.close()
+
+
+class InferenceProcess:
+    """Administra el proceso de inferencia: arranque diferido, salud, reinicio y reciclaje por memoria."""
+
+    def __init__(self, max_rss_mb=MAX_WORKER_RSS_MB, timeout=INFERENCE_TIMEOUT, preprocess_config=None,
+                 backend=None, backend_options=None, budget=None):
+        self.max_rss_mb = max_rss_mb
+        self.timeout = timeout
+        self.preprocess_config = preprocess_config or {}
+        self.backend = backend or preferred_backend()  # Sin backend indicado, el modelo en caché si lo hay
+        self.backend_options = backend_options or {}
+        self.budget = budget if budget is not None else resource_budget()
+        self.stage_timings = {}  # Promedio móvil en ms de cada etapa informada por el proceso
+        self.context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.request_queue = None
+        self.result_queue = None
+        self.next_request_id = 0
+        self.restarts = 0
+        self.recycles = 0
+        self.failures = 0  # Caídas seguidas sin un resultado válido entre medio
+        self.retry_at = 0.0  # Momento (time.monotonic) desde el que se puede volver a arrancar
+        self.tracker_stats = None  # Contadores del seguimiento de rostro informados por el proceso
+        self.restart_requested = False
+        self.ready = False  # El proceso actual ya construyó el modelo
+        self.warmup_error = None
+        self.warmup_timings = None  # Tiempos (ms) de importación y construcción del modelo en el último arranque
+
+    def request_restart(self):
+        """Pide reiniciar el proceso antes de la próxima solicitud (p. ej. tras elegir otro detector)."""
+        self.restart_requested = True
+
+    def backend_arguments(self):
+        options = dict(self.backend_options)
+        if self.budget.get("threads"):
+            options.setdefault("threads", self.budget["threads"])
+        if self.backend == "deepface":
+            # Detector elegido por detector_tuning.py para este equipo, si ya se midió
+            detector = load_tuned_detector()
+            if detector is not None:
+                options.setdefault("detector_backend", detector)
+        return options
+
+    @property
+    def gave_up(self):
+        """El proceso se cayó MAX_CONSECUTIVE_FAILURES veces seguidas: ya no se reinicia."""
+        return self.failures >= MAX_CONSECUTIVE_FAILURES
+
+    def retry_delay(self):
+        """Segundos que faltan para poder reiniciar el proceso tras la última caída."""
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def _record_failure(self):
+        self.restarts += 1
+        self.failures += 1
+        backoff = min(RESTART_BACKOFF * 2 ** (self.failures - 1), RESTART_BACKOFF_MAX)
+        self.retry_at = time.monotonic() + backoff
+
+    def ensure_started(self):
+        """Arranca el proceso la primera vez que se necesita o después de una caída.
+
+        Tras una caída espera RESTART_BACKOFF segundos (el doble con cada caída
+        seguida) y después de MAX_CONSECUTIVE_FAILURES deja de intentarlo.
+        Devuelve si el proceso está corriendo.
+        """
+        if self.restart_requested:
+            self.restart_requested = False
+            self.shutdown()
+        if self.process is not None and self.process.is_alive():
+            return True
+        if self.process is not None:
+            self._record_failure()
+            self._discard_process()
+        if self.gave_up or self.retry_delay() > 0:
+            return False
+        self.request_queue = self.context.Queue()
+        self.result_queue = self.context.Queue()
+        self.process = self.context.Process(
+            target=_inference_main,
+            args=(self.request_queue, self.result_queue, self.preprocess_config, self.backend, self.backend_arguments(),
+                  self.budget),
+            name="emotion-inference",
+            daemon=True,
+        )
+        self.process.start()
+        return True
+
+    def analyze(self, handle):
+        """Envía el frame fijado en handle al proceso y espera su EmotionRecord.
+
+        Se llama desde el hilo de detección, nunca desde el hilo de la interfaz.
+        """
+        self.next_request_id += 1
+        request_id = self.next_request_id
+        if not self.ensure_started():
+            return EmotionRecord(request_id, handle.timestamp, None, None, "el proceso de inferencia está detenido tras varias caídas")
+        self.request_queue.put((request_id, handle.ring.descriptor(), handle.slot, handle.timestamp))
+
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            try:
+                record = self.result_queue.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    # El proceso murió: se volverá a arrancar en la siguiente solicitud
+                    return EmotionRecord(request_id, handle.timestamp, None, None, "el proceso de inferencia terminó inesperadamente")
+                continue
+            if record.request_id == WARMUP_REQUEST_ID:
+                self._mark_ready(record)  # El proceso se reinició durante esta solicitud
+                continue
+            if record.request_id != request_id:
+                continue  # Resultado atrasado de una solicitud que ya expiró
+            self.failures = 0  # El proceso respondió: las caídas anteriores ya no son seguidas
+            if record.tracker is not None:
+                self.tracker_stats = record.tracker
+            for stage, elapsed in (record.timings or {}).items():
+                previous = self.stage_timings.get(stage, elapsed)
+                self.stage_timings[stage] = previous + TIMING_ALPHA * (elapsed - previous)
+            self._check_memory()
+            return record
+
+        # Proceso colgado: lo detenemos para que se reinicie en la siguiente solicitud
+        self._record_failure()
+        self._discard_process()
+        return EmotionRecord(request_id, handle.timestamp, None, None, "tiempo de espera agotado en el proceso de inferencia")
+
+    def poll_ready(self):
+        """Revisa sin bloquear si el proceso terminó de construir el modelo.
+
+        Solo debe llamarse mientras no hay una solicitud en curso, porque lee la misma
+        cola de resultados que analyze().
+        """
+        if self.ready or self.process is None:
+            return self.ready
+        while True:
+            try:
+                record = self.result_queue.get_nowait()
+            except queue.Empty:
+                return self.ready
+            if record.request_id == WARMUP_REQUEST_ID:
+                self._mark_ready(record)
+                return self.ready
+
+    def _mark_ready(self, record):
+        self.ready = True
+        self.warmup_error = record.error
+        self.warmup_timings = record.timings
+
+    def rss_mb(self):
+        process = self.process  # También se consulta desde el hilo del endpoint de métricas
+        if psutil is None or process is None or not process.is_alive():
+            return None
+        try:
+            return psutil.Process(process.pid).memory_info().rss / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    def _check_memory(self):
+        rss = self.rss_mb()
+        if rss is not None and rss > self.max_rss_mb:
+            print(f"Proceso de inferencia usa {rss:.0f} MB; reciclando.")
+            self.recycles += 1
+            self.shutdown()
+
+    def health(self):
+        """Devuelve el estado del proceso de inferencia."""
+        return {
+            "backend": self.backend,
+            "alive": self.process is not None and self.process.is_alive(),
+            "ready": self.ready,
+            "pid": self.process.pid if self.process is not None else None,
+            "rss_mb": self.rss_mb(),
+            "restarts": self.restarts,
+            "recycles": self.recycles,
+            "failures": self.failures,
+            "tracker": self.tracker_stats,
+        }
+
+    def _discard_process(self):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join()
+        self.process = None
+        self.ready = False  # El próximo proceso tendrá que volver a construir el modelo
+
+    def shutdown(self):
+        """Pide al proceso que termine y lo espera; el siguiente analyze() lo vuelve a arrancar."""
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.request_queue.put(None)
+            self.process.join(timeout=5)
+        self._discard_process()
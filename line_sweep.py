@@ -0,0 +1,138 @@
+"""Intersecciones y grupos de rectas para sistemas grandes, sin pares O(n²) ni Qt.
+
+Las intersecciones se buscan barriendo el plano en franjas verticales: dentro de
+cada franja solo se comparan los segmentos cuyos tramos se superponen en y. Los
+candidatos se confirman con la misma prueba de orientaciones de geometry, así
+que los resultados son idénticos a los de segments_intersect(). Las rectas
+paralelas y coincidentes se agrupan con un diccionario por dirección, en O(n).
+"""
+from collections import Counter
+import numpy as np
+import geometry
+
+
+# Holgura en píxeles al comparar intervalos en y: solo agrega candidatos, que luego se confirman
+Y_TOLERANCE = 1e-6
+
+
+def _as_lines(lines):
+    lines = np.asarray(lines, dtype=float)
+    return lines.reshape(-1, 2, 2)
+
+
+def _slabs(x_min, x_max):
+    """Franjas verticales del barrido: √n franjas del mismo ancho entre el primer y el último extremo."""
+    count = max(1, int(np.sqrt(len(x_min))))
+    edges = np.linspace(x_min.min(), x_max.max(), count + 1)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _y_ranges(lines, left, right):
+    """Intervalo en y que recorre cada segmento dentro de la franja [left, right]."""
+    (x1, y1), (x2, y2) = lines[:, 0].T, lines[:, 1].T
+    low = np.maximum(np.minimum(x1, x2), left)
+    high = np.minimum(np.maximum(x1, x2), right)
+    dx = x2 - x1
+    vertical = dx == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        start = np.where(vertical, y1, y1 + (low - x1) / dx * (y2 - y1))
+        end = np.where(vertical, y2, y1 + (high - x1) / dx * (y2 - y1))
+    return np.minimum(start, end) - Y_TOLERANCE, np.maximum(start, end) + Y_TOLERANCE
+
+
+def _overlapping_intervals(low, high):
+    """Pares (a, b) de intervalos [low, high] que se superponen, ordenando por low y con una búsqueda binaria por intervalo."""
+    order = np.argsort(low, kind="stable")
+    ends = np.searchsorted(low[order], high[order], side="right")
+    counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return order[first], order[first + 1 + offsets]
+
+
+def candidate_pairs(lines):
+    """Pares (i, j), i < j, que pueden tocarse, (M, 2), en orden lexicográfico.
+
+    El plano se corta en franjas verticales; en cada franja solo se emparejan los
+    segmentos que la atraviesan y cuyos tramos dentro de ella se superponen en y.
+    Dos segmentos que se tocan lo hacen en algún punto de una franja común, así
+    que ningún par que se toca queda afuera, y los que solo comparten el rango
+    en x (por ejemplo, rectas largas casi paralelas) se descartan.
+    """
+    lines = _as_lines(lines)
+    count = len(lines)
+    if count < 2:
+        return np.zeros((0, 2), dtype=int)
+    x = lines[..., 0]
+    x_min, x_max = x.min(axis=1), x.max(axis=1)
+
+    codes = []
+    for left, right in _slabs(x_min, x_max):
+        inside = np.flatnonzero((x_min <= right) & (x_max >= left))
+        if len(inside) < 2:
+            continue
+        a, b = _overlapping_intervals(*_y_ranges(lines[inside], left, right))
+        a, b = inside[a], inside[b]
+        # Un segmento que termina en el borde izquierdo y otro que empieza en el derecho no comparten x
+        shared = (x_min[a] <= x_max[b]) & (x_min[b] <= x_max[a])
+        a, b = a[shared], b[shared]
+        codes.append(np.minimum(a, b) * count + np.maximum(a, b))
+    if not codes:
+        return np.zeros((0, 2), dtype=int)
+    codes = np.unique(np.concatenate(codes))
+    return np.stack([codes // count, codes % count], axis=1)
+
+
+def touching_pairs(lines):
+    """Pares (i, j), i < j, de segmentos que se tocan, (M, 2); como check_intersection()."""
+    lines = _as_lines(lines)
+    pairs = candidate_pairs(lines)
+    return pairs[geometry.pairwise_touch(lines[pairs[:, 0]], lines[pairs[:, 1]])]
+
+
+def count_intersections(lines):
+    """Número de pares de segmentos que se tocan; como count_intersections()."""
+    return len(touching_pairs(lines))
+
+
+def intersections(lines, rounded=True):
+    """Enumera los pares que se tocan y su punto de intersección.
+
+    Devuelve (pares (M, 2), puntos (M, 2)); el punto es NaN cuando los segmentos
+    se tocan sin cortarse en un punto (colineales que se superponen).
+    """
+    lines = _as_lines(lines)
+    pairs = touching_pairs(lines)
+    points = geometry.pairwise_intersection(lines[pairs[:, 0]], lines[pairs[:, 1]], rounded)
+    return pairs, points
+
+
+def direction_key(slope):
+    """Clave de dirección: la pendiente redondeada, o None para las verticales."""
+    return None if np.isnan(slope) else float(slope)
+
+
+def direction_groups(lines, decimals=geometry.SLOPE_DECIMALS):
+    """Índices de las rectas de cada dirección: {pendiente redondeada o None: [índices]}."""
+    groups = {}
+    for index, slope in enumerate(geometry.slopes(_as_lines(lines), decimals)[0]):
+        groups.setdefault(direction_key(slope), []).append(index)
+    return groups
+
+
+def direction_counts(lines, decimals=geometry.SLOPE_DECIMALS):
+    """Pares paralelos (misma pendiente, distintos extremos) y coincidentes (mismos extremos).
+
+    Mismo resultado que geometry.direction_counts(), contando por grupos en vez de por pares.
+    """
+    lines = _as_lines(lines)
+    parallel = coincident = 0
+    for indices in direction_groups(lines, decimals).values():
+        same_endpoints = Counter(tuple(lines[index].ravel()) for index in indices)
+        pairs = len(indices) * (len(indices) - 1) // 2
+        repeated = sum(count * (count - 1) // 2 for count in same_endpoints.values())
+        parallel += pairs - repeated
+        coincident += repeated
+    return parallel, coincident
+
@@ -1,13 +1,27 @@
-from PyQt6.QtWidgets import QMainWindow, QStackedWidget, QMessageBox
+from PyQt6.QtWidgets import QMainWindow, QStackedWidget
 from PyQt6.QtCore import QTimer
 from drawing_area import DrawingArea
 from main_menu import MainMenu
 from initial_menu import InitialMenu
-from emotion_detection import init_emotion_detection, start_emotion_detection, stop_emotion_detection, detect_emotion
+from ui_latency import UiLatencyProbe
+from notifications import NotificationCenter
+from activity_monitor import ActivityMonitor
+from metrics_endpoint import MetricsServer, METRICS_ENDPOINT_ENABLED
+from emotion_detection import (
+    init_emotion_detection,
+    start_emotion_detection,
+    stop_emotion_detection,
+    detect_emotion,
+    shutdown_emotion_detection,
+    start_model_warmup,
+    pause_emotion_detection,
+    resume_emotion_detection,
+)
 
 class LineWidget(QMainWindow):
-    def __init__(self):
+    def __init__(self, startup=None):
         super().__init__()
+        self.startup = startup  # StartupTimer de main.py, si se mide el arranque
         self.stacked_widget = QStackedWidget()
         self.drawing_area = DrawingArea(self)
         self.main_menu = MainMenu(self.stacked_widget, self.drawing_area)
@@ -25,41 +39,96 @@ class LineWidget(QMainWindow):
         self.drawing_area.connect_back_button(self.on_back_button_clicked)
         self.drawing_area.connect_cancel_button(self.on_cancel_button_clicked)
 
+        # Avisos no modales: no detienen el dibujo ni la detección
+        self.notifications = NotificationCenter(self)
+
         init_emotion_detection(self)
 
+        # Mide la fluidez de la interfaz con y sin una inferencia en curso, solo mientras hay detección
+        self.ui_probe = UiLatencyProbe(busy=lambda: self.emotion_in_flight > 0, parent=self)
+        self.drawing_area.ui_probe = self.ui_probe
+
+        # Suspende la detección con la ventana minimizada, oculta o sin foco, o sin actividad del estudiante
+        self.activity = ActivityMonitor(self)
+        self.activity.active_changed.connect(self.on_activity_changed)
+
+        # Endpoint local opcional para que un scraper de Prometheus lea el rendimiento del tutor
+        self.metrics_server = MetricsServer(self) if METRICS_ENDPOINT_ENABLED else None
+        if self.metrics_server is not None:
+            self.metrics_server.start()
+
     def on_back_button_clicked(self):
         self.drawing_area.save_lines_to_file()
         self.stacked_widget.setCurrentIndex(1)
-        stop_emotion_detection(self)
+        self.stop_emotion_detection()
 
     def on_cancel_button_clicked(self):
         self.stacked_widget.setCurrentIndex(1)
-        stop_emotion_detection(self)
+        self.stop_emotion_detection()
 
     def start_emotion_detection(self):
         start_emotion_detection(self)
+        self.update_ui_probe()
 
     def stop_emotion_detection(self):
         stop_emotion_detection(self)
+        self.update_ui_probe()
 
     def detect_emotion(self):
         detect_emotion(self)
 
+    def on_activity_changed(self, active):
+        if active:
+            resume_emotion_detection(self)
+        else:
+            pause_emotion_detection(self, "inactivo" if self.activity.idle else "ventana")
+        self.update_ui_probe()
+
+    def update_ui_probe(self):
+        """La sonda de latencia corre solo con la detección activa; en pausa despertaría a la interfaz sin motivo."""
+        if self.detection_active and not self.detection_paused:
+            self.ui_probe.start()
+        else:
+            self.ui_probe.stop()
+
+    def on_first_window_shown(self):
+        if self.startup is not None:
+            self.startup.mark("first_window")
+        start_model_warmup(self)
+
+    def on_model_ready(self, warmup_timings):
+        if self.startup is None or "model_ready" in self.startup.marks:
+            return  # Solo se informa la primera carga, no las de un proceso reciclado
+        self.startup.mark("model_ready")
+        self.startup.details["model_ms"] = warmup_timings
+        report = self.startup.report()
+        print(f"Arranque: {report}")
+        self.startup.save()
+
+    def show_detection_status(self, text):
+        self.statusBar().showMessage(text)
+
     def show_popup(self, emotion, stress=False, congratulation=False):
-        msg = QMessageBox()
-        msg.setIcon(QMessageBox.Icon.Warning if stress else QMessageBox.Icon.Information)
         if congratulation:
-            msg.setText("¡Felicitaciones!")
-            msg.setInformativeText("¡Sigue con el buen trabajo!")
-            msg.setWindowTitle("Nivel de Estrés Bajo Detectado")
+            self.notifications.notify("congratulation", "¡Felicitaciones!", "¡Sigue con el buen trabajo!")
         else:
-            msg.setText(f"Emoción detectada: {emotion}")
-            msg.setInformativeText("Parece que estás estresado o distraído. ¿Te gustaría recibir ayuda?" if stress else "¡Sigue con el buen trabajo!")
-            msg.setWindowTitle("Emoción Detectada")
-        msg.setStandardButtons(QMessageBox.StandardButton.Ok | QMessageBox.StandardButton.Cancel)
-        msg.exec()
+            text = "Parece que estás estresado o distraído. ¿Te gustaría recibir ayuda?" if stress else "¡Sigue con el buen trabajo!"
+            self.notifications.notify("stress" if stress else "distraction", f"Emoción detectada: {emotion}", text)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.notifications.reposition()
+
+    def ui_latency_report(self):
+        return self.ui_probe.report()
 
     def closeEvent(self, event):
-        self.cap.release()
-        self.timer.stop()
+        self.ui_probe.stop()
+        self.activity.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        shutdown_emotion_detection(self)
+        self.notifications.clear()
+        if self.drawing_area.data_name:
+            self.notifications.save_log(f"{self.drawing_area.data_name}_notificaciones.csv")
         event.accept()
@@ -0,0 +1,139 @@
+"""Clasificación del caso en vivo mientras el estudiante arrastra las rectas, sin Qt.
+
+Las relaciones de cada par de rectas (misma pendiente, coincidentes, se tocan y
+punto de intersección) quedan guardadas en matrices (K, K). Cuando cambia una
+recta solo se recalculan su fila y su columna, en una llamada vectorizada de
+geometry, así el vector del caso se actualiza en cada evento del mouse. Al
+cargar una configuración completa se usan los grupos y el barrido de line_sweep.
+"""
+import numpy as np
+import geometry
+import line_sweep
+from case_grading import CASE_LINES, EXPECTED_VECTORS, case_for_signature
+
+# Si cambian más rectas que esta fracción se recalculan todas las relaciones de una vez
+FULL_RECOMPUTE_FRACTION = 0.5
+
+
+class LiveCaseClassifier:
+    """Caché de las relaciones entre pares de rectas de la configuración actual."""
+
+    def __init__(self, lines=None):
+        self.reset(np.zeros((0, 2, 2)) if lines is None else lines)
+
+    def reset(self, lines):
+        """Reemplaza todas las rectas; las relaciones se recalculan en la próxima consulta."""
+        self.lines = np.array(lines, dtype=float).reshape(-1, 2, 2)
+        k = len(self.lines)
+        self.same_slope = np.zeros((k, k), dtype=bool)
+        self.coincident = np.zeros((k, k), dtype=bool)
+        self.touching = np.zeros((k, k), dtype=bool)
+        self.points = np.full((k, k, 2), np.nan)
+        self.upper = np.triu(np.ones((k, k), dtype=bool), 1)
+        self.dirty = set(range(k))
+
+    def update_line(self, index, segment):
+        """Cambia una recta e invalida solo los pares que la incluyen."""
+        segment = np.asarray(segment, dtype=float)
+        if not np.array_equal(self.lines[index], segment):
+            self.lines[index] = segment
+            self.dirty.add(index)
+
+    def sync(self, lines):
+        """Alinea la caché con las rectas actuales (K, 2, 2), invalidando solo las que cambiaron.
+
+        Si cambió la cantidad de rectas (se agregó o borró una) se reinicia todo.
+        """
+        lines = np.asarray(lines, dtype=float).reshape(-1, 2, 2)
+        if len(lines) != len(self.lines):
+            self.reset(lines)
+            return
+        for index in np.flatnonzero(np.any(lines != self.lines, axis=(1, 2))):
+            self.lines[index] = lines[index]
+            self.dirty.add(int(index))
+
+    def refresh(self):
+        """Recalcula las relaciones pendientes."""
+        if not self.dirty:
+            return
+        if len(self.dirty) > FULL_RECOMPUTE_FRACTION * len(self.lines):
+            self._refresh_all()
+        else:
+            for index in self.dirty:
+                self._refresh_line(index)
+        self.dirty.clear()
+
+    def _refresh_all(self):
+        # Grupos por dirección y por extremos (diccionarios) e intersecciones por barrido: sin comparar todos los pares
+        k = len(self.lines)
+        self.same_slope = np.eye(k, dtype=bool)
+        for indices in line_sweep.direction_groups(self.lines).values():
+            self.same_slope[np.ix_(indices, indices)] = True
+        self.coincident = np.eye(k, dtype=bool)
+        endpoints = {}
+        for index, line in enumerate(self.lines):
+            endpoints.setdefault(tuple(line.ravel()), []).append(index)
+        for indices in endpoints.values():
+            self.coincident[np.ix_(indices, indices)] = True
+        pairs, points = line_sweep.intersections(self.lines)
+        first, second = pairs[:, 0], pairs[:, 1]
+        self.touching = np.eye(k, dtype=bool)
+        self.touching[first, second] = self.touching[second, first] = True
+        self.points = np.full((k, k, 2), np.nan)
+        self.points[first, second] = self.points[second, first] = points
+
+    def _refresh_line(self, index):
+        # La recta index contra todas las demás, en una sola llamada por relación
+        line = self.lines[index]
+        slopes = geometry.slopes(self.lines)[0]
+        relations = (
+            (self.same_slope, (slopes == slopes[index]) | (np.isnan(slopes) & np.isnan(slopes[index]))),
+            (self.coincident, np.all(self.lines == line, axis=(1, 2))),
+            (self.touching, geometry.pairwise_touch(line, self.lines)),
+            (self.points, geometry.pairwise_intersection(line, self.lines)),
+        )
+        for matrix, row in relations:
+            matrix[index] = row
+            matrix[:, index] = row
+
+    def direction_counts(self):
+        """Pares paralelos (misma pendiente, distintos extremos) y pares coincidentes."""
+        self.refresh()
+        equal = self.same_slope & self.upper
+        same = self.coincident & equal
+        return int((equal & ~same).sum()), int(same.sum())
+
+    def intersection_count(self):
+        """Número de pares de rectas que se tocan."""
+        self.refresh()
+        return int((self.touching & self.upper).sum())
+
+    def common_point(self):
+        """Punto común a las tres primeras rectas en unidades de pantalla, o None."""
+        if len(self.lines) < 3:
+            return None
+        self.refresh()
+        if not np.array_equal(self.points[0, 1], self.points[0, 2]):  # NaN nunca es igual: sin punto
+            return None
+        x, y = np.round(self.points[0, 1] / geometry.DISPLAY_SCALE, 2) + 0.0
+        return (float(x), float(y))
+
+    def signature(self):
+        """(pares paralelos, pares coincidentes, puntos de intersección distintos, punto común), como case_signatures()."""
+        self.refresh()
+        parallel, coincident = self.direction_counts()
+        crosses = ~np.isnan(self.points[..., 0])  # La diagonal siempre es NaN
+        points = self.points[self.upper & crosses]
+        distinct = len(np.unique(points, axis=0))
+        together = (distinct == 1 and bool(crosses.any(axis=1).all())) or bool(self.coincident.all())
+        return (parallel, coincident, distinct, int(together and len(self.lines) > 1))
+
+    def case(self):
+        """Caso que forman las rectas actuales, o None; con las mismas reglas que case_grading."""
+        if len(self.lines) != CASE_LINES:
+            return None  # Solo los sistemas de tres rectas son casos: no hace falta calcular nada más
+        return case_for_signature(self.signature(), len(self.lines))
+
+    def vector(self):
+        """Vector esperado del caso que forman las rectas actuales, o None."""
+        return EXPECTED_VECTORS.get(self.case())
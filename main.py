@@ -1,8 +1,17 @@
+import time
+
+# Inicio del programa, antes de importar Qt y la interfaz
+STARTED = time.perf_counter()
+
 import sys
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
+from startup_report import StartupTimer
 from line_widget import LineWidget
 
 def main():
+    startup = StartupTimer(STARTED)
+    startup.mark("imports")
     app = QApplication(sys.argv)
     app.setStyleSheet("""
         MainMenu QPushButton {
@@ -30,9 +39,11 @@ def main():
         }
     """)
 
-    window = LineWidget()
+    window = LineWidget(startup)
     window.setWindowTitle("Dibujo de Líneas y Detección de Emociones")
     window.show()
+    # El modelo de emociones se carga recién cuando la ventana ya se dibujó
+    QTimer.singleShot(0, window.on_first_window_shown)
 
     sys.exit(app.exec())
 
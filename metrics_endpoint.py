@@ -0,0 +1,170 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: sin él no se informa la memoria del proceso de la interfaz
+    psutil = None
+
+# Endpoint local de métricas en formato de texto de Prometheus; apagado por defecto
+METRICS_ENDPOINT_ENABLED = False
+# Solo escucha en la máquina local: el scraper corre en el mismo equipo
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class MetricsWriter:
+    """Arma la exposición de texto de Prometheus, con un único HELP/TYPE por métrica."""
+
+    def __init__(self):
+        self.lines = []
+        self.declared = set()
+
+    def declare(self, name, kind, help_text):
+        if name not in self.declared:
+            self.declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name, value, labels=None):
+        if value is not None:
+            self.lines.append(f"{name}{_labels(labels)} {float(value):.9g}")
+
+    def text(self):
+        return "\n".join(self.lines) + "\n"
+
+
+def render_metrics(widget):
+    """Lee las métricas de la detección y de la interfaz y las devuelve en formato Prometheus.
+
+    Corre en el hilo del servidor: solo lee atributos y contadores de Python,
+    nunca llama a Qt, así que no toca el hilo de la interfaz.
+    """
+    out = MetricsWriter()
+
+    # Latencia por etapa del pipeline de emociones (pipeline_metrics.py)
+    name = "tutor_stage_latency_seconds"
+    out.declare(name, "histogram", "Latencia de cada etapa del pipeline de emociones.")
+    for stage, (bounds, counts, count, total) in widget.metrics.histograms_copy().items():
+        cumulative = 0
+        for bound, bucket in zip(bounds, counts):
+            cumulative += int(bucket)
+            out.sample(f"{name}_bucket", cumulative, {"stage": stage, "le": f"{bound / 1000:.6g}"})
+        out.sample(f"{name}_bucket", count, {"stage": stage, "le": "+Inf"})
+        out.sample(f"{name}_sum", total / 1000, {"stage": stage})
+        out.sample(f"{name}_count", count, {"stage": stage})
+
+    snapshot = widget.metrics.snapshot()
+    out.declare("tutor_pipeline_events_total", "counter", "Detecciones, errores y frames omitidos del pipeline.")
+    for event, value in snapshot["counters"].items():
+        out.sample("tutor_pipeline_events_total", value, {"event": event})
+    out.declare("tutor_pipeline_gauge", "gauge", "Profundidad de la cola de detección y su máximo.")
+    for gauge, value in snapshot["gauges"].items():
+        out.sample("tutor_pipeline_gauge", value, {"gauge": gauge})
+
+    # Cámara
+    camera = widget.camera.stats()
+    out.declare("tutor_camera_fps", "gauge", "Frames por segundo que entrega la cámara.")
+    out.sample("tutor_camera_fps", camera["fps"])
+    out.declare("tutor_camera_frames_total", "counter", "Frames capturados.")
+    out.sample("tutor_camera_frames_total", camera["frames_captured"])
+    out.declare("tutor_camera_dropped_frames_total", "counter", "Frames descartados sin llegar a un lector.")
+    out.sample("tutor_camera_dropped_frames_total", camera["dropped_frames"])
+    out.declare("tutor_camera_frame_age_seconds", "gauge", "Antigüedad media del frame al entregarlo.")
+    out.sample("tutor_camera_frame_age_seconds", camera["frame_age_ms"] / 1000)
+
+    # Fluidez de la interfaz (ui_latency.py)
+    ui_probe = getattr(widget, "ui_probe", None)
+    if ui_probe is not None:
+        report = ui_probe.report()
+        series = {
+            "tutor_ui_event_loop_lag_seconds": (
+                "Retraso del bucle de eventos de Qt.",
+                {"idle": report["event_loop_lag_idle"], "inference": report["event_loop_lag_during_inference"]},
+            ),
+            "tutor_paint_event_seconds": ("Duración de paintEvent del área de dibujo.", {None: report["paint_event"]}),
+        }
+        for name, (help_text, summaries) in series.items():
+            out.declare(name, "summary", help_text)
+            for state, summary in summaries.items():
+                if summary is None:
+                    continue
+                labels = {"state": state} if state else {}
+                for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+                    out.sample(name, summary[key] / 1000, {**labels, "quantile": quantile})
+                # _count y _sum son acumulados, como exige Prometheus; los cuantiles son de la ventana reciente
+                out.sample(f"{name}_sum", summary["sum_ms"] / 1000, labels)
+                out.sample(f"{name}_count", summary["count"], labels)
+
+    # Memoria residente de la interfaz y del proceso de inferencia
+    out.declare("tutor_process_resident_memory_bytes", "gauge", "Memoria residente por proceso.")
+    if psutil is not None:
+        out.sample("tutor_process_resident_memory_bytes", psutil.Process(os.getpid()).memory_info().rss, {"process": "gui"})
+    inference_rss = widget.inference.rss_mb()
+    if inference_rss is not None:
+        out.sample("tutor_process_resident_memory_bytes", inference_rss * 1024 * 1024, {"process": "inference"})
+    out.declare("tutor_inference_restarts_total", "counter", "Reinicios y reciclajes del proceso de inferencia.")
+    out.sample("tutor_inference_restarts_total", widget.inference.restarts, {"reason": "restart"})
+    out.sample("tutor_inference_restarts_total", widget.inference.recycles, {"reason": "memory"})
+    return out.text()
+
+
+class MetricsServer:
+    """Servidor HTTP local que atiende GET /metrics desde un hilo propio."""
+
+    def __init__(self, widget, host=METRICS_HOST, port=METRICS_PORT):
+        self.widget = widget
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        widget = self.widget
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                try:
+                    body = render_metrics(widget).encode("utf-8")
+                except Exception as e:
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Sin una línea en la consola por cada scrape
+
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        except OSError as e:
+            print(f"No se pudo abrir el endpoint de métricas en {self.host}:{self.port}: {e}")
+            return False
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics-endpoint", daemon=True)
+        self.thread.start()
+        print(f"Métricas disponibles en http://{self.host}:{self.server.server_port}/metrics")
+        return True
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.server = None
+        self.thread = None
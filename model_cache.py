@@ -0,0 +1,245 @@
+"""Caché local del modelo de emociones exportado, para que cada sesión lo cargue sin construirlo.
+
+Uso:
+    python model_cache.py build [--int8]
+    python model_cache.py list
+    python model_cache.py bench [--repeats 3] [--runtime onnxruntime]
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from importlib import metadata
+from detector_tuning import SETTINGS_DIR
+
+# Carpeta de la caché de modelos
+MODEL_CACHE_DIR = os.path.join(SETTINGS_DIR, "modelos")
+# Modelo de DeepFace que se exporta
+EMOTION_MODEL_NAME = "Emotion"
+# Formato del modelo guardado y el de la versión cuantizada
+CACHE_FORMAT = "onnx"
+INT8_CACHE_FORMAT = "onnx-int8"
+# Formatos que se buscan en la caché cuando no se pide uno, del preferido al último recurso
+CACHE_LOOKUP_ORDER = (INT8_CACHE_FORMAT, CACHE_FORMAT)
+MODEL_FILE = "model.onnx"
+MANIFEST_FILE = "manifest.json"
+
+
+def deepface_version():
+    """Versión instalada de DeepFace, sin importarlo (arrastraría TensorFlow)."""
+    try:
+        return metadata.version("deepface")
+    except metadata.PackageNotFoundError:
+        return "desconocida"
+
+
+def cache_key(model, version, backend):
+    return "-".join(part.replace(os.sep, "_").replace(" ", "_") for part in (model, version, backend))
+
+
+def cache_entry_dir(model=EMOTION_MODEL_NAME, version=None, backend=CACHE_FORMAT, cache_dir=MODEL_CACHE_DIR):
+    return os.path.join(cache_dir, cache_key(model, version or deepface_version(), backend))
+
+
+def file_digest(path):
+    """SHA-256 del archivo leído a través de un mapeo de memoria."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return digest.hexdigest()
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            digest.update(mapped)
+    return digest.hexdigest()
+
+
+def file_stamp(path):
+    """Tamaño y fecha de modificación (ns) del archivo: si no cambian, el contenido ya verificado tampoco."""
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def write_manifest(entry, manifest):
+    """Escribe el manifiesto en un temporal y lo renombra: nadie lee un manifiesto a medias."""
+    descriptor, temporary = tempfile.mkstemp(dir=entry, prefix=MANIFEST_FILE, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temporary, os.path.join(entry, MANIFEST_FILE))
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def store_model(source, model=EMOTION_MODEL_NAME, version=None, backend=CACHE_FORMAT, cache_dir=MODEL_CACHE_DIR):
+    """Copia un modelo exportado a la caché junto con su manifiesto; devuelve la ruta guardada."""
+    version = version or deepface_version()
+    entry = cache_entry_dir(model, version, backend, cache_dir)
+    os.makedirs(entry, exist_ok=True)
+    path = os.path.join(entry, MODEL_FILE)
+    # Copiamos a un archivo temporal y lo renombramos: otra sesión nunca ve un modelo a medias
+    temporary = path + ".tmp"
+    shutil.copyfile(source, temporary)
+    os.replace(temporary, path)
+    write_manifest(entry, {
+        "model": model,
+        "version": version,
+        "backend": backend,
+        "sha256": file_digest(path),
+        "size": os.path.getsize(path),
+        "verified": file_stamp(path),  # Recién calculado el hash: las cargas siguientes no lo repiten
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    return path
+
+
+def cached_model_path(model=EMOTION_MODEL_NAME, version=None, backend=CACHE_FORMAT, cache_dir=MODEL_CACHE_DIR,
+                      verify=True):
+    """Devuelve la ruta del modelo en caché si existe y pasa la verificación de integridad, o None.
+
+    El hash se calcula una sola vez: al verificarlo se guarda en el manifiesto el
+    tamaño y la fecha de modificación del archivo, y mientras no cambien las
+    cargas siguientes solo hacen un stat. Una entrada corrupta (tamaño o hash
+    distinto al del manifiesto) se borra para que se vuelva a generar.
+    """
+    version = version or deepface_version()
+    entry = cache_entry_dir(model, version, backend, cache_dir)
+    path = os.path.join(entry, MODEL_FILE)
+    try:
+        with open(os.path.join(entry, MANIFEST_FILE), "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if (manifest.get("model"), manifest.get("version"), manifest.get("backend")) != (model, version, backend):
+        return None
+    try:
+        stamp = file_stamp(path)
+        valid = stamp["size"] == manifest.get("size")
+        if valid and verify and manifest.get("verified") != stamp:
+            valid = file_digest(path) == manifest.get("sha256")
+            if valid:
+                write_manifest(entry, {**manifest, "verified": stamp})
+    except OSError:
+        valid = False
+    if not valid:
+        print(f"El modelo en caché '{path}' está incompleto o dañado; se descarta.")
+        shutil.rmtree(entry, ignore_errors=True)
+        return None
+    return path
+
+
+def find_cached_model(formats=CACHE_LOOKUP_ORDER, model=EMOTION_MODEL_NAME, version=None, cache_dir=MODEL_CACHE_DIR):
+    """Ruta del primer modelo válido en caché según el orden de formatos, o None."""
+    for backend in formats:
+        path = cached_model_path(model, version, backend, cache_dir)
+        if path is not None:
+            return path
+    return None
+
+
+def build_cache(int8=False):
+    """Exporta el modelo de DeepFace y lo guarda en la caché."""
+    from compare_backends import export_model
+
+    with tempfile.TemporaryDirectory() as folder:
+        exported = export_model(os.path.join(folder, MODEL_FILE), int8)
+        path = store_model(exported, backend=INT8_CACHE_FORMAT if int8 else CACHE_FORMAT)
+    print(f"Modelo guardado en la caché: '{path}'.")
+    return path
+
+
+def list_cache(cache_dir=MODEL_CACHE_DIR):
+    names = sorted(os.listdir(cache_dir)) if os.path.isdir(cache_dir) else []
+    if not names:
+        print("La caché de modelos está vacía.")
+    for name in names:
+        try:
+            with open(os.path.join(cache_dir, name, MANIFEST_FILE), "r") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            print(f"{name}: sin manifiesto")
+            continue
+        print(f"{name}: {manifest['size'] / 1e6:.1f} MB, creado {manifest['created_at']}")
+
+
+def _measure_start(backend_name, backend_options, results):
+    """Proceso nuevo: mide la creación del backend (importaciones incluidas) y la primera clasificación."""
+    from emotion_backends import create_backend
+
+    start = time.perf_counter()
+    backend = create_backend(backend_name, **backend_options)
+    loaded = time.perf_counter()
+    backend.warm_up()
+    results.put({"load_ms": (loaded - start) * 1000, "first_inference_ms": (time.perf_counter() - loaded) * 1000})
+
+
+def measure_start(backend_name, backend_options=None):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure_start, args=(backend_name, backend_options or {}, results))
+    process.start()
+    process.join()
+    if process.exitcode != 0:
+        return None
+    return results.get()
+
+
+def benchmark_starts(repeats=3, runtime="onnxruntime"):
+    """Compara el arranque en frío (DeepFace construye el modelo) con el arranque desde la caché.
+
+    Cada medición corre en un proceso nuevo, como una sesión del tutor.
+    """
+    path = find_cached_model()
+    if path is None:
+        print("No hay un modelo en caché; ejecute primero 'python model_cache.py build'.")
+        return None
+    variants = {
+        "en frío (DeepFace)": ("deepface", {}),
+        f"desde la caché ({runtime})": ("onnx", {"model_path": path, "runtime": runtime}),
+    }
+    summary = {}
+    for label, (backend_name, options) in variants.items():
+        runs = [measure_start(backend_name, options) for _ in range(repeats)]
+        runs = [run for run in runs if run is not None]
+        if not runs:
+            print(f"{label}: no se pudo crear el backend")
+            continue
+        total = sorted(run["load_ms"] + run["first_inference_ms"] for run in runs)
+        summary[label] = {
+            "load_ms": min(run["load_ms"] for run in runs),
+            "first_inference_ms": min(run["first_inference_ms"] for run in runs),
+            "median_total_ms": total[len(total) // 2],
+        }
+        stats = summary[label]
+        print(
+            f"{label}: carga {stats['load_ms']:.0f} ms, primera inferencia {stats['first_inference_ms']:.0f} ms, "
+            f"total (mediana de {len(runs)}) {stats['median_total_ms']:.0f} ms"
+        )
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Exporta el modelo de emociones y lo guarda en la caché")
+    build.add_argument("--int8", action="store_true", help="Cuantiza los pesos a int8")
+    commands.add_parser("list", help="Muestra las entradas de la caché")
+    bench = commands.add_parser("bench", help="Compara el arranque en frío con el arranque desde la caché")
+    bench.add_argument("--repeats", type=int, default=3)
+    bench.add_argument("--runtime", default="onnxruntime", choices=("onnxruntime", "opencv"))
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build_cache(args.int8)
+    elif args.command == "list":
+        list_cache()
+    else:
+        benchmark_starts(args.repeats, args.runtime)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+
+# Tamaño de la miniatura en grises que se compara entre frames
+THUMBNAIL_SIZE = (32, 32)
+# Diferencia media absoluta (niveles de gris 0-255) bajo la cual el frame se considera sin cambios
+MOTION_THRESHOLD = 6.0
+# Antigüedad máxima de un resultado reutilizado; pasado este tiempo se vuelve a inferir
+MAX_REUSE_AGE = 15.0  # segundos
+
+
+class MotionGate:
+    """Decide si un frame cambió lo suficiente respecto del último analizado como para volver a inferir.
+
+    Compara una miniatura en grises de la región del rostro (o del frame completo si
+    aún no hay rostro) contra la miniatura del último frame que pasó por el modelo.
+    """
+
+    def __init__(self, threshold=MOTION_THRESHOLD, max_reuse_age=MAX_REUSE_AGE):
+        self.threshold = threshold
+        self.max_reuse_age = max_reuse_age
+        self.reference = None
+        self.reference_time = None
+        self.pending = None
+        self.last_difference = None
+
+        # Contadores de la compuerta
+        self.checked = 0
+        self.skipped = 0
+
+    def thumbnail(self, frame, box=None):
+        if box is not None:
+            x, y, w, h = box
+            region = frame[y:y + h, x:x + w]
+            if region.size:
+                frame = region
+        small = cv2.resize(frame, THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.int16)
+
+    def should_skip(self, frame, box, now):
+        """Devuelve True si se puede reutilizar el resultado anterior para este frame."""
+        self.checked += 1
+        thumbnail = self.thumbnail(frame, box)
+        self.pending = thumbnail
+        if self.reference is None or now - self.reference_time > self.max_reuse_age:
+            return False
+        self.last_difference = float(np.abs(thumbnail - self.reference).mean())
+        if self.last_difference < self.threshold:
+            self.skipped += 1
+            return True
+        return False
+
+    def accept(self, now):
+        """Toma el último frame revisado como referencia tras una inferencia exitosa."""
+        self.reference = self.pending
+        self.reference_time = now
+
+    def reset(self):
+        self.reference = self.reference_time = self.pending = None
+
+    def stats(self):
+        return {"checked": self.checked, "skipped": self.skipped, "last_difference": self.last_difference}
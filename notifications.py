@@ -0,0 +1,159 @@
+import csv
+import time
+from collections import deque
+from PyQt6.QtCore import QObject, QTimer, Qt
+from PyQt6.QtWidgets import QFrame, QLabel, QPushButton, QVBoxLayout, QHBoxLayout
+
+# Tiempo mínimo entre dos notificaciones mostradas
+MIN_NOTIFICATION_GAP_MS = 20000
+# Tiempo que un aviso permanece visible si el estudiante no lo responde
+NOTIFICATION_TIMEOUT_MS = 15000
+# Avisos en espera como máximo; al llenarse se descarta el más antiguo
+MAX_PENDING_NOTIFICATIONS = 5
+# Separación del aviso respecto a la esquina superior derecha de la ventana
+TOAST_MARGIN = 20
+TOAST_WIDTH = 360
+LOG_FIELDS = ("kind", "title", "text", "queued_at", "shown_at", "closed_at", "response", "coalesced")
+
+
+class NotificationToast(QFrame):
+    """Aviso no modal que se dibuja sobre la ventana principal sin tomar el foco."""
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setStyleSheet("NotificationToast { background: #fdfdfd; border: 1px solid #999; border-radius: 6px; }")
+        self.setFixedWidth(TOAST_WIDTH)
+
+        self.title = QLabel(self)
+        self.title.setStyleSheet("font-weight: bold;")
+        self.text = QLabel(self)
+        self.text.setWordWrap(True)
+        self.ok_button = QPushButton("Aceptar", self)
+        self.cancel_button = QPushButton("Cancelar", self)
+        for button in (self.ok_button, self.cancel_button):
+            button.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        buttons.addWidget(self.ok_button)
+        buttons.addWidget(self.cancel_button)
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.title)
+        layout.addWidget(self.text)
+        layout.addLayout(buttons)
+        self.hide()
+
+    def show_notification(self, notification):
+        self.title.setText(notification["title"])
+        self.update_text(notification)
+        self.adjustSize()
+        self.reposition()
+        self.show()
+        self.raise_()
+
+    def update_text(self, notification):
+        suffix = f" (x{notification['coalesced'] + 1})" if notification["coalesced"] else ""
+        self.text.setText(notification["text"] + suffix)
+
+    def reposition(self):
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - TOAST_MARGIN, TOAST_MARGIN)
+
+
+class NotificationCenter(QObject):
+    """Cola de avisos no modales con agrupación y límite de frecuencia.
+
+    notify() nunca bloquea: encola el aviso y vuelve. Los avisos del mismo tipo que
+    aún esperan se agrupan en uno solo, y entre dos avisos mostrados pasan al menos
+    MIN_NOTIFICATION_GAP_MS. Cada aviso guarda cuándo se encoló, se mostró y se
+    cerró, y cómo se cerró ("aceptar", "cancelar" o "expirado").
+    """
+
+    def __init__(self, parent_widget, min_gap_ms=MIN_NOTIFICATION_GAP_MS, timeout_ms=NOTIFICATION_TIMEOUT_MS):
+        super().__init__(parent_widget)
+        self.min_gap_ms = min_gap_ms
+        self.timeout_ms = timeout_ms
+        self.toast = NotificationToast(parent_widget)
+        self.toast.ok_button.clicked.connect(lambda: self.close_current("aceptar"))
+        self.toast.cancel_button.clicked.connect(lambda: self.close_current("cancelar"))
+
+        self.pending = deque()
+        self.current = None
+        self.last_shown = None
+        self.log = []
+        self.dropped = 0
+
+        self.dispatch_timer = QTimer(self)
+        self.dispatch_timer.setSingleShot(True)
+        self.dispatch_timer.timeout.connect(self.dispatch)
+        self.expire_timer = QTimer(self)
+        self.expire_timer.setSingleShot(True)
+        self.expire_timer.timeout.connect(lambda: self.close_current("expirado"))
+
+    def notify(self, kind, title, text):
+        """Encola un aviso; si ya hay uno del mismo tipo esperando o visible, lo actualiza."""
+        for notification in ([self.current] if self.current else []) + list(self.pending):
+            if notification["kind"] == kind:
+                notification["text"] = text
+                notification["coalesced"] += 1
+                if notification is self.current:
+                    self.toast.update_text(notification)
+                return
+
+        if len(self.pending) >= MAX_PENDING_NOTIFICATIONS:
+            self.log.append(dict(self.pending.popleft(), response="descartado"))
+            self.dropped += 1
+        self.pending.append({
+            "kind": kind, "title": title, "text": text, "queued_at": time.time(),
+            "shown_at": None, "closed_at": None, "response": None, "coalesced": 0,
+        })
+        self.schedule_dispatch()
+
+    def schedule_dispatch(self):
+        if self.current is not None or not self.pending or self.dispatch_timer.isActive():
+            return
+        wait_ms = 0
+        if self.last_shown is not None:
+            wait_ms = max(0, int(self.min_gap_ms - (time.monotonic() - self.last_shown) * 1000))
+        self.dispatch_timer.start(wait_ms)
+
+    def dispatch(self):
+        if self.current is not None or not self.pending:
+            return
+        self.current = self.pending.popleft()
+        self.current["shown_at"] = time.time()
+        self.last_shown = time.monotonic()
+        self.toast.show_notification(self.current)
+        self.expire_timer.start(self.timeout_ms)
+
+    def close_current(self, response):
+        if self.current is None:
+            return
+        self.expire_timer.stop()
+        self.toast.hide()
+        self.current["closed_at"] = time.time()
+        self.current["response"] = response
+        self.log.append(self.current)
+        self.current = None
+        self.schedule_dispatch()
+
+    def clear(self):
+        """Cierra el aviso visible y descarta los pendientes (p. ej. al salir del ejercicio)."""
+        self.dispatch_timer.stop()
+        self.close_current("descartado")
+        while self.pending:
+            self.log.append(dict(self.pending.popleft(), response="descartado"))
+
+    def reposition(self):
+        if self.toast.isVisible():
+            self.toast.reposition()
+
+    def save_log(self, filename):
+        """Guarda en CSV los tiempos de cada aviso para analizarlos después."""
+        with open(filename, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=LOG_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.log)
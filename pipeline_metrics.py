@@ -0,0 +1,169 @@
+import json
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from detector_tuning import SETTINGS_DIR
+
+# Carpeta donde se vuelcan las métricas al cerrar el tutor
+METRICS_DIR = os.path.join(SETTINGS_DIR, "metricas")
+# Límites de los buckets del histograma en ms: escala logarítmica de 0.05 ms a 60 s
+HISTOGRAM_BOUNDS_MS = np.geomspace(0.05, 60000, 64)
+# Etapas del pipeline de emociones, en orden
+PIPELINE_STAGES = (
+    "frame_read",  # Espera del frame más reciente de la cámara
+    "preprocess",  # Recorte central en el hilo de trabajo
+    "face_detection",  # Compuerta de presencia en el hilo de trabajo
+    "inference",  # Ida y vuelta completa al proceso de inferencia
+    "child_preprocess",  # Recorte, reducción y conversión a grises dentro del proceso de inferencia
+    "child_face_detection",  # Localización del rostro dentro del proceso de inferencia
+    "child_classification",  # Modelo de emociones
+    "aggregation",  # Actualización de las ventanas de estrés
+    "notification",  # Decisión de mostrar un aviso
+    "end_to_end",  # Desde el tick del temporizador hasta procesar el resultado
+)
+# Etapas que informa el proceso de inferencia en EmotionRecord.timings y a qué etapa del pipeline suman.
+# Tienen su propio histograma (prefijo child_): mezclarlas con las del hilo de trabajo daría percentiles de dos distribuciones distintas
+CHILD_STAGES = {
+    "crop": "child_preprocess",
+    "downscale": "child_preprocess",
+    "grayscale": "child_preprocess",
+    "locate": "child_face_detection",
+    "classify": "child_classification",
+}
+
+
+class LatencyHistogram:
+    """Histograma de latencias de memoria fija con buckets logarítmicos.
+
+    Los percentiles se interpolan dentro del bucket, así que su error relativo
+    está acotado por el ancho del bucket (~25 %).
+    """
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = bounds
+        self.counts = np.zeros(len(bounds) + 1, dtype=np.int64)  # El último bucket es el desborde
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value_ms):
+        self.counts[np.searchsorted(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def percentile(self, q):
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = np.cumsum(self.counts)
+        index = int(np.searchsorted(cumulative, rank))
+        lower = self.bounds[index - 1] if index > 0 else 0.0
+        upper = self.bounds[index] if index < len(self.bounds) else self.max
+        previous = cumulative[index - 1] if index > 0 else 0
+        fraction = (rank - previous) / self.counts[index]
+        return float(min(lower + fraction * (upper - lower), self.max))
+
+    def summary(self):
+        if not self.count:
+            return None
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max,
+        }
+
+
+class PipelineMetrics:
+    """Histogramas por etapa, contadores y medidores del pipeline de emociones.
+
+    Lo usan a la vez el hilo de la interfaz y el hilo de trabajo, por eso cada
+    actualización toma el lock; son operaciones de microsegundos.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.histograms = {stage: LatencyHistogram() for stage in PIPELINE_STAGES}
+        self.counters = {}
+        self.gauges = {}
+
+    def record(self, stage, elapsed_ms):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = LatencyHistogram()
+            histogram.record(elapsed_ms)
+
+    @contextmanager
+    def stage(self, name):
+        """Mide con un reloj monotónico el bloque with y lo registra en el histograma de la etapa."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def record_child_timings(self, timings):
+        """Suma los tiempos que informó el proceso de inferencia a las etapas del pipeline."""
+        totals = {}
+        for stage, elapsed in (timings or {}).items():
+            target = CHILD_STAGES.get(stage)
+            if target is not None:
+                totals[target] = totals.get(target, 0.0) + elapsed
+        for stage, elapsed in totals.items():
+            self.record(stage, elapsed)
+
+    def increment(self, counter, amount=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+            peak = f"{name}_max"
+            self.gauges[peak] = max(self.gauges.get(peak, value), value)
+
+    def snapshot(self):
+        """Copia consultable de todas las métricas."""
+        with self.lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "stages": {stage: histogram.summary() for stage, histogram in self.histograms.items()},
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+            }
+
+    def histograms_copy(self):
+        """Copia de los buckets de cada etapa: {etapa: (límites ms, conteos, total de muestras, suma ms)}."""
+        with self.lock:
+            return {
+                stage: (histogram.bounds, histogram.counts.copy(), histogram.count, histogram.total)
+                for stage, histogram in self.histograms.items()
+            }
+
+    def dump(self, folder=METRICS_DIR, extra=None):
+        """Guarda la instantánea en un JSON por sesión, con datos del equipo para comparar máquinas y versiones."""
+        data = {
+            "host": platform.node(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            **self.snapshot(),
+            **(extra or {}),
+        }
+        path = os.path.join(folder, f"{platform.node()}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            os.makedirs(folder, exist_ok=True)
+            with open(path, "w") as file:
+                json.dump(data, file, indent=2)
+        except OSError as e:
+            print(f"No se pudieron guardar las métricas del pipeline: {e}")
+            return None
+        return path
@@ -0,0 +1,76 @@
+"""Preprocesamiento de los frames de la cámara, sin Qt.
+
+Lo usan tanto la interfaz (propiedades de captura) como el proceso de
+inferencia, que así no importa PyQt6 al arrancar con "spawn".
+"""
+import time
+import cv2
+
+# Configuración de la etapa de preprocesamiento; None deja el valor por defecto de cada opción
+PREPROCESS_CONFIG = {
+    "capture_width": 640,  # Resolución pedida a la cámara (CAP_PROP_FRAME_WIDTH)
+    "capture_height": 480,  # CAP_PROP_FRAME_HEIGHT
+    "fourcc": "MJPG",  # Formato pedido a la cámara (CAP_PROP_FOURCC)
+    "center_crop": None,  # Fracción del frame a conservar en el centro, p. ej. 0.6
+    "face_size": 96,  # Lado en píxeles al que se escala el recorte del rostro
+    "frame_width": 480,  # Ancho máximo del frame completo cuando no hay seguimiento de rostro
+    "grayscale": False,  # Convierte a escala de grises antes de clasificar
+}
+
+
+def capture_properties(config=PREPROCESS_CONFIG):
+    """Traduce la configuración a propiedades CAP_PROP_* para la cámara."""
+    properties = {}
+    if config.get("fourcc"):
+        properties[cv2.CAP_PROP_FOURCC] = cv2.VideoWriter_fourcc(*config["fourcc"])
+    if config.get("capture_width"):
+        properties[cv2.CAP_PROP_FRAME_WIDTH] = config["capture_width"]
+    if config.get("capture_height"):
+        properties[cv2.CAP_PROP_FRAME_HEIGHT] = config["capture_height"]
+    return properties
+
+
+def add_timing(timings, stage, start):
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def crop_frame(frame, config=PREPROCESS_CONFIG, timings=None):
+    """Recorta la región central del frame según config['center_crop'] (sin copiar)."""
+    fraction = config.get("center_crop")
+    if not fraction or fraction >= 1:
+        return frame
+    start = time.perf_counter()
+    height, width = frame.shape[:2]
+    crop_h, crop_w = int(height * fraction), int(width * fraction)
+    top, left = (height - crop_h) // 2, (width - crop_w) // 2
+    frame = frame[top:top + crop_h, left:left + crop_w]
+    add_timing(timings, "crop", start)
+    return frame
+
+
+def prepare_classifier_input(image, is_face, config=PREPROCESS_CONFIG, timings=None):
+    """Escala y opcionalmente pasa a grises la imagen que recibe el clasificador de emociones.
+
+    Un recorte de rostro se escala a config['face_size']; un frame completo se
+    limita a config['frame_width'] de ancho.
+    """
+    start = time.perf_counter()
+    height, width = image.shape[:2]
+    if is_face and config.get("face_size"):
+        target = config["face_size"]
+        scale = target / max(height, width)
+    elif not is_face and config.get("frame_width"):
+        scale = config["frame_width"] / width
+    else:
+        scale = 1.0
+    if scale < 1.0:
+        image = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))), interpolation=cv2.INTER_AREA)
+    add_timing(timings, "downscale", start)
+
+    if config.get("grayscale") and image.ndim == 3:
+        start = time.perf_counter()
+        # El modelo de emociones trabaja en grises; volvemos a 3 canales porque DeepFace los espera
+        image = cv2.cvtColor(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), cv2.COLOR_GRAY2BGR)
+        add_timing(timings, "grayscale", start)
+    return image
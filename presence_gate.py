@@ -0,0 +1,30 @@
+from face_tracking import HaarFaceDetector, CASCADE_PATH
+
+# Ancho al que se reduce el frame antes de buscar un rostro
+PRESENCE_WIDTH = 160
+
+
+class PresenceGate:
+    """Comprueba con un clasificador Haar barato si hay un rostro antes de correr el modelo de emociones."""
+
+    def __init__(self, cascade_path=CASCADE_PATH, width=PRESENCE_WIDTH):
+        self.detector = HaarFaceDetector(width, cascade_path)
+        if not self.detector.available():
+            print("Se omite la verificación de presencia.")
+
+        # Contadores de la compuerta
+        self.checked = 0
+        self.absent = 0
+
+    def face_present(self, frame):
+        """Devuelve True si encuentra al menos un rostro (o si el clasificador no está disponible)."""
+        if not self.detector.available():
+            return True
+        self.checked += 1
+        if self.detector(frame) is None:
+            self.absent += 1
+            return False
+        return True
+
+    def stats(self):
+        return {"checked": self.checked, "absent": self.absent}
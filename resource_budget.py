@@ -0,0 +1,56 @@
+import os
+
+try:
+    import psutil
+except ImportError:  # psutil es opcional: se usa para afinidad y prioridad donde os no las ofrece
+    psutil = None
+
+# Hilos que puede usar la inferencia; dejamos el resto de los núcleos para la interfaz
+INFERENCE_THREADS = max(1, (os.cpu_count() or 2) // 2)
+# Núcleos a los que se fija el proceso de inferencia, p. ej. [2, 3]; None no fija afinidad
+INFERENCE_CPU_AFFINITY = None
+# Incremento de nice del proceso de inferencia (mayor es menos prioritario); 0 no lo cambia
+INFERENCE_NICE = 10
+
+
+def resource_budget():
+    """Devuelve el presupuesto configurado para el proceso de inferencia."""
+    return {"threads": INFERENCE_THREADS, "affinity": INFERENCE_CPU_AFFINITY, "nice": INFERENCE_NICE}
+
+
+def thread_environment(threads):
+    """Variables de entorno que limitan los pools de hilos de TensorFlow, OpenMP y BLAS."""
+    return {
+        "TF_NUM_INTRAOP_THREADS": str(threads),
+        "TF_NUM_INTEROP_THREADS": "1",
+        "OMP_NUM_THREADS": str(threads),
+        "MKL_NUM_THREADS": str(threads),
+        "OPENBLAS_NUM_THREADS": str(threads),
+    }
+
+
+def apply_resource_budget(threads=None, affinity=None, nice=0):
+    """Aplica el presupuesto al proceso actual. Debe llamarse antes de importar TensorFlow."""
+    if threads:
+        os.environ.update(thread_environment(threads))
+        import cv2
+
+        cv2.setNumThreads(threads)
+
+    if affinity:
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, affinity)
+            elif psutil is not None:
+                psutil.Process().cpu_affinity(list(affinity))
+        except (OSError, ValueError) as e:
+            print(f"No se pudo fijar la afinidad de CPU {affinity}: {e}")
+
+    if nice:
+        try:
+            if hasattr(os, "nice"):
+                os.nice(nice)
+            elif psutil is not None:
+                psutil.Process().nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        except OSError as e:
+            print(f"No se pudo bajar la prioridad del proceso de inferencia: {e}")
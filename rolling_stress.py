@@ -0,0 +1,130 @@
+import numpy as np
+
+# Orden fijo de las clases en los vectores de probabilidad: las siete primeras en el
+# orden de DeepFace y al final 'absent', que marca que no había rostro frente a la cámara
+EMOTION_LABELS = ('angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral', 'absent')
+# Puntaje de estrés de cada emoción (-1 relajado, 1 estresado). La ausencia vale 0, que
+# normalizado es 0.5: el centro de la franja de distracción (entre DISTRACTION_THRESHOLD
+# y STRESS_THRESHOLD), lejos de ambos umbrales
+EMOTION_SCORES = {'happy': -1, 'sad': 1, 'fear': 1, 'angry': 1, 'neutral': 0, 'surprise': 0.5, 'disgust': 0.5, 'absent': 0}
+# Capacidad del anillo cuando la ventana solo se limita por tiempo
+DEFAULT_CAPACITY = 256
+
+
+def stress_weights(scores=EMOTION_SCORES):
+    """Construye el vector de pesos de estrés en el orden de EMOTION_LABELS.
+
+    Es float64 para que el producto punto con el promedio de la ventana (que se
+    acumula en float64) no agregue error de redondeo cerca de los umbrales.
+    """
+    return np.array([scores.get(label, 0) for label in EMOTION_LABELS], dtype=np.float64)
+
+
+# Vector de pesos por defecto; el estrés de una muestra es probabilidades @ STRESS_WEIGHTS
+STRESS_WEIGHTS = stress_weights()
+
+
+def normalize_stress(mean_score):
+    """Lleva un puntaje promedio de [-1, 1] al rango de 0 a 1."""
+    return (mean_score + 1) / 2
+
+
+def probability_vector(emotions):
+    """Convierte el diccionario de porcentajes de DeepFace en un vector float32 ordenado."""
+    return np.array([emotions.get(label, 0.0) for label in EMOTION_LABELS], dtype=np.float32) / 100
+
+
+# Muestra que se agrega a la ventana cuando no hay rostro
+ABSENT_PROBABILITIES = probability_vector({'absent': 100})
+
+
+class RollingStressWindow:
+    """Ventana móvil de vectores de probabilidad de emociones sobre un anillo de tamaño fijo.
+
+    Mantiene la suma de los vectores de la ventana, así que agregar, expulsar y
+    consultar el promedio son O(1) y la memoria es constante. El nivel de estrés es
+    el producto punto del vector promedio con los pesos. La ventana se limita por
+    cantidad de muestras (maxlen), por antigüedad en segundos (max_age) o por
+    ambas; si se llena el anillo se expulsa la muestra más antigua.
+    """
+
+    def __init__(self, maxlen=None, max_age=None, capacity=None, weights=STRESS_WEIGHTS):
+        self.maxlen = maxlen
+        self.max_age = max_age
+        self.capacity = capacity or maxlen or DEFAULT_CAPACITY
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.samples = np.zeros((self.capacity, len(self.weights)), dtype=np.float32)
+        self.times = np.zeros(self.capacity)
+        self.head = 0  # Índice de la muestra más antigua
+        self.count = 0
+        self.total = np.zeros(len(self.weights))
+        self.evictions = 0
+
+    def __len__(self):
+        return self.count
+
+    def is_full(self):
+        return self.maxlen is not None and self.count == self.maxlen
+
+    def clear(self):
+        self.head = self.count = 0
+        self.total[:] = 0.0
+
+    def append(self, probabilities, timestamp=0.0):
+        if self.max_age is not None:
+            self.evict_older_than(timestamp - self.max_age)
+        if self.count == self.capacity or (self.maxlen is not None and self.count == self.maxlen):
+            self._evict_oldest()
+        index = (self.head + self.count) % self.capacity
+        self.samples[index] = probabilities
+        self.times[index] = timestamp
+        self.count += 1
+        self.total += self.samples[index]
+
+    def evict_older_than(self, cutoff):
+        """Expulsa las muestras con timestamp anterior a cutoff."""
+        while self.count and self.times[self.head] < cutoff:
+            self._evict_oldest()
+
+    def _evict_oldest(self):
+        self.total -= self.samples[self.head]
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+        self.evictions += 1
+        if self.evictions % self.capacity == 0:
+            # Recalculamos la suma una vez por vuelta del anillo para no acumular error de redondeo
+            self.total = self.values().sum(axis=0, dtype=np.float64)
+
+    def values(self):
+        """Devuelve los vectores de la ventana, del más antiguo al más reciente."""
+        indices = (self.head + np.arange(self.count)) % self.capacity
+        return self.samples[indices]
+
+    def mean(self):
+        """Devuelve el vector de probabilidades promedio de la ventana."""
+        if not self.count:
+            return np.zeros(len(self.weights))
+        return self.total / self.count
+
+    def stress_level(self):
+        return normalize_stress(float(self.mean() @ self.weights))
+
+
+def stress_series(probabilities, timestamps=None, maxlen=None, max_age=None, weights=STRESS_WEIGHTS):
+    """Calcula de una vez el nivel de estrés de la ventana móvil tras cada muestra de una sesión.
+
+    probabilities es un arreglo (N, len(EMOTION_LABELS)). Es el equivalente
+    vectorizado de llamar a RollingStressWindow.append() y stress_level() muestra
+    por muestra; los timestamps deben estar ordenados.
+    """
+    scores = np.asarray(probabilities, dtype=np.float64) @ np.asarray(weights, dtype=np.float64)
+    positions = np.arange(len(scores))
+    cumulative = np.concatenate(([0.0], np.cumsum(scores, dtype=np.float64)))
+    start = np.zeros(len(scores), dtype=int)
+    if maxlen is not None:
+        start = np.maximum(start, positions - maxlen + 1)
+    if max_age is not None:
+        timestamps = np.asarray(timestamps, dtype=float)
+        start = np.maximum(start, np.searchsorted(timestamps, timestamps - max_age, side='left'))
+    sums = cumulative[positions + 1] - cumulative[start]
+    return normalize_stress(sums / (positions + 1 - start))
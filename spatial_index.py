@@ -0,0 +1,124 @@
+"""Índice espacial de los extremos y segmentos del área de dibujo, para elegir la recta de un clic sin Qt.
+
+Una grilla uniforme guarda en cada celda los extremos que caen en ella y los
+segmentos que pasan a menos del margen de clic. Un clic solo mira su celda
+(y las vecinas para los extremos), así que el costo no crece con el número de
+rectas, y los candidatos se confirman con la distancia real al segmento.
+"""
+from math import floor
+import numpy as np
+import geometry
+
+# Lado de cada celda de la grilla, en píxeles
+GRID_CELL_SIZE = 50
+# Distancia máxima (Manhattan) a un extremo para tomarlo con el clic
+POINT_MARGIN = 8
+# Distancia máxima al segmento para tomar la recta con el clic
+LINE_MARGIN = 5
+
+
+class SegmentGrid:
+    """Grilla uniforme con los extremos y los segmentos de las rectas, actualizable recta por recta."""
+
+    def __init__(self, cell_size=GRID_CELL_SIZE, point_margin=POINT_MARGIN, line_margin=LINE_MARGIN):
+        self.cell_size = cell_size
+        self.point_margin = point_margin
+        self.line_margin = line_margin
+        self.reset(np.zeros((0, 2, 2)))
+
+    def reset(self, lines):
+        """Reemplaza todas las rectas (K, 2, 2)."""
+        self.lines = np.array(lines, dtype=float).reshape(-1, 2, 2)
+        self.segment_cells = {}  # celda -> índices de las rectas que pasan cerca
+        self.point_cells = {}  # celda -> (índice de la recta, índice del extremo)
+        self.cells_of_line = {}  # índice -> (celdas del segmento, celdas de los extremos)
+        for index in range(len(self.lines)):
+            self._insert(index)
+
+    def update_line(self, index, segment):
+        """Mueve una recta en la grilla: solo se tocan las celdas de su posición anterior y de la nueva."""
+        segment = np.asarray(segment, dtype=float)
+        if np.array_equal(self.lines[index], segment):
+            return
+        self._remove(index)
+        self.lines[index] = segment
+        self._insert(index)
+
+    def sync(self, lines):
+        """Alinea la grilla con las rectas actuales; si cambió la cantidad de rectas se rearma."""
+        lines = np.asarray(lines, dtype=float).reshape(-1, 2, 2)
+        if len(lines) != len(self.lines):
+            self.reset(lines)
+            return
+        for index in np.flatnonzero(np.any(lines != self.lines, axis=(1, 2))):
+            self.update_line(int(index), lines[index])
+
+    def _cell(self, x, y):
+        return (floor(x / self.cell_size), floor(y / self.cell_size))
+
+    def _segment_cells(self, segment):
+        """Celdas a menos de line_margin del segmento, recorriendo una columna de la grilla a la vez."""
+        (x1, y1), (x2, y2) = segment
+        size, margin = self.cell_size, self.line_margin
+        low, high = min(x1, x2), max(x1, x2)
+        cells = []
+        for column in range(floor((low - margin) / size), floor((high + margin) / size) + 1):
+            # Tramo del segmento que puede quedar a menos del margen de esta columna
+            left = max(low, column * size - margin)
+            right = min(high, (column + 1) * size + margin)
+            if x1 == x2:
+                ys = (y1, y2)
+            else:
+                slope = (y2 - y1) / (x2 - x1)
+                ys = (y1 + (left - x1) * slope, y1 + (right - x1) * slope)
+            first, last = floor((min(ys) - margin) / size), floor((max(ys) + margin) / size)
+            cells.extend((column, row) for row in range(first, last + 1))
+        return cells
+
+    def _insert(self, index):
+        segment_cells = self._segment_cells(self.lines[index])
+        for cell in segment_cells:
+            self.segment_cells.setdefault(cell, set()).add(index)
+        point_cells = [self._cell(x, y) for x, y in self.lines[index]]
+        for point_index, cell in enumerate(point_cells):
+            self.point_cells.setdefault(cell, set()).add((index, point_index))
+        self.cells_of_line[index] = (segment_cells, point_cells)
+
+    def _remove(self, index):
+        segment_cells, point_cells = self.cells_of_line.pop(index)
+        for cell in segment_cells:
+            members = self.segment_cells[cell]
+            members.discard(index)
+            if not members:
+                del self.segment_cells[cell]
+        for point_index, cell in enumerate(point_cells):
+            members = self.point_cells[cell]
+            members.discard((index, point_index))
+            if not members:
+                del self.point_cells[cell]
+
+    def points_near(self, x, y):
+        """Extremos a menos de point_margin (Manhattan) del punto, del más cercano al más lejano.
+
+        Devuelve [(índice de la recta, índice del extremo), ...].
+        """
+        margin = self.point_margin
+        (left, top), (right, bottom) = self._cell(x - margin, y - margin), self._cell(x + margin, y + margin)
+        found = []
+        for column in range(left, right + 1):
+            for row in range(top, bottom + 1):
+                for index, point_index in self.point_cells.get((column, row), ()):
+                    px, py = self.lines[index, point_index]
+                    distance = abs(px - x) + abs(py - y)
+                    if distance <= margin:
+                        found.append((distance, index, point_index))
+        return [(index, point_index) for _, index, point_index in sorted(found)]
+
+    def lines_near(self, x, y):
+        """Rectas a menos de line_margin del punto según la distancia real al segmento, de la más cercana a la más lejana."""
+        candidates = sorted(self.segment_cells.get(self._cell(x, y), ()))
+        if not candidates:
+            return []
+        distances = geometry.point_segment_distance([(x, y)], self.lines[candidates])[0]
+        order = np.argsort(distances, kind="stable")
+        return [candidates[i] for i in order if distances[i] <= self.line_margin]
@@ -0,0 +1,38 @@
+import json
+import os
+import platform
+import time
+from detector_tuning import SETTINGS_DIR
+
+# Historial de arranques, una línea JSON por sesión, para seguir regresiones
+STARTUP_LOG = os.path.join(SETTINGS_DIR, "arranques.jsonl")
+
+
+class StartupTimer:
+    """Mide en ms desde el inicio del programa hasta cada etapa del arranque.
+
+    Las etapas que registra main.py son "imports" (módulos de la interfaz
+    importados), "first_window" (primera ventana visible) y "model_ready"
+    (modelo de emociones construido en el proceso de inferencia).
+    """
+
+    def __init__(self, started=None):
+        self.started = started if started is not None else time.perf_counter()
+        self.marks = {}
+        self.details = {}
+
+    def mark(self, stage):
+        self.marks[stage] = (time.perf_counter() - self.started) * 1000
+
+    def report(self):
+        return {"stages_ms": dict(self.marks), **self.details}
+
+    def save(self, path=STARTUP_LOG):
+        """Agrega el reporte de esta sesión al historial de arranques."""
+        entry = {"measured_at": time.strftime("%Y-%m-%d %H:%M:%S"), "host": platform.node(), **self.report()}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"No se pudo guardar el reporte de arranque: {e}")
@@ -0,0 +1,85 @@
+"""Versiones escalares, par por par, de las reglas originales de DrawingArea para comparar con las vectorizadas."""
+import numpy as np
+
+
+def random_configurations(count, lines, seed, step=50, cells=6):
+    """Configuraciones (count, lines, 2, 2) sobre una grilla gruesa: abundan paralelas, verticales y extremos compartidos."""
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, cells + 1, size=(count, lines, 2, 2)).astype(float) * step
+
+
+def calculate_slope(line):
+    (x1, y1), (x2, y2) = line
+    if x2 - x1 == 0:
+        return None
+    return round((y2 - y1) / (x2 - x1), 2)
+
+
+def calculate_intersection(line1, line2):
+    (x1, y1), (x2, y2) = line1
+    (x3, y3), (x4, y4) = line2
+    denominator = (x1 - x2) * (y3 - y4) - (y1 - y2) * (x3 - x4)
+    if denominator == 0:
+        return None
+    px = ((x1 * y2 - y1 * x2) * (x3 - x4) - (x1 - x2) * (x3 * y4 - y3 * x4)) / denominator
+    py = ((x1 * y2 - y1 * x2) * (y3 - y4) - (y1 - y2) * (x3 * y4 - y3 * x4)) / denominator
+    if not (min(x1, x2) <= px <= max(x1, x2) and min(y1, y2) <= py <= max(y1, y2)):
+        return None
+    if not (min(x3, x4) <= px <= max(x3, x4) and min(y3, y4) <= py <= max(y3, y4)):
+        return None
+    return (int(round(px)), int(round(py)))
+
+
+def check_intersection(line1, line2):
+    p1, q1 = line1
+    p2, q2 = line2
+
+    def orientation(p, q, r):
+        val = (q[1] - p[1]) * (r[0] - q[0]) - (q[0] - p[0]) * (r[1] - q[1])
+        if val == 0:
+            return 0
+        return 1 if val > 0 else 2
+
+    def on_segment(p, q, r):
+        return min(p[0], r[0]) <= q[0] <= max(p[0], r[0]) and min(p[1], r[1]) <= q[1] <= max(p[1], r[1])
+
+    o1, o2 = orientation(p1, q1, p2), orientation(p1, q1, q2)
+    o3, o4 = orientation(p2, q2, p1), orientation(p2, q2, q1)
+    return (
+        (o1 != o2 and o3 != o4)
+        or (o1 == 0 and on_segment(p1, p2, q1))
+        or (o2 == 0 and on_segment(p1, q2, q1))
+        or (o3 == 0 and on_segment(p2, p1, q2))
+        or (o4 == 0 and on_segment(p2, q1, q2))
+    )
+
+
+def as_tuples(lines):
+    return [tuple(tuple(float(value) for value in point) for point in line) for line in np.asarray(lines)]
+
+
+def direction_counts(lines):
+    lines = as_tuples(lines)
+    slopes = [calculate_slope(line) for line in lines]
+    parallel = coincident = 0
+    for i in range(len(lines)):
+        for j in range(i + 1, len(lines)):
+            if slopes[i] == slopes[j]:
+                if lines[i] == lines[j]:
+                    coincident += 1
+                else:
+                    parallel += 1
+    return parallel, coincident
+
+
+def touching_pairs(lines):
+    lines = as_tuples(lines)
+    return [(i, j) for i in range(len(lines)) for j in range(i + 1, len(lines)) if check_intersection(lines[i], lines[j])]
+
+
+def point_segment_distance(point, line):
+    (x, y), ((x1, y1), (x2, y2)) = point, line
+    dx, dy = x2 - x1, y2 - y1
+    squared = dx * dx + dy * dy
+    t = 0.0 if squared == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / squared))
+    return float(np.hypot(x - (x1 + t * dx), y - (y1 + t * dy)))
@@ -0,0 +1,13 @@
+HORIZONTAL = ((0, 200), (400, 200))
+DIAGONAL = ((0, 0), (400, 400))
+
+# Un dibujo correcto de cada caso, en píxeles del área de dibujo
+DRAWINGS = {
+    1: [((0, 100), (400, 100)), HORIZONTAL, ((0, 300), (400, 300))],
+    2: [((0, 100), (400, 100)), ((0, 300), (400, 300)), ((200, 0), (200, 400))],
+    3: [DIAGONAL, DIAGONAL, ((0, 400), (400, 0))],
+    4: [DIAGONAL, DIAGONAL, ((100, 0), (500, 400))],
+    5: [DIAGONAL, ((0, 400), (400, 0)), HORIZONTAL],
+    6: [((0, 0), (400, 0)), ((0, 0), (200, 400)), ((400, 0), (200, 400))],
+    7: [DIAGONAL, DIAGONAL, DIAGONAL],
+}
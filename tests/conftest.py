@@ -0,0 +1,4 @@
+import os
+
+# Las pruebas que crean widgets corren sin pantalla
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from case_drawings import DIAGONAL, DRAWINGS, HORIZONTAL
+from case_grading import (
+    CASE_SIGNATURES, EXPECTED_VECTORS, case_for_signature, case_signatures, drawn_vectors, grade_file,
+)
+
+
+def drawn_case(lines):
+    return case_for_signature(case_signatures(lines)[0], len(lines))
+
+
+@pytest.mark.parametrize("case", sorted(DRAWINGS))
+def test_each_correct_drawing_forms_its_own_case(case):
+    assert drawn_case(DRAWINGS[case]) == case
+
+
+def test_every_case_has_a_distinct_signature_and_vector():
+    assert sorted(CASE_SIGNATURES) == sorted(EXPECTED_VECTORS)
+    assert len(set(CASE_SIGNATURES.values())) == len(CASE_SIGNATURES)
+
+
+def test_all_drawings_in_one_vectorized_call():
+    numbers = sorted(DRAWINGS)
+    signatures = case_signatures(np.array([DRAWINGS[number] for number in numbers], dtype=float))
+    assert [case_for_signature(signature) for signature in signatures] == numbers
+
+
+def test_drawn_vectors_measure_the_lines_not_the_case():
+    numbers = sorted(DRAWINGS)
+    vectors = drawn_vectors(np.array([DRAWINGS[number] for number in numbers], dtype=float))
+    # (rectas con la dirección de otra, puntos de intersección distintos, punto común a las tres)
+    assert [tuple(vector) for vector in vectors] == [
+        (3, 0, 0), (2, 2, 0), (2, 1, 1), (3, 0, 0), (0, 1, 1), (0, 3, 0), (3, 0, 1),
+    ]
+    # Un dibujo que no forma ningún caso también tiene su vector
+    short = [((0, 100), (400, 100)), ((0, 300), (400, 300)), ((200, 0), (200, 200))]
+    assert tuple(drawn_vectors([short])[0]) == (2, 1, 0)
+
+
+def test_vertical_lines_and_segments_that_do_not_reach():
+    vertical = [((100, 0), (100, 400)), ((300, 0), (300, 400)), HORIZONTAL]
+    assert drawn_case(vertical) == 2
+    # La secante no llega a la segunda paralela: solo hay un punto de intersección
+    short = [((0, 100), (400, 100)), ((0, 300), (400, 300)), ((200, 0), (200, 200))]
+    assert drawn_case(short) is None
+
+
+def test_only_three_line_systems_are_cases():
+    assert drawn_case([DIAGONAL, ((0, 400), (400, 0))]) is None  # Dos secantes no son el Caso 5
+    assert drawn_case(DRAWINGS[1] + [((0, 400), (400, 400))]) is None
+
+
+def test_grade_file_reads_saved_cases(tmp_path):
+    path = tmp_path / "ana.txt"
+    with open(path, "w") as file:
+        for number in (3, 6):
+            file.write(f"Caso {number}:\n")
+            for (x1, y1), (x2, y2) in DRAWINGS[number]:
+                file.write(f"({x1}, {y1}) -> ({x2}, {y2})\n")
+            rp1, rp2, rp3 = EXPECTED_VECTORS[number]
+            file.write(f"Respuestas: RP1={rp1}, RP2={rp2}, RP3={rp3}\n\n")
+        file.write("Caso 5:\n")
+        for (x1, y1), (x2, y2) in DRAWINGS[1]:
+            file.write(f"({x1}, {y1}) -> ({x2}, {y2})\n")
+
+    result = grade_file(str(path))
+
+    graded = {case["case"]: case for case in result["cases"]}
+    assert graded[3]["drawing_ok"] and graded[3]["answers_ok"] and graded[3]["answers_match_drawing"]
+    assert graded[3]["expected_matches_drawing"]
+    # Tres secantes dos a dos: tres puntos de intersección medidos, aunque la respuesta esperada diga dos
+    assert graded[6]["drawing_ok"] and graded[6]["drawn_vector"] == (0, 3, 0)
+    assert not graded[6]["expected_matches_drawing"] and not graded[6]["answers_match_drawing"]
+    assert not graded[5]["drawing_ok"]
+    assert graded[5]["drawn_case"] == 1 and graded[5]["drawn_vector"] == (3, 0, 0)
+    assert graded[5]["answers"] is None and graded[5]["answers_match_drawing"] is None
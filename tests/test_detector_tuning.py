@@ -0,0 +1,35 @@
+import detector_tuning
+from detector_tuning import choose_detector, load_tuned_detector, load_tuning, tuning_needed
+
+
+def stats(p95_ms, detection_rate):
+    return {"p50_ms": p95_ms / 2, "p95_ms": p95_ms, "p99_ms": p95_ms, "detection_rate": detection_rate, "images": 10}
+
+
+def test_choose_detector_prefers_fastest_within_budget():
+    results = {"opencv": stats(40, 0.85), "ssd": stats(30, 0.9), "retinaface": stats(900, 1.0)}
+    assert choose_detector(results, latency_budget=150) == "ssd"
+
+
+def test_choose_detector_falls_back_to_default_when_over_budget():
+    results = {"opencv": stats(400, 0.7), "retinaface": stats(3000, 1.0)}
+    assert choose_detector(results, latency_budget=150) is None
+
+
+def test_over_budget_result_is_not_used(tmp_path):
+    path = tmp_path / "detector.json"
+    detector_tuning.save_tuning(None, {"retinaface": stats(3000, 1.0)}, str(path), status="over_budget")
+    assert load_tuned_detector(str(path)) is None
+    assert not tuning_needed(str(tmp_path / "sin_imagenes"), str(path))
+
+
+def test_missing_images_are_cached_without_tuning(tmp_path):
+    path = str(tmp_path / "detector.json")
+    folder = tmp_path / "rostros"
+    assert not tuning_needed(str(folder), path)
+    assert load_tuning(path)["status"] == "no_images"
+
+    # Al agregar imágenes se vuelve a medir
+    folder.mkdir()
+    (folder / "rostro.png").write_bytes(b"")
+    assert tuning_needed(str(folder), path)
@@ -0,0 +1,138 @@
+from types import SimpleNamespace
+import numpy as np
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+from activity_monitor import ActiveClock
+import emotion_detection
+from emotion_detection import (
+    CAMERA_IDLE_RELEASE_MS, EmotionWorker, check_model_warmup, detect_emotion, pause_emotion_detection,
+    resume_emotion_detection,
+)
+from inference_process import EmotionRecord
+from pipeline_metrics import PipelineMetrics
+
+app = QApplication.instance() or QApplication([])
+
+
+class BrokenCamera:
+    def acquire_latest(self):
+        raise OSError("memoria compartida no disponible")
+
+
+class StillCamera:
+    def acquire_latest(self):
+        return SimpleNamespace(frame=np.zeros((48, 64, 3), dtype=np.uint8), slot=0, timestamp=1.0)
+
+    def release_slot(self, slot):
+        pass
+
+
+class TimedInference:
+    def analyze(self, handle):
+        timings = {"crop": 5.0, "downscale": 1.0, "locate": 7.0, "classify": 9.0}
+        return EmotionRecord(1, handle.timestamp, None, "neutral", None, timings=timings)
+
+
+def test_exception_in_worker_is_reported_as_detection_error():
+    metrics = PipelineMetrics()
+    worker = EmotionWorker(BrokenCamera(), None, metrics)
+    errors = []
+    worker.detection_failed.connect(errors.append)
+
+    worker.process()  # No debe propagar la excepción fuera del slot
+
+    assert len(errors) == 1
+    assert "memoria compartida no disponible" in errors[0]
+    assert metrics.snapshot()["counters"]["inference_errors"] == 1
+
+
+def test_pause_keeps_the_camera_open_for_the_idle_delay():
+    widget = SimpleNamespace(
+        detection_active=True, detection_paused=False, paused_since=None,
+        active_clock=ActiveClock(), timer=QTimer(), camera_idle_timer=QTimer(),
+    )
+    widget.camera_idle_timer.setSingleShot(True)
+
+    pause_emotion_detection(widget, "inactivo")
+
+    assert widget.detection_paused
+    assert widget.camera_idle_timer.isActive()
+    assert widget.camera_idle_timer.interval() == CAMERA_IDLE_RELEASE_MS
+    widget.camera_idle_timer.stop()
+
+
+def test_failed_camera_reopen_leaves_detection_stopped():
+    statuses = []
+    widget = SimpleNamespace(
+        detection_active=True, detection_paused=False, paused_since=None, detection_gaps=[],
+        active_clock=ActiveClock(), timer=QTimer(), camera_idle_timer=QTimer(),
+        camera=SimpleNamespace(open=lambda: False), show_detection_status=statuses.append,
+    )
+    pause_emotion_detection(widget, "ventana")
+
+    resume_emotion_detection(widget)
+
+    assert not widget.detection_active and not widget.detection_paused
+    assert not widget.timer.isActive() and not widget.camera_idle_timer.isActive()
+    assert len(widget.detection_gaps) == 1
+    assert statuses and "cámara" in statuses[0]
+
+
+def test_child_timings_do_not_mix_with_worker_stages():
+    metrics = PipelineMetrics()
+    worker = EmotionWorker(StillCamera(), TimedInference(), metrics)
+    worker.presence_gate = SimpleNamespace(face_present=lambda frame: True)
+
+    worker.process()
+
+    stages = metrics.snapshot()["stages"]
+    assert stages["preprocess"]["count"] == 1
+    assert stages["preprocess"]["max_ms"] < 5.0  # Solo el recorte del hilo de trabajo
+    assert stages["child_preprocess"]["max_ms"] == 6.0
+    assert stages["child_face_detection"]["max_ms"] == 7.0
+    assert stages["child_classification"]["max_ms"] == 9.0
+
+
+class GaveUpInference:
+    ready = False
+    gave_up = True
+    failures = 5
+
+    def poll_ready(self):
+        return False
+
+    def health(self):
+        return {"alive": False}
+
+    def ensure_started(self):
+        return False  # Como InferenceProcess: ya no arranca otro proceso
+
+
+def test_detection_stops_retrying_after_the_process_gives_up():
+    statuses = []
+    widget = SimpleNamespace(
+        emotion_worker=object(), inference=GaveUpInference(), timer=QTimer(), warmup_timer=QTimer(),
+        emotion_in_flight=0, detector_tuner=None, show_detection_status=statuses.append,
+    )
+    widget.timer.start(1000)
+    widget.warmup_timer.start(1000)
+
+    check_model_warmup(widget)
+    assert not widget.warmup_timer.isActive()
+    detect_emotion(widget)
+    assert not widget.timer.isActive()  # Ni el sondeo del modelo ni los ticks de detección siguen corriendo
+    assert statuses and all("falló 5 veces" in status for status in statuses)
+
+
+def test_startup_does_not_tune_the_detector_unless_enabled(monkeypatch):
+    def tuning_needed():
+        raise AssertionError("el ajuste del detector no se pidió")
+
+    monkeypatch.setattr(emotion_detection, "tuning_needed", tuning_needed)
+    widget = SimpleNamespace(
+        emotion_worker=object(), warmup_timer=QTimer(), tuning_checked=False, show_detection_status=lambda text: None,
+        inference=SimpleNamespace(gave_up=False, ensure_started=lambda: True),
+    )
+    emotion_detection.start_model_warmup(widget)
+    widget.warmup_timer.stop()
+    assert not widget.tuning_checked
@@ -0,0 +1,87 @@
+import numpy as np
+import brute_force
+import geometry
+
+CONFIGURATIONS = brute_force.random_configurations(300, 4, seed=21)
+
+
+def test_slopes_match_calculate_slope():
+    slopes = geometry.slopes(CONFIGURATIONS)
+    for config, row in zip(CONFIGURATIONS, slopes):
+        for line, slope in zip(brute_force.as_tuples(config), row):
+            expected = brute_force.calculate_slope(line)
+            assert (np.isnan(slope) and expected is None) or slope == expected
+
+
+def test_direction_counts_match_pairwise_loop():
+    parallel, coincident = geometry.direction_counts(CONFIGURATIONS)
+    for index, config in enumerate(CONFIGURATIONS):
+        assert (parallel[index], coincident[index]) == brute_force.direction_counts(config)
+
+
+def test_intersection_points_match_calculate_intersection():
+    points = geometry.intersection_points(CONFIGURATIONS)
+    for config, matrix in zip(CONFIGURATIONS, points):
+        lines = brute_force.as_tuples(config)
+        for i in range(len(lines)):
+            for j in range(len(lines)):
+                if i == j:
+                    continue
+                expected = brute_force.calculate_intersection(lines[i], lines[j])
+                if expected is None:
+                    assert np.isnan(matrix[i, j]).all()
+                else:
+                    assert tuple(matrix[i, j]) == expected
+
+
+def test_segments_intersect_matches_orientation_test():
+    touching = geometry.segments_intersect(CONFIGURATIONS)
+    counts = geometry.intersection_counts(CONFIGURATIONS)
+    for config, matrix, count in zip(CONFIGURATIONS, touching, counts):
+        lines = brute_force.as_tuples(config)
+        for i in range(len(lines)):
+            for j in range(len(lines)):
+                if i != j:
+                    assert matrix[i, j] == brute_force.check_intersection(lines[i], lines[j])
+        assert count == len(brute_force.touching_pairs(config))
+
+
+def test_common_point_matches_first_three_lines():
+    common = geometry.common_point(CONFIGURATIONS)
+    for config, point in zip(CONFIGURATIONS, common):
+        lines = brute_force.as_tuples(config)
+        p12 = brute_force.calculate_intersection(lines[0], lines[1])
+        p13 = brute_force.calculate_intersection(lines[0], lines[2])
+        if p12 is not None and p12 == p13:
+            assert tuple(point) == (round(p12[0] / 100, 2), round(p12[1] / 100, 2))
+        else:
+            assert np.isnan(point).all()
+
+
+def test_point_segment_distance_matches_scalar_projection():
+    rng = np.random.default_rng(7)
+    points = rng.uniform(-50, 350, size=(40, 2))
+    lines = CONFIGURATIONS[0]
+    distances = geometry.point_segment_distance(points, lines)
+    for p, point in enumerate(points):
+        for k, line in enumerate(brute_force.as_tuples(lines)):
+            assert np.isclose(distances[p, k], brute_force.point_segment_distance(point, line))
+
+
+def test_distinct_points_and_concurrency_match_pairwise_loop():
+    # Tres rectas sobre una grilla de 3x3: abundan las concurrentes y las coincidentes
+    configurations = brute_force.random_configurations(3000, 3, seed=22, step=100, cells=2)
+    counts = geometry.distinct_intersection_counts(configurations)
+    concurrent = geometry.concurrent(configurations)
+    assert concurrent.any() and not concurrent.all()
+    for config, count, together in zip(configurations, counts, concurrent):
+        lines = brute_force.as_tuples(config)
+        points = {}
+        for i in range(len(lines)):
+            for j in range(i + 1, len(lines)):
+                point = brute_force.calculate_intersection(lines[i], lines[j])
+                if point is not None:
+                    points.setdefault(point, set()).update((i, j))
+        assert count == len(points)
+        same = all(line == lines[0] for line in lines)
+        assert together == (same or (len(points) == 1 and len(next(iter(points.values()))) == len(lines)))
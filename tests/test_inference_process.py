@@ -0,0 +1,130 @@
+import os
+import queue
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+import inference_process
+from camera_capture import SharedFrameRing
+from inference_process import InferenceProcess, MAX_CONSECUTIVE_FAILURES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_ready(inference, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not inference.poll_ready() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return inference.ready
+
+
+def test_recycled_process_is_not_ready_until_it_warms_up_again():
+    # Un backend inexistente responde el aviso de arranque con el error, sin cargar ningún modelo
+    inference = InferenceProcess(backend="inexistente", max_rss_mb=0, budget={})
+    try:
+        inference.ensure_started()
+        assert wait_ready(inference)
+        assert inference.warmup_error is not None
+
+        inference._check_memory()  # Supera el tope de memoria: se recicla
+
+        assert inference.recycles == 1
+        assert inference.process is None
+        assert not inference.ready
+        assert not inference.health()["ready"]
+
+        inference.ensure_started()
+        assert not inference.ready
+        assert wait_ready(inference)
+    finally:
+        inference.shutdown()
+    assert not inference.ready
+
+
+class ConstantBackend:
+    def warm_up(self):
+        pass
+
+    def classify_frame(self, image):
+        return {"neutral": 1.0}
+
+
+def test_bad_ring_or_slot_is_answered_with_an_error_record(monkeypatch):
+    monkeypatch.setattr(inference_process, "create_backend", lambda name, **options: ConstantBackend())
+    monkeypatch.setattr(inference_process, "TRACKING_ENABLED", False)
+    monkeypatch.setattr(inference_process, "dominant_emotion", lambda probabilities: "neutral")
+    ring = SharedFrameRing(2, (8, 8, 3), np.uint8)
+    requests, results = queue.Queue(), queue.Queue()
+    try:
+        requests.put((1, ("anillo-inexistente", (2, 8, 8, 3), "|u1"), 0, 1.0))  # La cámara ya lo liberó
+        requests.put((2, ring.descriptor(), 0, 2.0))
+        requests.put((3, ring.descriptor(), 9, 3.0))  # Slot fuera del anillo
+        requests.put(None)
+        inference_process._inference_main(requests, results, {}, "constante", {}, {})
+    finally:
+        ring.close()
+
+    records = [results.get_nowait() for _ in range(4)]
+    assert [record.request_id for record in records] == [0, 1, 2, 3]
+    assert records[1].error is not None and records[1].probabilities is None
+    assert records[2].error is None and records[2].dominant_emotion == "neutral"
+    assert records[3].error is not None
+
+
+def test_inference_loop_does_not_import_qt():
+    # El bucle del proceso hijo se ejecuta completo (arranque y fin) en un intérprete limpio
+    code = (
+        "import queue, sys\n"
+        "from inference_process import _inference_main\n"
+        "requests, results = queue.Queue(), queue.Queue()\n"
+        "requests.put(None)\n"
+        "_inference_main(requests, results, {}, 'inexistente', {}, {})\n"
+        "sys.exit('PyQt6' in sys.modules)\n"
+    )
+    assert subprocess.run([sys.executable, "-c", code], cwd=ROOT).returncode == 0
+
+
+class CrashingProcess:
+    """Proceso que muere apenas arranca, como un hijo que se cae al cargar el modelo."""
+
+    started = 0
+    pid = None
+
+    def __init__(self, **kwargs):
+        pass
+
+    def start(self):
+        CrashingProcess.started += 1
+
+    def is_alive(self):
+        return False
+
+    def join(self, timeout=None):
+        pass
+
+
+def test_crashing_process_is_restarted_with_backoff_and_then_given_up(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(inference_process, "time", SimpleNamespace(monotonic=lambda: clock[0], time=time.time))
+    monkeypatch.setattr(CrashingProcess, "started", 0)
+    inference = InferenceProcess(backend="inexistente", budget={})
+    inference.context = SimpleNamespace(Queue=queue.Queue, Process=CrashingProcess)
+
+    assert inference.ensure_started()
+    waits = []
+    while not inference.gave_up:
+        assert not inference.ensure_started()  # Registra la caída y espera antes de reintentar
+        if inference.gave_up:
+            break
+        waits.append(inference.retry_delay())
+        clock[0] += inference.retry_delay()
+        assert inference.ensure_started()
+    assert waits == [1.0, 2.0, 4.0, 8.0][:MAX_CONSECUTIVE_FAILURES - 1]
+    assert CrashingProcess.started == MAX_CONSECUTIVE_FAILURES
+
+    clock[0] += 3600
+    assert not inference.ensure_started()
+    assert CrashingProcess.started == MAX_CONSECUTIVE_FAILURES
+    record = inference.analyze(SimpleNamespace(timestamp=1.0))
+    assert record.error is not None and record.probabilities is None
@@ -0,0 +1,64 @@
+import numpy as np
+import brute_force
+import line_sweep
+
+SYSTEMS = list(brute_force.random_configurations(12, 40, seed=24, step=25, cells=12))
+
+
+def boxes_overlap(first, second):
+    (x1, y1), (x2, y2) = first
+    (x3, y3), (x4, y4) = second
+    return (min(x1, x2) <= max(x3, x4) and min(x3, x4) <= max(x1, x2)
+            and min(y1, y2) <= max(y3, y4) and min(y3, y4) <= max(y1, y2))
+
+
+def test_candidate_pairs_keep_every_touching_pair_inside_overlapping_boxes():
+    for lines in SYSTEMS:
+        tuples = brute_force.as_tuples(lines)
+        candidates = [tuple(pair) for pair in line_sweep.candidate_pairs(lines)]
+        assert candidates == sorted(set(candidates))
+        assert set(brute_force.touching_pairs(lines)) <= set(candidates)
+        assert all(boxes_overlap(tuples[i], tuples[j]) for i, j in candidates)
+
+
+def test_long_parallel_lines_that_only_share_x_are_pruned():
+    count = 200
+    offsets = np.arange(count) * 10.0
+    lines = np.stack([np.stack([np.zeros(count), offsets], axis=1),
+                      np.stack([np.full(count, 1000.0), offsets + 500], axis=1)], axis=1)
+    candidates = line_sweep.candidate_pairs(lines)
+    assert len(candidates) < 10 * count  # Las cajas se superponen en casi todos los n²/2 pares
+    assert line_sweep.count_intersections(lines) == 0
+
+    # Un abanico de rectas por un mismo punto: todos los pares se tocan y todos son candidatos
+    fan = np.stack([np.zeros((count, 2)), np.stack([np.full(count, 1000.0), offsets], axis=1)], axis=1)
+    assert line_sweep.count_intersections(fan) == count * (count - 1) // 2
+
+
+def test_touching_pairs_match_all_pairs_orientation_test():
+    for lines in SYSTEMS:
+        expected = brute_force.touching_pairs(lines)
+        assert [tuple(pair) for pair in line_sweep.touching_pairs(lines)] == expected
+        assert line_sweep.count_intersections(lines) == len(expected)
+
+
+def test_intersection_points_match_calculate_intersection():
+    for lines in SYSTEMS:
+        tuples = brute_force.as_tuples(lines)
+        pairs, points = line_sweep.intersections(lines)
+        for (i, j), point in zip(pairs, points):
+            expected = brute_force.calculate_intersection(tuples[i], tuples[j])
+            if expected is None:
+                assert np.isnan(point).all()  # Colineales que se superponen: se tocan sin un único punto
+            else:
+                assert tuple(point) == expected
+
+
+def test_direction_counts_match_pairwise_loop():
+    for lines in SYSTEMS:
+        assert line_sweep.direction_counts(lines) == brute_force.direction_counts(lines)
+
+
+def test_empty_and_single_line_systems():
+    assert len(line_sweep.candidate_pairs(np.zeros((0, 2, 2)))) == 0
+    assert line_sweep.count_intersections([((0, 0), (10, 10))]) == 0
@@ -0,0 +1,52 @@
+import numpy as np
+import brute_force
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtWidgets import QApplication
+from case_grading import EXPECTED_VECTORS, case_signatures
+from drawing_area import DrawingArea
+from case_drawings import DRAWINGS
+from live_case import LiveCaseClassifier
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_live_classifier_uses_the_grading_rules():
+    for case, lines in DRAWINGS.items():
+        live = LiveCaseClassifier(lines)
+        assert live.case() == case
+        assert live.vector() == EXPECTED_VECTORS[case]
+
+
+def test_incremental_updates_match_a_full_recompute():
+    rng = np.random.default_rng(23)
+    for lines in brute_force.random_configurations(40, 3, seed=23, step=100, cells=3):
+        live = LiveCaseClassifier(lines)
+        live.refresh()
+        for _ in range(5):
+            index = int(rng.integers(0, 3))
+            lines[index] = rng.integers(0, 4, size=(2, 2)) * 100
+            live.update_line(index, lines[index])
+            assert live.signature() == tuple(int(value) for value in case_signatures(lines)[0])
+
+
+def test_success_waits_for_the_first_edit_of_generated_lines():
+    area = DrawingArea()
+    area.set_current_configuration(1)  # Tres paralelas generadas: ya forman el Caso 1
+    assert "Mueve las rectas" in area.case_label.text()
+
+    area.move_line(2, QPoint(0, 40))
+    assert area.line_edits[1] == 1
+    assert "¡Formaste el Caso 1!" in area.case_label.text()
+
+    area.move_line(2, QPoint(0, -40))  # De vuelta a la posición inicial: ya hubo un cambio
+    assert "¡Formaste el Caso 1!" in area.case_label.text()
+
+
+def test_reopened_saved_case_is_not_held_back():
+    area = DrawingArea()
+    area.configurations = {
+        1: [([QPoint(*start), QPoint(*end)], Qt.GlobalColor.blue) for start, end in DRAWINGS[1]],
+    }
+    area.set_current_configuration(1)  # Rectas guardadas en otra sesión
+    assert "¡Formaste el Caso 1!" in area.case_label.text()
+    assert not area.line_edits
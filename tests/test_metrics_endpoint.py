@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+from PyQt6.QtWidgets import QApplication
+from metrics_endpoint import render_metrics
+from pipeline_metrics import PipelineMetrics
+from ui_latency import UiLatencyProbe
+
+app = QApplication.instance() or QApplication([])
+
+
+def fake_widget(probe):
+    camera = SimpleNamespace(stats=lambda: {"fps": 30.0, "frames_captured": 10, "dropped_frames": 0, "frame_age_ms": 5.0})
+    inference = SimpleNamespace(rss_mb=lambda: None, restarts=0, recycles=0)
+    return SimpleNamespace(metrics=PipelineMetrics(), camera=camera, inference=inference, ui_probe=probe)
+
+
+def sample_value(text, prefix):
+    return [float(line.split()[-1]) for line in text.splitlines() if line.startswith(prefix)]
+
+
+def test_summary_count_and_sum_keep_growing_past_the_window():
+    probe = UiLatencyProbe()
+    window = len(probe.paint_durations.values)
+    for _ in range(window + 500):
+        probe.record_paint(2.0)
+
+    text = render_metrics(fake_widget(probe))
+
+    assert sample_value(text, "tutor_paint_event_seconds_count ") == [window + 500]
+    assert sample_value(text, "tutor_paint_event_seconds_sum ") == [(window + 500) * 0.002]
+    assert probe.report()["paint_event"]["samples"] == window
@@ -0,0 +1,67 @@
+import json
+import os
+import model_cache
+
+
+def store(tmp_path, backend, content):
+    source = tmp_path / f"{backend}.onnx"
+    source.write_bytes(content)
+    return model_cache.store_model(str(source), version="1.0", backend=backend, cache_dir=str(tmp_path / "cache"))
+
+
+def test_int8_build_is_found_without_naming_the_format(tmp_path):
+    int8 = store(tmp_path, model_cache.INT8_CACHE_FORMAT, b"int8")
+    assert model_cache.cached_model_path(version="1.0", cache_dir=str(tmp_path / "cache")) is None
+    assert model_cache.find_cached_model(version="1.0", cache_dir=str(tmp_path / "cache")) == int8
+
+
+def test_lookup_prefers_int8_and_falls_back_to_float(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    full = store(tmp_path, model_cache.CACHE_FORMAT, b"float")
+    assert model_cache.find_cached_model(version="1.0", cache_dir=cache_dir) == full
+    int8 = store(tmp_path, model_cache.INT8_CACHE_FORMAT, b"int8")
+    assert model_cache.find_cached_model(version="1.0", cache_dir=cache_dir) == int8
+    formats = (model_cache.CACHE_FORMAT,)
+    assert model_cache.find_cached_model(formats, version="1.0", cache_dir=cache_dir) == full
+
+
+def test_hash_is_verified_once_and_rechecked_only_when_the_file_changes(tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    path = store(tmp_path, model_cache.CACHE_FORMAT, b"float")
+    digests = []
+    real_digest = model_cache.file_digest
+    monkeypatch.setattr(model_cache, "file_digest", lambda name: digests.append(name) or real_digest(name))
+
+    for _ in range(3):
+        assert model_cache.cached_model_path(version="1.0", cache_dir=cache_dir) == path
+    assert digests == []  # store_model dejó la marca de tamaño y fecha
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Mismo contenido, otra fecha
+    assert model_cache.cached_model_path(version="1.0", cache_dir=cache_dir) == path
+    assert model_cache.cached_model_path(version="1.0", cache_dir=cache_dir) == path
+    assert len(digests) == 1
+
+    with open(path, "wb") as file:
+        file.write(b"FLOAT")  # Mismo tamaño, contenido distinto
+    assert model_cache.cached_model_path(version="1.0", cache_dir=cache_dir) is None
+    assert not os.path.exists(os.path.dirname(path))
+    assert sorted(os.listdir(tmp_path / "cache")) == []
+
+
+def test_manifest_is_replaced_without_leftover_temporaries(tmp_path):
+    path = store(tmp_path, model_cache.CACHE_FORMAT, b"float")
+    store(tmp_path, model_cache.CACHE_FORMAT, b"float, otra vez")
+    entry = os.path.dirname(path)
+    assert sorted(os.listdir(entry)) == sorted([model_cache.MANIFEST_FILE, model_cache.MODEL_FILE])
+    with open(os.path.join(entry, model_cache.MANIFEST_FILE)) as file:
+        assert json.load(file)["verified"] == model_cache.file_stamp(path)
+
+
+def test_cached_model_is_preferred_over_deepface(monkeypatch):
+    import emotion_backends
+
+    monkeypatch.setattr(emotion_backends, "find_cached_model", lambda: "modelo.onnx")
+    assert emotion_backends.preferred_backend() == "onnx"
+    monkeypatch.setattr(emotion_backends, "find_cached_model", lambda: None)
+    assert emotion_backends.preferred_backend() == emotion_backends.EMOTION_BACKEND
@@ -0,0 +1,42 @@
+import numpy as np
+from emotion_detection import DISTRACTION_THRESHOLD, STRESS_THRESHOLD, EMOTION_WINDOW_SIZE, INTERVAL_LENGTH
+from rolling_stress import (
+    ABSENT_PROBABILITIES, EMOTION_LABELS, RollingStressWindow, probability_vector, stress_series,
+)
+
+
+def test_absent_only_window_is_in_distraction_band():
+    absences = np.tile(ABSENT_PROBABILITIES, (EMOTION_WINDOW_SIZE, 1))
+
+    window = RollingStressWindow(maxlen=EMOTION_WINDOW_SIZE)
+    for timestamp, probabilities in enumerate(absences):
+        window.append(probabilities, float(timestamp))
+    live = window.stress_level()
+    batch = stress_series(absences, maxlen=EMOTION_WINDOW_SIZE)[-1]
+
+    for level in (live, batch):
+        # notify() avisa de estrés con > STRESS_THRESHOLD y de distracción con > DISTRACTION_THRESHOLD
+        assert DISTRACTION_THRESHOLD < level < STRESS_THRESHOLD
+    assert live == batch
+
+
+def test_live_and_batch_windows_agree():
+    rng = np.random.default_rng(0)
+    emotions = rng.dirichlet(np.ones(len(EMOTION_LABELS) - 1), size=300) * 100
+    probabilities = np.array([
+        probability_vector(dict(zip(EMOTION_LABELS, row))) if i % 7 else ABSENT_PROBABILITIES
+        for i, row in enumerate(emotions)
+    ])
+    timestamps = np.cumsum(rng.uniform(1, 4, len(probabilities)))
+
+    count_window = RollingStressWindow(maxlen=EMOTION_WINDOW_SIZE)
+    age_window = RollingStressWindow(max_age=INTERVAL_LENGTH)
+    live_count, live_age = [], []
+    for probability, timestamp in zip(probabilities, timestamps):
+        count_window.append(probability, timestamp)
+        age_window.append(probability, timestamp)
+        live_count.append(count_window.stress_level())
+        live_age.append(age_window.stress_level())
+
+    np.testing.assert_allclose(live_count, stress_series(probabilities, maxlen=EMOTION_WINDOW_SIZE), atol=1e-9)
+    np.testing.assert_allclose(live_age, stress_series(probabilities, timestamps, max_age=INTERVAL_LENGTH), atol=1e-9)
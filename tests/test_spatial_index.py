@@ -0,0 +1,79 @@
+import numpy as np
+import brute_force
+from spatial_index import SegmentGrid
+
+
+def random_lines(rng, count):
+    lines = rng.uniform(0, 600, size=(count, 2, 2)).round()
+    lines[::7, 1, 0] = lines[::7, 0, 0]  # Verticales
+    lines[1::7, 1, 1] = lines[1::7, 0, 1]  # Horizontales
+    lines[2::11, 1] = lines[2::11, 0]  # Segmentos de un solo punto
+    return lines
+
+
+def query_points(rng, lines, count):
+    """Puntos junto a los segmentos y a los extremos, donde el clic sí toma algo, más algunos al azar."""
+    t = rng.uniform(0, 1, size=(count, 1))
+    chosen = lines[rng.integers(0, len(lines), size=count)]
+    along = chosen[:, 0] + t * (chosen[:, 1] - chosen[:, 0]) + rng.uniform(-7, 7, size=(count, 2))
+    ends = chosen[:, 0] + rng.uniform(-9, 9, size=(count, 2))
+    return np.concatenate([along, ends, rng.uniform(-20, 620, size=(count, 2))])
+
+
+def expected_points(grid, x, y):
+    found = []
+    for index, line in enumerate(grid.lines):
+        for point_index, (px, py) in enumerate(line):
+            distance = abs(px - x) + abs(py - y)
+            if distance <= grid.point_margin:
+                found.append((distance, index, point_index))
+    return [(index, point_index) for _, index, point_index in sorted(found)]
+
+
+def expected_lines(grid, x, y):
+    return {
+        index for index, line in enumerate(brute_force.as_tuples(grid.lines))
+        if brute_force.point_segment_distance((x, y), line) <= grid.line_margin
+    }
+
+
+def assert_matches_brute_force(grid, points):
+    for x, y in points:
+        assert grid.points_near(x, y) == expected_points(grid, x, y)
+        nearest = grid.lines_near(x, y)
+        assert set(nearest) == expected_lines(grid, x, y)
+        distances = [brute_force.point_segment_distance((x, y), grid.lines[index]) for index in nearest]
+        assert distances == sorted(distances) or np.allclose(distances, sorted(distances))
+
+
+def test_grid_matches_brute_force_after_reset():
+    rng = np.random.default_rng(25)
+    lines = random_lines(rng, 120)
+    grid = SegmentGrid()
+    grid.reset(lines)
+    assert_matches_brute_force(grid, query_points(rng, lines, 300))
+
+
+def test_grid_matches_brute_force_after_moving_lines():
+    rng = np.random.default_rng(26)
+    grid = SegmentGrid()
+    grid.reset(random_lines(rng, 80))
+    for _ in range(60):
+        index = int(rng.integers(0, len(grid.lines)))
+        grid.update_line(index, grid.lines[index] + rng.uniform(-120, 120, size=2).round())
+    assert_matches_brute_force(grid, query_points(rng, grid.lines, 200))
+
+    moved = grid.lines.copy()
+    moved[::3] = random_lines(rng, len(moved[::3]))
+    grid.sync(moved)
+    assert np.array_equal(grid.lines, moved)
+    assert_matches_brute_force(grid, query_points(rng, moved, 200))
+
+
+def test_sync_with_a_different_line_count_rebuilds():
+    rng = np.random.default_rng(27)
+    grid = SegmentGrid()
+    grid.sync(random_lines(rng, 10))
+    lines = random_lines(rng, 14)
+    grid.sync(lines)
+    assert_matches_brute_force(grid, query_points(rng, lines, 100))
@@ -0,0 +1,14 @@
+from PyQt6.QtWidgets import QApplication
+from ui_latency import UiLatencyProbe
+
+app = QApplication.instance() or QApplication([])
+
+
+def test_probe_only_runs_while_started():
+    probe = UiLatencyProbe()
+    assert not probe.timer.isActive()
+    probe.start()
+    probe.start()  # Idempotente: no reinicia la medición en curso
+    assert probe.timer.isActive()
+    probe.stop()
+    assert not probe.timer.isActive()
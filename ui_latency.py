@@ -0,0 +1,75 @@
+import time
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer
+
+# Periodo con el que se sondea el bucle de eventos (un frame a 60 Hz)
+PROBE_INTERVAL_MS = 16
+# Muestras que se conservan por serie
+PROBE_SAMPLES = 1024
+
+
+class SampleRing:
+    """Últimas muestras de una serie en un arreglo de tamaño fijo, más el conteo y la suma de todas."""
+
+    def __init__(self, size=PROBE_SAMPLES):
+        self.values = np.zeros(size)
+        self.count = 0
+        self.total = 0.0
+
+    def append(self, value):
+        self.values[self.count % len(self.values)] = value
+        self.count += 1
+        self.total += value
+
+    def summary(self):
+        values = self.values[:min(self.count, len(self.values))]
+        if not len(values):
+            return None
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        # samples y los percentiles cubren solo la ventana; count y sum_ms, toda la sesión
+        return {"samples": int(len(values)), "count": self.count, "sum_ms": self.total, "p50_ms": float(p50), "p95_ms": float(p95),
+                "p99_ms": float(p99), "max_ms": float(values.max())}
+
+
+class UiLatencyProbe(QObject):
+    """Mide el retraso del bucle de eventos de Qt y la duración de paintEvent.
+
+    Un temporizador dispara cada PROBE_INTERVAL_MS; el retraso es cuánto tarda de
+    más en dispararse. Las muestras se separan según haya o no una inferencia en
+    curso (busy), para comparar la fluidez del arrastre con y sin carga.
+    """
+
+    def __init__(self, busy=lambda: False, parent=None):
+        super().__init__(parent)
+        self.busy = busy
+        self.idle_lag = SampleRing()
+        self.busy_lag = SampleRing()
+        self.paint_durations = SampleRing()
+        self.last_tick = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        if self.timer.isActive():
+            return
+        self.last_tick = time.perf_counter()
+        self.timer.start(PROBE_INTERVAL_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self.last_tick) * 1000 - PROBE_INTERVAL_MS)
+        self.last_tick = now
+        (self.busy_lag if self.busy() else self.idle_lag).append(lag)
+
+    def record_paint(self, duration_ms):
+        self.paint_durations.append(duration_ms)
+
+    def report(self):
+        return {
+            "event_loop_lag_idle": self.idle_lag.summary(),
+            "event_loop_lag_during_inference": self.busy_lag.summary(),
+            "paint_event": self.paint_durations.summary(),
+        }